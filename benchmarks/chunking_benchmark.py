@@ -0,0 +1,74 @@
+"""
+Throughput benchmark of the native fixed-size splitter against langchain's CharacterTextSplitter.
+
+Usage:
+    python benchmarks/chunking_benchmark.py [--size-mb 8] [--chunk-size 512] [--overlap 10]
+"""
+import argparse
+import random
+import time
+
+from langchain.text_splitter import CharacterTextSplitter
+
+from flotorch_core.chunking.fixedsize_chunking import FixedSizeChunker
+
+
+def build_corpus(size_mb: float, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    words = ["retrieval", "augmented", "generation", "chunk", "the", "of", "a", "embedding",
+             "vector", "index", "document", "context", "model", "token", "overlap"]
+    parts = []
+    size = 0
+    target = int(size_mb * 1024 * 1024)
+    while size < target:
+        word = rng.choice(words)
+        separator = rng.choice([" ", " ", " ", "\n", "\t", "  "])
+        parts.append(word + separator)
+        size += len(word) + len(separator)
+    return "".join(parts)
+
+
+def measure(label: str, split, text: str, repeat: int) -> float:
+    best = float("inf")
+    chunks = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        chunks = split(text)
+        best = min(best, time.perf_counter() - start)
+    mb_per_s = len(text.encode("utf-8")) / (1024 * 1024) / best
+    print(f"{label:<12} {best * 1000:10.1f} ms {mb_per_s:10.2f} MB/s {len(chunks):8d} chunks")
+    return mb_per_s
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=float, default=8)
+    parser.add_argument("--chunk-size", type=int, default=512)
+    parser.add_argument("--overlap", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    text = build_corpus(args.size_mb)
+    chunker = FixedSizeChunker(args.chunk_size, args.overlap)
+
+    def langchain_split(data):
+        splitter = CharacterTextSplitter(
+            separator=chunker.space,
+            chunk_size=chunker.chunk_size,
+            chunk_overlap=chunker.chunk_overlap,
+            length_function=len,
+            is_separator_regex=False
+        )
+        return splitter.split_text(chunker._clean_data(data))
+
+    def native_split(data):
+        return chunker.text_splitter.split_text(chunker._clean_data(data))
+
+    assert native_split(text) == langchain_split(text), "native splitter output differs from langchain"
+    langchain_rate = measure("langchain", langchain_split, text, args.repeat)
+    native_rate = measure("native", native_split, text, args.repeat)
+    print(f"speedup      {native_rate / langchain_rate:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
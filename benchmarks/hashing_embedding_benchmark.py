@@ -0,0 +1,46 @@
+"""
+Throughput benchmark of the offline HashingEmbedding.
+
+Embeds synthetic chunks of random words through embed_list, the path an ingestion takes, so
+that the figures include the EmbeddingList assembly.
+
+Usage:
+    python benchmarks/hashing_embedding_benchmark.py [--chunks 10000] [--words 200] [--dimension 768]
+"""
+import argparse
+import random
+import time
+
+from flotorch_core.chunking.chunking import Chunk
+from flotorch_core.embedding.hashing_embedding import HashingEmbedding
+
+
+def build_chunks(count: int, words: int, vocabulary: int = 20000, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    vocabulary = [f"word{i}" for i in range(vocabulary)]
+    return [Chunk(" ".join(rng.choices(vocabulary, k=words))) for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=10000)
+    parser.add_argument("--words", type=int, default=200)
+    parser.add_argument("--dimension", type=int, default=768)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    chunks = build_chunks(args.chunks, args.words)
+    for return_arrays in (False, True):
+        embedder = HashingEmbedding(dimensions=args.dimension)
+        embedder.return_arrays = return_arrays
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            embedder.embed_list(chunks)
+            best = min(best, time.perf_counter() - start)
+        label = "arrays" if return_arrays else "lists"
+        print(f"{label:<8} {best * 1000:10.1f} ms {args.chunks / best:12.0f} chunks/s")
+
+
+if __name__ == "__main__":
+    main()
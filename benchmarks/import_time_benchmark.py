@@ -0,0 +1,63 @@
+"""
+Benchmark of the startup cost of resolving an embedding model through the registry.
+
+Every scenario runs in a fresh interpreter. "all backends" imports every embedding module, which
+the registry needed before model IDs were mapped to modules; the other scenarios resolve a
+single model ID and import only its backend. The heavy SDKs loaded by each scenario are listed.
+
+Usage:
+    python benchmarks/import_time_benchmark.py [--repeat 5]
+"""
+import argparse
+import subprocess
+import sys
+
+SCENARIOS = {
+    "all backends": (
+        "import importlib\n"
+        "from flotorch_core.embedding.embedding_registry import _MODEL_MODULES\n"
+        "for module in set(_MODEL_MODULES.values()):\n"
+        "    importlib.import_module(module)\n"
+    ),
+    "bedrock (titan v2)": (
+        "from flotorch_core.embedding.embedding_registry import embedding_registry\n"
+        "embedding_registry.get_model('amazon.titan-embed-text-v2:0')\n"
+    ),
+    "sagemaker (bge large)": (
+        "from flotorch_core.embedding.embedding_registry import embedding_registry\n"
+        "embedding_registry.get_model('huggingface-sentencesimilarity-bge-large-en-v1-5')\n"
+    ),
+}
+
+REPORT = (
+    "import sys, time\n"
+    "print(time.perf_counter() - start)\n"
+    "print(','.join(m for m in ('boto3', 'numpy', 'sagemaker', 'openai', 'ollama') if m in sys.modules))\n"
+)
+
+
+def measure(code: str, repeat: int):
+    best = float("inf")
+    modules = ""
+    for _ in range(repeat):
+        script = "import time\nstart = time.perf_counter()\n" + code + REPORT
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True,
+                                check=True).stdout.splitlines()
+        # The SageMaker SDK logs to stdout on import, the report is the last two lines
+        best = min(best, float(output[-2]))
+        modules = output[-1]
+    return best, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for label, code in SCENARIOS.items():
+        seconds, modules = measure(code, args.repeat)
+        print(f"{label:<24} {seconds * 1000:10.1f} ms   {modules}")
+
+
+if __name__ == "__main__":
+    main()
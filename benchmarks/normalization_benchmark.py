@@ -0,0 +1,81 @@
+"""
+Microbenchmark of the shared text normalization against the multi-pass cleaning it replaced.
+
+Cleans the texts written next to the vectors the way a hierarchical ingestion did when every
+child embedding carried the text of its parent, so that each parent text is cleaned once per
+child.
+
+Usage:
+    python benchmarks/normalization_benchmark.py [--parents 2000] [--children 5] [--parent-size 2000]
+"""
+import argparse
+import random
+import re
+import time
+
+from flotorch_core.utils import text_normalizer
+from flotorch_core.utils.text_normalizer import clean_text_for_vector_db
+
+
+def multi_pass_clean(text: str) -> str:
+    text = text.replace('"', '').replace("'", "")
+    text = re.sub(r'[^a-zA-Z0-9\s]', '', text)
+    text = text.replace('\n', ' ').replace('\t', ' ')
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+def build_parents(count: int, size: int, non_ascii: bool, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    words = ["retrieval", "augmented", "it's", "\"quoted\"", "vector,", "index.", "(model)",
+             "50%", "token;", "overlap"]
+    if non_ascii:
+        words += ["café", "naïve", "中文"]
+    parents = []
+    for _ in range(count):
+        parts = []
+        length = 0
+        while length < size:
+            word = rng.choice(words) + rng.choice([" ", " ", "\n", "\t"])
+            parts.append(word)
+            length += len(word)
+        parents.append("".join(parts))
+    return parents
+
+
+def measure(label: str, clean, texts: list, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        text_normalizer._vector_db_cache.clear()
+        start = time.perf_counter()
+        for text in texts:
+            clean(text)
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<24} {best * 1000:10.1f} ms")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--parents", type=int, default=2000)
+    parser.add_argument("--children", type=int, default=5)
+    parser.add_argument("--parent-size", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for non_ascii in (False, True):
+        parents = build_parents(args.parents, args.parent_size, non_ascii)
+        texts = [parent for parent in parents for _ in range(args.children)]
+        assert all(clean_text_for_vector_db(text) == multi_pass_clean(text) for text in parents)
+
+        print("non-ascii corpus" if non_ascii else "ascii corpus")
+        before = measure("multi-pass", multi_pass_clean, texts, args.repeat)
+        after = measure("normalizer", clean_text_for_vector_db, texts, args.repeat)
+        # Cleaning the to_json output again on the write path
+        cleaned = [clean_text_for_vector_db(text) for text in texts]
+        measure("normalizer, write path", clean_text_for_vector_db, cleaned, args.repeat)
+        print(f"{'speedup':<24} {before / after:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Measures the memory and recall cost of the embedding quantizers.
+
+Fits every quantizer on a sample of the corpus and reports the bytes per vector, the
+reduction over float32 and the recall@k against the exact float32 inner product search of
+searching the codes the way the OpenSearch field of the quantizer scores them: int8 query
+codes against int8 document codes, Hamming distance, or float vectors. Without --vectors, a
+synthetic corpus of normalized vectors with most of their variance in a low rank subspace
+stands in for real embeddings; --offset and --anisotropy give it a non zero mean and
+dimensions of unequal spread, like the embeddings of most models.
+
+Usage:
+    python benchmarks/quantization_benchmark.py [--vectors embeddings.npy] [--queries 200] [--k 10]
+        [--offset 1.0] [--anisotropy 3.0]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from flotorch_core.embedding.quantization import BinaryQuantizer, PCAQuantizer, ScalarQuantizer, recall_at_k
+
+
+def synthetic_corpus(count: int, dimension: int, rank: int = 64, seed: int = 7,
+                     offset: float = 0.0, anisotropy: float = 1.0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((count, rank)) @ rng.standard_normal((rank, dimension))
+    vectors += 0.1 * rng.standard_normal((count, dimension))
+    # Every dimension spread by a factor up to anisotropy and shifted by a common mean vector
+    vectors *= rng.uniform(1 / anisotropy, anisotropy, dimension) if anisotropy > 1 else 1.0
+    vectors += offset * np.sqrt(rank) * rng.standard_normal(dimension)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.astype(np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vectors", help="A .npy matrix of embeddings, e.g. from EmbeddingList.save_npy")
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--dimension", type=int, default=1024)
+    parser.add_argument("--sample", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--offset", type=float, default=1.0, help="Mean of the synthetic corpus, relative to its spread")
+    parser.add_argument("--anisotropy", type=float, default=3.0, help="Largest ratio of the spread of a dimension")
+    args = parser.parse_args()
+
+    if args.vectors:
+        vectors = np.load(args.vectors).astype(np.float32)
+    else:
+        vectors = synthetic_corpus(args.count, args.dimension, offset=args.offset, anisotropy=args.anisotropy)
+    queries, vectors = vectors[:args.queries], vectors[args.queries:]
+    sample = vectors[:args.sample]
+    dimension = vectors.shape[1]
+
+    quantizers = {
+        "int8": ScalarQuantizer(),
+        "binary": BinaryQuantizer(),
+        f"pca {dimension // 4}": PCAQuantizer(dimension // 4),
+        f"pca {dimension // 8}": PCAQuantizer(dimension // 8),
+    }
+    print(f"{len(vectors)} vectors of dimension {dimension}, {len(queries)} queries, k={args.k}")
+    print(f"{'quantizer':<12} {'bytes':>8} {'reduction':>10} {'recall':>8} {'fit ms':>8}")
+    for name, quantizer in quantizers.items():
+        start = time.perf_counter()
+        quantizer.fit(sample)
+        fit_ms = (time.perf_counter() - start) * 1000
+        size = quantizer.bytes_per_vector(dimension)
+        recall = recall_at_k(quantizer, vectors, queries, args.k)
+        print(f"{name:<12} {size:>8} {dimension * 4 / size:>9.1f}x {recall:>8.3f} {fit_ms:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from flotorch_core.chunking.chunking import BaseChunker, Chunk, ChunkSource
+from flotorch_core.storage.storage import StorageProvider
+
+
+def content_hash(text: str) -> str:
+    """
+    Hashes the text of a chunk window.
+    Args:
+        text (str): The window text.
+    Returns:
+        str: The hex digest of the text.
+    """
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+@dataclass
+class ChunkRecord:
+    """
+    A chunk window as recorded in the manifest, with offsets into the prepared document text.
+    """
+    chunk_id: str
+    start: int
+    end: int
+    content_hash: str
+
+
+@dataclass
+class ChunkDelta:
+    """
+    The outcome of re-ingesting a document: the chunks to embed and index, and the
+    IDs of previously indexed chunks that must be deleted.
+    """
+    document_id: str
+    chunks: List[Chunk] = field(default_factory=list)
+    stale_ids: List[str] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.chunks and not self.stale_ids
+
+
+class ChunkManifest:
+    """
+    Remembers, per document ID, the content hash and offsets of every chunk window that
+    was indexed, so that a changed document only has its changed region re-chunked and
+    re-embedded.
+
+    On update the recorded windows are matched against the new text from the front at
+    their old offsets and from the back at their old offsets shifted by the change in
+    length. Windows that still hold the same text are kept as they are and only the
+    range between them is chunked again. Windows of that range whose text was already
+    indexed keep their IDs; the others are returned as new chunks and the old windows
+    they replace as stale IDs. Around the edit the windows can therefore differ from
+    the ones chunking the new version from scratch would produce.
+    """
+
+    def __init__(self, documents: Optional[Dict[str, dict]] = None):
+        """
+        Constructs a new ChunkManifest object.
+        Args:
+            documents (Optional[Dict[str, dict]]): The output of to_json of a previous manifest.
+        """
+        self.documents: Dict[str, dict] = {}
+        for document_id, document in (documents or {}).items():
+            self.documents[document_id] = {
+                'length': document['length'],
+                'chunks': [ChunkRecord(*record) for record in document['chunks']]
+            }
+
+    def __contains__(self, document_id: str) -> bool:
+        return document_id in self.documents
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def chunk_ids(self, document_id: str) -> List[str]:
+        """
+        Returns the IDs of the chunks indexed for a document.
+        Args:
+            document_id (str): The document ID.
+        Returns:
+            List[str]: The chunk IDs in document order.
+        """
+        document = self.documents.get(document_id)
+        return [record.chunk_id for record in document['chunks']] if document else []
+
+    def update(self, document_id: str, data: str, chunker: BaseChunker) -> ChunkDelta:
+        """
+        Chunks the changed region of a document and records its new windows.
+        The same chunker configuration must be used for every update of a document.
+        Args:
+            document_id (str): The document ID.
+            data (str): The current text of the document.
+            chunker (BaseChunker): The chunker, it has to support chunk_source.
+        Returns:
+            ChunkDelta: The new or changed chunks and the stale chunk IDs.
+        """
+        if not data:
+            raise ValueError("Input text cannot be empty or None")
+
+        source = ChunkSource(chunker.prepare(data), document_id)
+        text = source.text
+        document = self.documents.get(document_id)
+        records = document['chunks'] if document else []
+        old_length = document['length'] if document else 0
+
+        prefix = 0
+        while prefix < len(records) and self._matches(text, records[prefix], 0):
+            prefix += 1
+        if prefix == len(records) and records and len(text) == old_length:
+            return ChunkDelta(document_id, unchanged=len(records))
+        # The end of a window depends on the word that follows it, so the last
+        # matching window is only kept when its successor matches as well
+        prefix = max(prefix - 1, 0)
+
+        shift = len(text) - old_length
+        middle_start = records[prefix].start if records else 0
+        suffix = len(records)
+        while (suffix - 1 > prefix and records[suffix - 1].start + shift > middle_start
+               and self._matches(text, records[suffix - 1], shift)):
+            suffix -= 1
+
+        middle_end = len(text)
+        if suffix < len(records):
+            middle_end = max(records[suffix - 1].end, records[suffix].start) + shift
+
+        replaced: Dict[str, List[ChunkRecord]] = {}
+        for record in records[prefix:suffix]:
+            replaced.setdefault(record.content_hash, []).append(record)
+        delta = ChunkDelta(document_id, unchanged=prefix + len(records) - suffix)
+        # New chunks never take the deterministic ID of a kept window with the same text
+        source.chunk_ids.update(record.chunk_id for record in records[:prefix] + records[suffix:])
+        middle = []
+        for chunk in chunker.chunk_source(source, middle_start, max(middle_start, middle_end)):
+            digest = content_hash(chunk.data)
+            record = replaced[digest].pop(0) if replaced.get(digest) else None
+            if record is None:
+                delta.chunks.append(chunk)
+                chunk_id = chunk.id
+            else:
+                delta.unchanged += 1
+                chunk_id = record.chunk_id
+            middle.append(ChunkRecord(chunk_id, chunk.start, chunk.end, digest))
+        delta.stale_ids = [record.chunk_id for unused in replaced.values() for record in unused]
+
+        tail = [ChunkRecord(record.chunk_id, record.start + shift, record.end + shift, record.content_hash)
+                for record in records[suffix:]]
+        self.documents[document_id] = {
+            'length': len(text),
+            'chunks': records[:prefix] + middle + tail
+        }
+        return delta
+
+    def remove(self, document_id: str) -> List[str]:
+        """
+        Forgets a document that was deleted from the corpus.
+        Args:
+            document_id (str): The document ID.
+        Returns:
+            List[str]: The IDs of its chunks, which are all stale.
+        """
+        stale_ids = self.chunk_ids(document_id)
+        self.documents.pop(document_id, None)
+        return stale_ids
+
+    def to_json(self) -> Dict[str, dict]:
+        return {
+            document_id: {
+                'length': document['length'],
+                'chunks': [[record.chunk_id, record.start, record.end, record.content_hash]
+                           for record in document['chunks']]
+            }
+            for document_id, document in self.documents.items()
+        }
+
+    def save(self, storage: StorageProvider, path: str) -> None:
+        """
+        Writes the manifest as JSON.
+        Args:
+            storage (StorageProvider): The storage to write to.
+            path (str): The path of the manifest.
+        """
+        storage.write(path, json.dumps(self.to_json()).encode('utf-8'))
+
+    @classmethod
+    def load(cls, storage: StorageProvider, path: str) -> 'ChunkManifest':
+        """
+        Reads a manifest written by save.
+        Args:
+            storage (StorageProvider): The storage to read from.
+            path (str): The path of the manifest.
+        Returns:
+            ChunkManifest: The manifest.
+        """
+        return cls(json.loads(b''.join(storage.read(path)).decode('utf-8')))
+
+    @staticmethod
+    def _matches(text: str, record: ChunkRecord, shift: int) -> bool:
+        start, end = record.start + shift, record.end + shift
+        if start < 0 or end > len(text):
+            return False
+        return content_hash(text[start:end]) == record.content_hash
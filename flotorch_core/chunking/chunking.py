@@ -1,23 +1,133 @@
+import codecs
 import uuid
 from abc import ABC, abstractmethod
-from typing import List
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Generator, Iterable, List, Optional, Set, Tuple, Union
+
+from flotorch_core.utils.text_normalizer import replace_separators
+
+
+# Namespace of the content-hash chunk IDs, changing it changes every deterministic ID
+CHUNK_ID_NAMESPACE = uuid.UUID("4c6f1e0e-6a8b-5d1e-9a43-2f0b8f5c7d21")
+
+
+class ChunkSource:
+    """
+    A shared text buffer that chunks reference by offsets instead of holding copies.
+    """
+    __slots__ = ('id', 'text', 'chunk_ids')
+
+    def __init__(self, text: str, source_id: Optional[str] = None, chunk_ids: Optional[Set[str]] = None):
+        """
+        Constructs a new ChunkSource object.
+        Args:
+            text (str): The cleaned text of the document.
+            source_id (Optional[str]): The identifier of the document, if known.
+            chunk_ids (Optional[Set[str]]): The deterministic IDs already given to chunks of the
+                document, shared by the sources of one document chunked in parts.
+        """
+        self.id = source_id
+        self.text = text
+        self.chunk_ids = set() if chunk_ids is None else chunk_ids
 
 
 class Chunk:
     """
     A class to represent a chunk of text.
+    A chunk either owns its data or references the (start, end) range of a shared
+    ChunkSource, in which case data is only materialized when it is accessed.
     """
+    __slots__ = ('id', 'child_data', 'source', 'start', 'end', '_data')
 
-    def __init__(self, data):
+    def __init__(self, data, chunk_id: Optional[str] = None):
         """
         Constructs a new Chunk object.
         Args:
             data (str): The data of the chunk.
+            chunk_id (Optional[str]): The identifier of the chunk, a random UUID by default.
         """
-        self.id = str(uuid.uuid4())
-        self.data = data
+        self.id = chunk_id or str(uuid.uuid4())
+        self._data = data
+        self.source = None
+        self.start = None
+        self.end = None
         self.child_data = None
 
+    @classmethod
+    def from_source(cls, source: ChunkSource, start: int, end: int, deterministic_id: bool = False,
+                    parent: Optional['Chunk'] = None) -> 'Chunk':
+        """
+        Creates a chunk referencing a range of a shared source.
+        Deterministic IDs are unique within the document: the ID of a child is derived from
+        the ID of its parent and its offsets in the parent, and a text repeated in the
+        document is told apart by the number of times it occurred before.
+        Args:
+            source (ChunkSource): The shared text buffer.
+            start (int): The start offset of the chunk in the source text.
+            end (int): The end offset of the chunk in the source text.
+            deterministic_id (bool): Derive the ID from the content instead of a random UUID.
+            parent (Optional[Chunk]): The parent chunk of a child chunk.
+        Returns:
+            Chunk: The chunk.
+        """
+        chunk = cls.__new__(cls)
+        chunk._data = None
+        chunk.source = source
+        chunk.start = start
+        chunk.end = end
+        chunk.child_data = None
+        if not deterministic_id:
+            chunk.id = str(uuid.uuid4())
+        elif parent is not None:
+            chunk.id = cls.content_id(f"{start - parent.start}:{end - parent.start}", parent.id)
+        else:
+            data = chunk.data
+            chunk.id = cls.content_id(data, source.id)
+            occurrence = 0
+            while chunk.id in source.chunk_ids:
+                occurrence += 1
+                chunk.id = cls.content_id(f"{occurrence}\x00{data}", source.id)
+            source.chunk_ids.add(chunk.id)
+        return chunk
+
+    @staticmethod
+    def content_id(data: str, source_id: Optional[str] = None) -> str:
+        """
+        Computes a stable, UUID formatted identifier from the chunk content, so that
+        re-ingesting the same document yields the same IDs.
+        Args:
+            data (str): The data of the chunk.
+            source_id (Optional[str]): The identifier of the document, if known.
+        Returns:
+            str: The content-hash identifier.
+        """
+        name = data if source_id is None else f"{source_id}\x00{data}"
+        return str(uuid.uuid5(CHUNK_ID_NAMESPACE, name))
+
+    @property
+    def data(self) -> str:
+        """
+        The text of the chunk.
+        """
+        if self.source is None:
+            return self._data
+        return self.source.text[self.start:self.end]
+
+    @data.setter
+    def data(self, data: str):
+        self._data = data
+        self.source = None
+        self.start = None
+        self.end = None
+
+    @property
+    def source_id(self) -> Optional[str]:
+        """
+        The identifier of the source document, if the chunk references one.
+        """
+        return self.source.id if self.source is not None else None
+
     def add_child(self, child_data):
         """
         Adds a child to the chunk.
@@ -48,30 +158,167 @@ class BaseChunker(ABC):
         self.space = ' '
         self.separators = [' ', '\t', '\n', '\r', '\f', '\v']
         self.tokens_per_charecter = 4
+        self.stream_buffer_size = 1024 * 1024
+        self.max_workers = 1
+        self.batch_size = 32
+        self.parallel_min_size = 1024 * 1024
+        self.deterministic_ids = False
 
     @abstractmethod
-    def chunk(self, data: str) -> List[Chunk]:
+    def chunk(self, data: str, document_id: Optional[str] = None) -> List[Chunk]:
         """
         Chunks the input text.
         Args:
             data (str): The input text to chunk.
+            document_id (Optional[str]): The identifier of the document, which deterministic
+                IDs are derived from so that the same text in two documents has two IDs.
         Returns:
             List[Chunk]: A list of Chunk objects.  
         """
         pass
 
-    def chunk_list(self, data: List[str]) -> List[Chunk]:
+    def prepare(self, data: str) -> str:
+        """
+        Cleans the input text into the text the chunk offsets refer to.
+        Args:
+            data (str): The input text.
+        Returns:
+            str: The prepared text.
+        """
+        return self._clean_data(data)
+
+    def chunk_source(self, source: ChunkSource, start: int = 0, end: Optional[int] = None) -> List[Chunk]:
+        """
+        Chunks the start:end range of an already prepared source, so that a part of a
+        document can be re-chunked without preparing the whole document again.
+        Args:
+            source (ChunkSource): The source holding the output of prepare.
+            start (int): The start offset of the range to chunk.
+            end (Optional[int]): The end offset of the range to chunk, the end of the source by default.
+        Returns:
+            List[Chunk]: A list of Chunk objects referencing the source.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support chunking a source range")
+
+    def chunk_list(self, data: List[str], document_ids: Optional[List[str]] = None) -> List[Chunk]:
         """
         Chunks a list of input texts.
+        When max_workers is greater than one the texts are chunked in worker processes,
+        batch_size texts per task, unless the input holds fewer than parallel_min_size
+        characters or fits in a single batch. Chunks are always returned in input order.
         Args:
             data (List[str]): The list of input texts to chunk.
+            document_ids (Optional[List[str]]): The identifier of every text, see chunk.
         Returns:
             List[Chunk]: A list of Chunk objects.  
         """
-        result = []
-        for d in data:
-            result.extend(self.chunk(d))
-        return result
+        if document_ids is None:
+            document_ids = [None] * len(data)
+        elif len(document_ids) != len(data):
+            raise ValueError(f"Expected one document ID per text, got {len(document_ids)} for {len(data)} texts")
+        documents = list(zip(data, document_ids))
+        if self._use_process_pool(data):
+            batches = [documents[i:i + self.batch_size] for i in range(0, len(documents), self.batch_size)]
+            result = []
+            with ProcessPoolExecutor(max_workers=min(self.max_workers, len(batches))) as executor:
+                # map yields the batches in submission order
+                for chunks in executor.map(partial(_chunk_batch, self), batches):
+                    result.extend(chunks)
+            return result
+
+        return _chunk_batch(self, documents)
+
+    def _use_process_pool(self, data: List[str]) -> bool:
+        """
+        Decides whether chunking the input is worth the cost of worker processes.
+        Args:
+            data (List[str]): The list of input texts to chunk.
+        Returns:
+            bool: True if the texts should be chunked in a process pool.
+        """
+        if self.max_workers <= 1 or len(data) <= self.batch_size:
+            return False
+        return sum(len(d) for d in data if d) >= self.parallel_min_size
+
+    def chunk_iter(self, stream: Iterable[Union[bytes, str]], encoding: str = 'utf-8',
+                   document_id: Optional[str] = None) -> Generator[Chunk, None, None]:
+        """
+        Chunks a document that arrives as a stream of blocks, e.g. the output of
+        StorageProvider.read_stream, yielding chunks as soon as their window is final.
+        At most stream_buffer_size characters plus one chunk are held at a time. The
+        strategy's chunk_source method is applied to each buffered window and the last
+        chunk of the window is carried over, so the output matches chunk() on the whole
+        document for strategies that fill their windows greedily from left to right.
+        Args:
+            stream (Iterable[Union[bytes, str]]): The blocks of the document.
+            encoding (str): The encoding used to decode byte blocks.
+            document_id (Optional[str]): The identifier of the document, see chunk.
+        Returns:
+            Generator[Chunk, None, None]: A generator that yields Chunk objects.
+        """
+        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        # The windows share the deterministic IDs given so far, like the chunks of one source
+        chunk_ids = set()
+        pending = []
+        pending_size = 0
+        for block in stream:
+            text = decoder.decode(block) if isinstance(block, (bytes, bytearray)) else block
+            if not text:
+                continue
+            text = self._clean_data(text)
+            pending.append(text)
+            # Counted in cleaned characters, like the buffer the size is reset from
+            pending_size += len(text)
+            if pending_size < self.stream_buffer_size:
+                continue
+
+            buffer = ''.join(pending)
+            # Never cut inside a word, the tail is completed by the next block
+            cut = buffer.rfind(self.space)
+            if cut <= 0:
+                pending, pending_size = [buffer], len(buffer)
+                continue
+
+            chunks = self._chunk_window(buffer[:cut], document_id, chunk_ids) if buffer[:cut].strip() else []
+            yield from chunks[:-1]
+            tail = buffer[cut + 1:]
+            carry = ''
+            if chunks:
+                # The carried chunk is chunked again with the next window and gets its ID back
+                chunk_ids.discard(chunks[-1].id)
+                carry = chunks[-1].data + self.space
+            pending = [carry + tail]
+            pending_size = len(pending[0])
+
+        pending.append(self._clean_data(decoder.decode(b'', final=True)))
+        buffer = ''.join(pending)
+        if buffer.strip():
+            yield from self._chunk_window(buffer, document_id, chunk_ids)
+
+    def _chunk_window(self, data: str, document_id: Optional[str], chunk_ids: Set[str]) -> List[Chunk]:
+        """
+        Chunks a window of a streamed document.
+        Args:
+            data (str): The text of the window.
+            document_id (Optional[str]): The identifier of the document.
+            chunk_ids (Set[str]): The deterministic IDs given to the chunks of the previous windows.
+        Returns:
+            List[Chunk]: A list of Chunk objects.
+        """
+        return self.chunk_source(ChunkSource(self.prepare(data), document_id, chunk_ids))
+
+    def _new_chunk(self, source: ChunkSource, start: int, end: int, parent: Optional[Chunk] = None) -> Chunk:
+        """
+        Creates a chunk referencing a range of the source, honouring deterministic_ids.
+        Args:
+            source (ChunkSource): The shared text buffer.
+            start (int): The start offset of the chunk.
+            end (int): The end offset of the chunk.
+            parent (Optional[Chunk]): The parent chunk of a child chunk.
+        Returns:
+            Chunk: The chunk.
+        """
+        return Chunk.from_source(source, start, end, self.deterministic_ids, parent)
 
     def _clean_data(self, data: str) -> str:
         """
@@ -81,6 +328,21 @@ class BaseChunker(ABC):
         Returns:
             str: The cleaned text.
         """
-        for sep in self.separators:
-            data = data.replace(sep, self.space)
-        return data
+        return replace_separators(data, self.separators, self.space)
+
+
+
+def _chunk_batch(chunker: BaseChunker, documents: List[Tuple[str, Optional[str]]]) -> List[Chunk]:
+    """
+    Chunks a batch of input texts, defined at module level so worker processes can run it.
+    Args:
+        chunker (BaseChunker): The chunker to apply.
+        documents (List[Tuple[str, Optional[str]]]): The batch of input texts and their document IDs.
+    Returns:
+        List[Chunk]: The chunks of all texts in input order.
+    """
+    result = []
+    for data, document_id in documents:
+        # Chunkers written before document IDs only take the text
+        result.extend(chunker.chunk(data) if document_id is None else chunker.chunk(data, document_id))
+    return result
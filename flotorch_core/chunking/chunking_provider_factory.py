@@ -1,15 +1,39 @@
 from flotorch_core.chunking.hierarical_chunking import HieraricalChunker
 from flotorch_core.chunking.fixedsize_chunking import FixedSizeChunker
+from flotorch_core.chunking.semantic_chunking import SemanticChunker
+from flotorch_core.chunking.tokenizer import BaseTokenizer
+from flotorch_core.embedding.embedding import BaseEmbedding
 
 class ChunkingFactory:
     """
     Factory to create chunking strategies based on configuration.
     """
     @staticmethod
-    def create_chunker(chunking_strategy: str, chunk_size: int, chunk_overlap: int, parent_chunk_size: int = None):
+    def create_chunker(chunking_strategy: str, chunk_size: int, chunk_overlap: int, parent_chunk_size: int = None,
+                       max_workers: int = 1, batch_size: int = 32, deterministic_ids: bool = False,
+                       tokenizer: BaseTokenizer = None, parent_chunk_overlap: int = 0,
+                       embedder: BaseEmbedding = None, similarity_threshold: float = 0.75):
+        """
+        Creates a chunker for the given strategy.
+        :param max_workers: The number of worker processes chunk_list may use, 1 keeps it in-process.
+        :param batch_size: The number of documents sent to a worker process per task.
+        :param deterministic_ids: Derive chunk IDs from their content so re-ingestion yields stable IDs.
+        :param tokenizer: Sizes chunks in tokens of the embedding model instead of estimated characters.
+        :param parent_chunk_overlap: The overlap between parent chunks of the hierarchical strategy, in percent.
+        :param embedder: The embedding model the semantic strategy compares sentences with.
+        :param similarity_threshold: The cosine similarity below which the semantic strategy starts a new chunk.
+        """
         if chunking_strategy.lower() == "hierarchical":
-            return HieraricalChunker(chunk_size, chunk_overlap, parent_chunk_size)
+            chunker = HieraricalChunker(chunk_size, chunk_overlap, parent_chunk_size, tokenizer, parent_chunk_overlap)
+        elif chunking_strategy.lower() == "semantic":
+            chunker = SemanticChunker(embedder, chunk_size, similarity_threshold, tokenizer=tokenizer)
         elif chunking_strategy.lower() == "fixed":
-            return FixedSizeChunker(chunk_size, chunk_overlap)
+            chunker = FixedSizeChunker(chunk_size, chunk_overlap, tokenizer)
         else:
             raise ValueError(f"Unsupported chunking type: {chunking_strategy}")
+        if max_workers < 1 or batch_size < 1:
+            raise ValueError("max_workers and batch_size must be positive")
+        chunker.max_workers = max_workers
+        chunker.batch_size = batch_size
+        chunker.deterministic_ids = deterministic_ids
+        return chunker
@@ -0,0 +1,193 @@
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from flotorch_core.embedding.embedding import EmbeddingList, Embeddings
+from flotorch_core.logger.global_logger import get_logger
+
+from .chunking import Chunk
+
+logger = get_logger()
+
+# Permutations are computed modulo a Mersenne prime small enough for a * hash + b to fit in uint64
+_PRIME = np.uint64((1 << 31) - 1)
+_SHINGLE_BASE = np.uint64(1000003)
+_HASH_MASK = np.uint64(0xFFFFFFFF)
+
+
+@dataclass
+class DeduplicationResult:
+    """
+    The outcome of near-duplicate elimination over a list of chunks.
+    chunks holds the chunks to embed, duplicates the dropped ones and aliases maps the ID of
+    every dropped chunk to the ID of the kept chunk it duplicates.
+    """
+    chunks: List[Chunk] = field(default_factory=list)
+    duplicates: List[Chunk] = field(default_factory=list)
+    aliases: Dict[str, str] = field(default_factory=dict)
+    embedding_calls_saved: int = 0
+
+    @property
+    def total(self) -> int:
+        return len(self.chunks) + len(self.duplicates)
+
+    @property
+    def dedup_ratio(self) -> float:
+        """
+        The fraction of the input chunks that were dropped as near-duplicates.
+        """
+        return len(self.duplicates) / self.total if self.total else 0.0
+
+    def expand(self, embedding_list: EmbeddingList) -> EmbeddingList:
+        """
+        Aliases the duplicates to the embeddings of the chunks they duplicate, so they can be
+        indexed under their own ID and text without being embedded.
+        Args:
+            embedding_list (EmbeddingList): The output of embed_list for chunks.
+        Returns:
+            EmbeddingList: The input embeddings followed by a copy for every duplicate.
+        """
+        by_id: Dict[str, List[Embeddings]] = {}
+        expanded = EmbeddingList()
+        for embedding in embedding_list:
+            by_id.setdefault(embedding.id, []).append(embedding)
+            expanded.append(embedding)
+        for parent_id, text in embedding_list.parents.items():
+            expanded.add_parent(parent_id, text)
+        for duplicate in self.duplicates:
+            for embedding in by_id.get(self.aliases[duplicate.id], []):
+                if embedding.parent_id is None:
+                    alias = Embeddings(embedding.embeddings, embedding.metadata, duplicate.data)
+                else:
+                    # The children of a duplicate parent reference its own parent record
+                    alias = Embeddings(embedding.embeddings, embedding.metadata, embedding.text)
+                    alias.parent_id = duplicate.id
+                    # Its own child ID, so that the alias does not overwrite the original document
+                    alias.child_id = Chunk.content_id(embedding.child_id or embedding.text, duplicate.id)
+                    expanded.add_parent(duplicate.id, duplicate.data)
+                alias.id = duplicate.id
+                # The metadata of the original call is not counted twice
+                expanded.append(alias, count_metadata=False)
+        return expanded
+
+
+class MinHashDeduplicator:
+    """
+    Drops chunks whose text is a near-duplicate of an earlier chunk, e.g. repeated headers,
+    disclaimers or FAQ answers, before they are embedded.
+    Every chunk is reduced to a MinHash signature over its word shingles and the signatures are
+    bucketed with LSH, so a chunk is only compared with the kept chunks it shares a band with.
+    A chunk is dropped when its estimated Jaccard similarity with one of them reaches threshold.
+    :param threshold: The Jaccard similarity from which two chunks are duplicates.
+    :param num_perm: The number of hash permutations of a signature.
+    :param shingle_size: The number of consecutive words of a shingle.
+    :param seed: The seed of the hash permutations.
+    """
+
+    def __init__(self, threshold: float = 0.9, num_perm: int = 128, shingle_size: int = 3, seed: int = 1):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be between 0 and 1")
+        if num_perm < 2 or shingle_size < 1:
+            raise ValueError("num_perm must be at least 2 and shingle_size positive")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_PRIME), num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), num_perm, dtype=np.uint64)
+        self.bands, self.rows = self._band_layout(threshold, num_perm)
+
+    def deduplicate(self, chunks: List[Chunk]) -> DeduplicationResult:
+        """
+        Splits the chunks into the ones to embed and their near-duplicates, keeping the first
+        occurrence of every group in input order.
+        Args:
+            chunks (List[Chunk]): The output of chunk_list.
+        Returns:
+            DeduplicationResult: The kept chunks, the duplicates and the savings.
+        """
+        result = DeduplicationResult()
+        buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(self.bands)]
+        kept_signatures: List[np.ndarray] = []
+        band_size = self.rows * 8
+
+        for chunk in chunks:
+            signature = self.signature(chunk.data)
+            keys = signature[:self.bands * self.rows].tobytes()
+            match = self._find_match(signature, keys, band_size, buckets, kept_signatures)
+            if match is None:
+                index = len(result.chunks)
+                for band, bucket in enumerate(buckets):
+                    bucket.setdefault(keys[band * band_size:(band + 1) * band_size], []).append(index)
+                kept_signatures.append(signature)
+                result.chunks.append(chunk)
+            else:
+                result.duplicates.append(chunk)
+                result.aliases[chunk.id] = result.chunks[match].id
+                result.embedding_calls_saved += len(chunk.child_data or ()) or 1
+
+        logger.info(f"Deduplicated {result.total} chunks: dropped {len(result.duplicates)} "
+                    f"({result.dedup_ratio:.1%}), saved {result.embedding_calls_saved} embedding calls")
+        return result
+
+    def signature(self, text: str) -> np.ndarray:
+        """
+        Computes the MinHash signature of a text.
+        Args:
+            text (str): The text.
+        Returns:
+            np.ndarray: num_perm uint64 minimum hash values.
+        """
+        shingles = self._shingles(text)
+        if shingles.size == 0:
+            return np.full(self.num_perm, _PRIME, dtype=np.uint64)
+        # One (num_perm, shingles) pass computes every permutation of every shingle
+        hashed = (np.outer(self._a, shingles % _PRIME) + self._b[:, None]) % _PRIME
+        return hashed.min(axis=1)
+
+    @staticmethod
+    def jaccard(first: np.ndarray, second: np.ndarray) -> float:
+        """
+        Estimates the Jaccard similarity of two texts from their signatures.
+        """
+        return float(np.count_nonzero(first == second)) / len(first)
+
+    def _shingles(self, text: str) -> np.ndarray:
+        words = text.lower().split()
+        if not words:
+            return np.empty(0, dtype=np.uint64)
+        hashes = np.fromiter((zlib.crc32(word.encode('utf-8')) for word in words), dtype=np.uint64, count=len(words))
+        size = min(self.shingle_size, len(hashes))
+        # Polynomial hash of every window of size consecutive words, truncated to 32 bits
+        shingles = np.zeros(len(hashes) - size + 1, dtype=np.uint64)
+        for offset in range(size):
+            shingles = ((shingles * _SHINGLE_BASE) + hashes[offset:len(hashes) - size + 1 + offset]) & _HASH_MASK
+        return np.unique(shingles)
+
+    def _find_match(self, signature: np.ndarray, keys: bytes, band_size: int,
+                    buckets: List[Dict[bytes, List[int]]], kept_signatures: List[np.ndarray]):
+        seen = set()
+        for band, bucket in enumerate(buckets):
+            for candidate in bucket.get(keys[band * band_size:(band + 1) * band_size], ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                if self.jaccard(signature, kept_signatures[candidate]) >= self.threshold:
+                    return candidate
+        return None
+
+    @staticmethod
+    def _band_layout(threshold: float, num_perm: int, recall: float = 0.95) -> Tuple[int, int]:
+        """
+        Picks the widest bands for which two texts exactly at the threshold still share at least
+        one band with probability recall. Wider bands mean fewer candidate comparisons.
+        Returns:
+            Tuple[int, int]: The number of bands and of rows per band.
+        """
+        for rows in range(num_perm, 0, -1):
+            bands = num_perm // rows
+            if 1.0 - (1.0 - threshold ** rows) ** bands >= recall:
+                return bands, rows
+        return num_perm, 1
@@ -1,8 +1,8 @@
-from typing import List
+from typing import List, Optional
 
-from langchain.text_splitter import CharacterTextSplitter
-
-from .chunking import BaseChunker, Chunk
+from .chunking import BaseChunker, Chunk, ChunkSource
+from .text_splitter import FixedSizeTextSplitter
+from .tokenizer import BaseTokenizer
 
 
 class FixedSizeChunker(BaseChunker):
@@ -10,31 +10,44 @@ class FixedSizeChunker(BaseChunker):
     This class is responsible for chunking the text into fixed size chunks.
     :param chunk_size: The size of the chunk.
     :param chunk_overlap: The overlap between chunks.
+    :param tokenizer: Sizes chunks in real tokens, otherwise chunk_size is converted to
+        characters with tokens_per_charecter.
     """
-    def __init__(self, chunk_size: int, chunk_overlap: int):
+    def __init__(self, chunk_size: int, chunk_overlap: int, tokenizer: Optional[BaseTokenizer] = None):
         super().__init__()
-        self.chunk_size = self.tokens_per_charecter * chunk_size
+        self.tokenizer = tokenizer
+        self.chunk_size = self._to_length(chunk_size)
         self.chunk_overlap = int(chunk_overlap * self.chunk_size / 100)
         if self.chunk_size <= 0:
             raise ValueError("chunk_size must be positive")
         if self.chunk_overlap >= self.chunk_size:
             raise ValueError("chunk_overlap must be less than chunk_size")
+        self.text_splitter = FixedSizeTextSplitter(self.chunk_size, self.chunk_overlap, self.space, tokenizer)
+
+    def _to_length(self, size: int) -> int:
+        """
+        Converts a size in tokens to the unit the text splitters measure.
+        :param size: The size in tokens.
+        :return: The size in tokens with a tokenizer, in characters otherwise.
+        """
+        if self.tokenizer is not None:
+            return size
+        return self.tokens_per_charecter * size
 
     """
     Chunks the text into fixed size chunks.
     :param data: The input text.
+    :param document_id: The identifier of the document, part of the deterministic IDs.
     :return: The list of chunks."""
-    def chunk(self, data: str) -> List[Chunk]:
+    def chunk(self, data: str, document_id: Optional[str] = None) -> List[Chunk]:
         if not data:
             raise ValueError("Input text cannot be empty or None")
 
-        data = self._clean_data(data)
-        self.text_splitter = CharacterTextSplitter(
-            separator=self.space,
-            chunk_size=self.chunk_size,
-            chunk_overlap=self.chunk_overlap,
-            length_function=len,
-            is_separator_regex=False
-        )
-        chunks = self.text_splitter.split_text(data)
-        return [Chunk(chunk) for chunk in chunks]
+        return self.chunk_source(ChunkSource(self.prepare(data), document_id))
+
+    def prepare(self, data: str) -> str:
+        return self.text_splitter.normalize(self._clean_data(data))
+
+    def chunk_source(self, source: ChunkSource, start: int = 0, end: Optional[int] = None) -> List[Chunk]:
+        return [self._new_chunk(source, chunk_start, chunk_end)
+                for chunk_start, chunk_end in self.text_splitter.split_offsets(source.text, start, end)]
@@ -1,46 +1,42 @@
-from typing import List
+from typing import List, Optional
 
-from langchain.text_splitter import CharacterTextSplitter
-
-from flotorch_core.chunking.chunking import Chunk
+from flotorch_core.chunking.chunking import Chunk, ChunkSource
 from flotorch_core.chunking.fixedsize_chunking import FixedSizeChunker
+from flotorch_core.chunking.text_splitter import FixedSizeTextSplitter
+from flotorch_core.chunking.tokenizer import BaseTokenizer
 
 
 class HieraricalChunker(FixedSizeChunker):
-    def __init__(self, chunk_size: int, chunk_overlap: int, parent_chunk_size: int):
-        super().__init__(chunk_size, chunk_overlap)
-        self.parent_chunk_size = self.tokens_per_charecter * parent_chunk_size
+    def __init__(self, chunk_size: int, chunk_overlap: int, parent_chunk_size: int,
+                 tokenizer: Optional[BaseTokenizer] = None, parent_chunk_overlap: int = 0):
+        super().__init__(chunk_size, chunk_overlap, tokenizer)
+        self.parent_chunk_size = self._to_length(parent_chunk_size)
         if self.parent_chunk_size <= 0:
             raise ValueError("parent_chunk_size must be positive")
         if self.chunk_size > self.parent_chunk_size:
             raise ValueError("child_chunk_size must be less than parent chunking size")
+        # Like chunk_overlap, a percentage of the parent chunk size
+        self.parent_chunk_overlap = int(parent_chunk_overlap * self.parent_chunk_size / 100)
+        if self.parent_chunk_overlap < 0 or self.parent_chunk_overlap >= self.parent_chunk_size:
+            raise ValueError("parent_chunk_overlap must be less than parent_chunk_size")
+        self.parent_text_splitter = FixedSizeTextSplitter(self.parent_chunk_size, self.parent_chunk_overlap,
+                                                          self.space, tokenizer)
 
-    def chunk(self, data: str) -> List[Chunk]:
-        if not data:
-            raise ValueError("Input text cannot be empty or None")
-
-        data = self._clean_data(data)
-        self.parent_text_splitter = CharacterTextSplitter(
-            separator=self.space,
-            chunk_size=self.parent_chunk_size,
-            chunk_overlap=0,  # Can change this at a later point of time
-            length_function=len,
-            is_separator_regex=False
-        )
-        self.child_text_splitter = CharacterTextSplitter(
-            separator=self.space,
-            chunk_size=self.chunk_size,
-            chunk_overlap=self.chunk_overlap,
-            length_function=len,
-            is_separator_regex=False
-        )
-        parent_chunks = self.parent_text_splitter.split_text(data)
+    def chunk_source(self, source: ChunkSource, start: int = 0, end: Optional[int] = None) -> List[Chunk]:
+        end = len(source.text) if end is None else end
+        token_ends = None
+        if self.tokenizer is not None:
+            # The range is tokenized once for both parent and child windows
+            token_ends = self.tokenizer.token_ends(source.text[start:end]) + start
         overall_chunks = []
-        for parent_chunk in parent_chunks:
-            chunk_object = Chunk(parent_chunk)
-            child_chunks = self.child_text_splitter.split_text(parent_chunk)
-            for child_chunk in child_chunks:
-                child_chunk_object = Chunk(child_chunk)
+        # Parent and child windows are merged from the same scan over the words
+        nested = self.parent_text_splitter.split_nested(source.text, self.text_splitter, start, end, token_ends)
+        for (parent_start, parent_end), child_chunks in nested:
+            chunk_object = self._new_chunk(source, parent_start, parent_end)
+            # Children reference the same source buffer as their parent
+            for child_start, child_end in child_chunks:
+                # Child IDs derive from the parent, a child in the overlap of two parents gets two
+                child_chunk_object = self._new_chunk(source, child_start, child_end, chunk_object)
                 chunk_object.add_child(child_chunk_object)
 
             overall_chunks.append(chunk_object)
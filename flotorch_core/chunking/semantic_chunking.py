@@ -0,0 +1,135 @@
+import re
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from flotorch_core.embedding.embedding import BaseEmbedding
+
+from .chunking import Chunk, ChunkSource
+from .fixedsize_chunking import FixedSizeChunker
+from .tokenizer import BaseTokenizer
+
+
+class SemanticChunker(FixedSizeChunker):
+    """
+    This class is responsible for chunking the text on sentence boundaries, merging
+    adjacent sentences while their embeddings stay similar.
+    Sentences are embedded in batches of embedding_batch_size through the embedder and
+    every boundary is decided in one vectorized cosine pass over the float32 sentence
+    matrix. A chunk never grows beyond chunk_size; a single sentence longer than that is
+    cut into fixed size windows.
+    :param embedder: The embedding model used to compare sentences.
+    :param chunk_size: The maximum size of a chunk.
+    :param similarity_threshold: The cosine similarity below which adjacent sentences are
+        put in different chunks.
+    :param embedding_batch_size: The number of sentences embedded per embed_list call.
+    :param tokenizer: Sizes chunks in real tokens, otherwise chunk_size is converted to
+        characters with tokens_per_charecter.
+    """
+    sentence_end = re.compile(r'(?<=[.!?]) ')
+
+    def __init__(self, embedder: BaseEmbedding, chunk_size: int, similarity_threshold: float = 0.75,
+                 embedding_batch_size: int = 32, tokenizer: Optional[BaseTokenizer] = None):
+        super().__init__(chunk_size, 0, tokenizer)
+        if embedder is None:
+            raise ValueError("embedder is required for semantic chunking")
+        if not -1.0 <= similarity_threshold <= 1.0:
+            raise ValueError("similarity_threshold must be between -1 and 1")
+        if embedding_batch_size < 1:
+            raise ValueError("embedding_batch_size must be positive")
+        self.embedder = embedder
+        self.similarity_threshold = similarity_threshold
+        self.embedding_batch_size = embedding_batch_size
+
+    def chunk_source(self, source: ChunkSource, start: int = 0, end: Optional[int] = None) -> List[Chunk]:
+        end = len(source.text) if end is None else end
+        sentences = self._sentences(source.text, start, end)
+        if not sentences:
+            return []
+
+        breaks = self._breaks(source, sentences)
+        token_ends = None
+        if self.tokenizer is not None:
+            token_ends = self.tokenizer.token_ends(source.text[start:end]) + start
+        starts, ends = self._sizes(sentences, token_ends)
+        chunks = []
+        first = 0
+        for i in range(1, len(sentences) + 1):
+            if i < len(sentences) and not breaks[i - 1] and ends[i] - starts[first] <= self.chunk_size:
+                continue
+            chunks.extend(self._group_chunks(source, sentences[first][0], sentences[i - 1][1],
+                                             ends[i - 1] - starts[first], token_ends))
+            first = i
+        return chunks
+
+    def _use_process_pool(self, data: List[str]) -> bool:
+        # The time goes into embedding calls and the embedder holds clients that cannot be pickled
+        return False
+
+    def _sentences(self, text: str, start: int, end: int) -> List[Tuple[int, int]]:
+        """
+        Finds the sentences of the start:end range of a prepared text.
+        :return: The (start, end) offsets of every non empty sentence.
+        """
+        sentences = []
+        sentence_start = start
+        for match in self.sentence_end.finditer(text, start, end):
+            self._append_sentence(text, sentences, sentence_start, match.start())
+            sentence_start = match.end()
+        self._append_sentence(text, sentences, sentence_start, end)
+        return sentences
+
+    @staticmethod
+    def _append_sentence(text: str, sentences: List[Tuple[int, int]], start: int, end: int):
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        if start < end:
+            sentences.append((start, end))
+
+    def _breaks(self, source: ChunkSource, sentences: List[Tuple[int, int]]) -> np.ndarray:
+        """
+        Embeds the sentences and compares every sentence with the following one.
+        :return: For every pair of adjacent sentences, True if a chunk ends between them.
+        """
+        if len(sentences) < 2:
+            return np.zeros(0, dtype=bool)
+        vectors = self._embed(source, sentences)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        similarities = np.einsum('ij,ij->i', vectors[:-1], vectors[1:])
+        return similarities < self.similarity_threshold
+
+    def _embed(self, source: ChunkSource, sentences: List[Tuple[int, int]]) -> np.ndarray:
+        """
+        Embeds the sentences in batches into a float32 matrix with one row per sentence.
+        """
+        rows = []
+        for i in range(0, len(sentences), self.embedding_batch_size):
+            batch = [Chunk.from_source(source, start, end) for start, end in sentences[i:i + self.embedding_batch_size]]
+            rows.append(self.embedder.embed_list(batch).vectors)
+        return np.vstack(rows)
+
+    def _sizes(self, sentences: List[Tuple[int, int]],
+               token_ends: Optional[np.ndarray]) -> Tuple[List[int], List[int]]:
+        """
+        Measures the sentences so that sentences first to last span ends[last] - starts[first].
+        :return: The cumulative size at the start and at the end of every sentence.
+        """
+        starts = [sentence_start for sentence_start, _ in sentences]
+        ends = [sentence_end for _, sentence_end in sentences]
+        if token_ends is None:
+            return starts, ends
+        return self.tokenizer.tokens_before(token_ends, starts), self.tokenizer.tokens_before(token_ends, ends)
+
+    def _group_chunks(self, source: ChunkSource, start: int, end: int, size: int,
+                      token_ends: Optional[np.ndarray]) -> List[Chunk]:
+        """
+        Creates the chunk of a group of sentences, cut into fixed size windows when a single
+        sentence exceeds chunk_size.
+        """
+        if size <= self.chunk_size:
+            return [self._new_chunk(source, start, end)]
+        return [self._new_chunk(source, window_start, window_end)
+                for window_start, window_end in self.text_splitter.split_offsets(source.text, start, end, token_ends)]
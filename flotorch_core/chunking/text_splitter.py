@@ -0,0 +1,196 @@
+from bisect import bisect_left, bisect_right
+from itertools import accumulate, repeat
+from operator import add
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from flotorch_core.utils.text_normalizer import collapse_repeated
+
+from .tokenizer import BaseTokenizer
+
+
+class FixedSizeTextSplitter:
+    """
+    Splits text into windows of at most chunk_size characters, cutting only on the separator.
+    Windows are computed as (start, end) offsets in a single scan over the words of the
+    text, without building intermediate strings, and produce the same output as langchain's
+    CharacterTextSplitter configured with the same separator, chunk_size, chunk_overlap
+    and length_function=len.
+    When a tokenizer is given, chunk_size and chunk_overlap are measured in tokens instead:
+    the text is tokenized once and window lengths are read off the cumulative token counts.
+    """
+
+    def __init__(self, chunk_size: int, chunk_overlap: int, separator: str = ' ',
+                 tokenizer: Optional[BaseTokenizer] = None):
+        """
+        Constructs a new FixedSizeTextSplitter object.
+        Args:
+            chunk_size (int): The maximum length of a window.
+            chunk_overlap (int): The maximum length shared by consecutive windows.
+            separator (str): The separator the text is cut on.
+            tokenizer (Optional[BaseTokenizer]): Measures lengths in tokens, characters by default.
+        """
+        if not separator:
+            raise ValueError("separator cannot be empty")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.separator = separator
+        self.tokenizer = tokenizer
+
+    def normalize(self, text: str) -> str:
+        """
+        Collapses runs of the separator so that every window is a plain slice of the text.
+        Args:
+            text (str): The input text.
+        Returns:
+            str: The text with repeated separators collapsed into one.
+        """
+        return collapse_repeated(text, self.separator)
+
+    def split_offsets(self, text: str, start: int = 0, end: Optional[int] = None,
+                      token_ends: Optional[np.ndarray] = None) -> List[Tuple[int, int]]:
+        """
+        Computes the windows of an already normalized text, or of its start:end range.
+        Args:
+            text (str): The normalized input text.
+            start (int): The start offset of the range to split.
+            end (Optional[int]): The end offset of the range to split, the end of text by default.
+            token_ends (Optional[np.ndarray]): The tokenizer output for the whole text, when it
+                was already computed, otherwise only the range is tokenized; only used with a
+                tokenizer.
+        Returns:
+            List[Tuple[int, int]]: The (start, end) offsets of the windows in text.
+        """
+        words = self._words(text, start, end, token_ends)
+        if words is None:
+            return []
+        bounds, lengths, separator_len = words
+        windows = []
+        for first, last in self._windows(lengths, separator_len, 0, len(bounds) - 1):
+            self._append_window(text, windows, bounds[first], bounds[last + 1] - len(self.separator))
+        return windows
+
+    def split_nested(self, text: str, child_splitter: 'FixedSizeTextSplitter', start: int = 0,
+                     end: Optional[int] = None, token_ends: Optional[np.ndarray] = None
+                     ) -> List[Tuple[Tuple[int, int], List[Tuple[int, int]]]]:
+        """
+        Computes the windows of an already normalized text together with the windows
+        child_splitter cuts each of them into. The words are located in a single scan
+        shared by both levels, and children are merged from the words of their parent
+        so they always nest inside it.
+        Args:
+            text (str): The normalized input text.
+            child_splitter (FixedSizeTextSplitter): The splitter of the child windows, it must
+                use the same separator and tokenizer.
+            start (int): The start offset of the range to split.
+            end (Optional[int]): The end offset of the range to split, the end of text by default.
+            token_ends (Optional[np.ndarray]): The tokenizer output for the whole text, when it
+                was already computed; only used with a tokenizer.
+        Returns:
+            List[Tuple[Tuple[int, int], List[Tuple[int, int]]]]: The (start, end) offsets of
+                every window and of its children.
+        """
+        words = self._words(text, start, end, token_ends)
+        if words is None:
+            return []
+        bounds, lengths, separator_len = words
+        separator_end = len(self.separator)
+        nested = []
+        for first, last in self._windows(lengths, separator_len, 0, len(bounds) - 1):
+            parent = []
+            self._append_window(text, parent, bounds[first], bounds[last + 1] - separator_end)
+            if not parent:
+                continue
+            children = []
+            for child_first, child_last in child_splitter._windows(lengths, separator_len, first, last + 1):
+                self._append_window(text, children, bounds[child_first], bounds[child_last + 1] - separator_end)
+            nested.append((parent[0], children))
+        return nested
+
+    def split_text(self, text: str) -> List[str]:
+        """
+        Splits the input text into windows.
+        Args:
+            text (str): The input text.
+        Returns:
+            List[str]: The text of the windows.
+        """
+        text = self.normalize(text)
+        return [text[start:end] for start, end in self.split_offsets(text)]
+
+    def _words(self, text: str, start: int, end: Optional[int],
+               token_ends: Optional[np.ndarray]) -> Optional[Tuple[List[int], List[int], int]]:
+        """
+        Locates the words of the start:end range of a normalized text.
+        Returns:
+            Optional[Tuple[List[int], List[int], int]]: The start offset of every word followed
+                by the end of the last word plus the separator length, the cumulative length at
+                every bound and the length of the separator in the unit of lengths; None when
+                the range holds no word.
+        """
+        separator_len = len(self.separator)
+        end = len(text) if end is None else end
+        lead = start + separator_len if text.startswith(self.separator, start, end) else start
+        body = text[lead:end]
+        if body.endswith(self.separator):
+            body = body[:-separator_len]
+        if not body:
+            return None
+
+        # In a normalized text words are exactly one separator apart, so the word
+        # offsets follow from the cumulative word lengths: word i spans
+        # bounds[i] to bounds[i + 1] - len(separator)
+        word_lengths = map(len, body.split(self.separator))
+        bounds = list(accumulate(map(add, word_lengths, repeat(separator_len)), initial=lead))
+        if self.tokenizer is None:
+            return bounds, bounds, separator_len
+
+        if token_ends is None:
+            # Only the range is tokenized, from the separator the text merges into its first word
+            span_start = lead - separator_len if lead >= separator_len and \
+                text.startswith(self.separator, lead - separator_len) else lead
+            token_ends = self.tokenizer.token_ends(text[span_start:bounds[-1] - separator_len]) + span_start
+        # A separator is merged into the token of the following word, so it has no length of its own
+        return bounds, self.tokenizer.tokens_before(token_ends, bounds), 0
+
+    def _windows(self, lengths: List[int], separator_len: int, first: int, words: int) -> Iterator[Tuple[int, int]]:
+        """
+        Greedily merges the consecutive words first to words - 1 into windows, keeping up
+        to chunk_overlap of the previous window at the start of the next one. The length
+        between two word boundaries is the difference of their cumulative lengths, so each
+        window boundary is found by binary search instead of word by word.
+        Args:
+            lengths (List[int]): The cumulative length at every word boundary.
+            separator_len (int): The length of the separator.
+            first (int): The index of the first word.
+            words (int): The index past the last word.
+        Returns:
+            Iterator[Tuple[int, int]]: The indices of the first and last word of every window.
+        """
+        while True:
+            # The last word that still fits, a word longer than chunk_size stands alone
+            limit = lengths[first] + self.chunk_size + separator_len
+            last = max(bisect_right(lengths, limit, first + 1, words + 1) - 2, first)
+            yield first, last
+            following = last + 1
+            if following == words:
+                return
+            # Drop words from the front until at most chunk_overlap is kept
+            # and the following word fits next to them
+            end = lengths[last + 1] - separator_len
+            following_end = lengths[following + 1] - separator_len
+            bound = max(end - self.chunk_overlap, following_end - self.chunk_size)
+            first = bisect_left(lengths, bound, first + 1, following)
+
+    @staticmethod
+    def _append_window(text: str, windows: List[Tuple[int, int]], start: int, end: int):
+        """
+        Appends a window after trimming surrounding whitespace; empty windows are dropped.
+        """
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        if start < end:
+            windows.append((start, end))
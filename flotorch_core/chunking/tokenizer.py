@@ -0,0 +1,120 @@
+from abc import ABC, abstractmethod
+from typing import List, Sequence
+
+import numpy as np
+
+
+class BaseTokenizer(ABC):
+    """
+    Abstract base class for the tokenizers used to size chunks in tokens instead of characters.
+    A document is tokenized once; window lengths are then read off the cumulative token
+    counts at word boundaries, so candidate chunks are never re-tokenized.
+    """
+
+    @abstractmethod
+    def token_ends(self, text: str) -> np.ndarray:
+        """
+        Tokenizes the text.
+        Args:
+            text (str): The text to tokenize.
+        Returns:
+            np.ndarray: The sorted character offset at which every token ends.
+        """
+        pass
+
+    def count(self, text: str) -> int:
+        """
+        Counts the tokens of a text.
+        Args:
+            text (str): The text to tokenize.
+        Returns:
+            int: The number of tokens.
+        """
+        return len(self.token_ends(text))
+
+    @staticmethod
+    def tokens_before(token_ends: np.ndarray, offsets: Sequence[int]) -> List[int]:
+        """
+        Computes, for every character offset, the number of tokens that end at or before it.
+        Args:
+            token_ends (np.ndarray): The token end offsets returned by token_ends.
+            offsets (Sequence[int]): Sorted character offsets.
+        Returns:
+            List[int]: The cumulative token count at every offset.
+        """
+        return np.searchsorted(token_ends, np.asarray(offsets), side='right').tolist()
+
+
+class TiktokenTokenizer(BaseTokenizer):
+    """
+    Tokenizer backed by a tiktoken encoding.
+    """
+
+    def __init__(self, encoding_name: str = "cl100k_base"):
+        """
+        Constructs a new TiktokenTokenizer object.
+        Args:
+            encoding_name (str): The name of the tiktoken encoding.
+        """
+        self.encoding_name = encoding_name
+        self._encoding = None
+
+    @property
+    def encoding(self):
+        if self._encoding is None:
+            try:
+                import tiktoken
+            except ImportError:
+                raise ImportError("TiktokenTokenizer requires tiktoken, install it with `pip install FloTorch-core[tokenizers]`")
+            self._encoding = tiktoken.get_encoding(self.encoding_name)
+        return self._encoding
+
+    def token_ends(self, text: str) -> np.ndarray:
+        tokens = self.encoding.encode_ordinary(text)
+        if not tokens:
+            return np.empty(0, dtype=np.int64)
+        _, starts = self.encoding.decode_with_offsets(tokens)
+        ends = np.empty(len(starts), dtype=np.int64)
+        ends[:-1] = starts[1:]
+        ends[-1] = len(text)
+        return ends
+
+    def __getstate__(self):
+        # The encoding is reloaded lazily, e.g. in chunk_list worker processes
+        return {"encoding_name": self.encoding_name, "_encoding": None}
+
+
+class HuggingFaceTokenizer(BaseTokenizer):
+    """
+    Tokenizer backed by a Hugging Face fast tokenizer, e.g. the one of the embedding model.
+    """
+
+    def __init__(self, model_name: str):
+        """
+        Constructs a new HuggingFaceTokenizer object.
+        Args:
+            model_name (str): The name of the model on the Hugging Face hub.
+        """
+        self.model_name = model_name
+        self._tokenizer = None
+
+    @property
+    def tokenizer(self):
+        if self._tokenizer is None:
+            try:
+                from tokenizers import Tokenizer
+            except ImportError:
+                raise ImportError("HuggingFaceTokenizer requires tokenizers, install it with `pip install FloTorch-core[tokenizers]`")
+            self._tokenizer = Tokenizer.from_pretrained(self.model_name)
+        return self._tokenizer
+
+    def token_ends(self, text: str) -> np.ndarray:
+        encoding = self.tokenizer.encode(text, add_special_tokens=False)
+        if not encoding.offsets:
+            return np.empty(0, dtype=np.int64)
+        ends = np.fromiter((end for _, end in encoding.offsets), dtype=np.int64, count=len(encoding.offsets))
+        # Offsets of merged or normalized tokens are not guaranteed to be monotonic
+        return np.maximum.accumulate(ends)
+
+    def __getstate__(self):
+        return {"model_name": self.model_name, "_tokenizer": None}
@@ -1,7 +1,10 @@
+import io
 import json
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from typing import List, Dict, Any
-from abc import abstractmethod
 import boto3
+from botocore.config import Config
 
 from flotorch_core.chunking.chunking import Chunk
 from flotorch_core.utils.bedrock_retry_handler import BedRockRetryHander
@@ -12,7 +15,17 @@ class BedRockEmbedding(BaseEmbedding):
     def __init__(self, model_id: str, region: str, dimensions: int = 256, normalize: bool = True) -> None:
         super().__init__(model_id, region, dimensions, normalize)
         self._application_json = "application/json"
-        self.client = boto3.client("bedrock-runtime", region_name=self.region)
+        self.client = self._create_client()
+        # The async client opened by the aembed or aembed_batch call in progress
+        self._async_client = ContextVar(f"bedrock_async_client_{id(self)}", default=None)
+
+    def _create_client(self):
+        # botocore keeps 10 connections by default, fewer than max_in_flight workers would need
+        return boto3.client("bedrock-runtime", region_name=self.region,
+                            config=Config(max_pool_connections=max(10, self.max_in_flight)))
+
+    def _size_connection_pool(self, size: int) -> None:
+        self.client = self._create_client()
 
     @BedRockRetryHander()
     def embed(self, chunk: Chunk) -> Embeddings:
@@ -23,6 +36,70 @@ class BedRockEmbedding(BaseEmbedding):
         return Embeddings(embeddings=self.extract_embedding(model_response),
                           metadata=metadata, text=chunk.data)
 
+    """
+    Opens an aiobotocore client for the requests of one aembed or aembed_batch call. Without
+    aiobotocore installed the requests run in worker threads instead.
+    """
+    @asynccontextmanager
+    async def _async_scope(self):
+        if self._async_client.get() is not None:
+            yield
+            return
+        try:
+            from aiobotocore.config import AioConfig
+            from aiobotocore.session import get_session
+        except ImportError:
+            yield
+            return
+        config = AioConfig(max_pool_connections=max(10, self.async_max_in_flight))
+        async with get_session().create_client("bedrock-runtime", region_name=self.region, config=config) as client:
+            token = self._async_client.set(client)
+            try:
+                yield
+            finally:
+                self._async_client.reset(token)
+
+    async def _aembed_pack(self, chunks: List[Chunk]) -> List[Embeddings]:
+        client = self._async_client.get()
+        if client is None:
+            return await super()._aembed_pack(chunks)
+        response = await self._ainvoke_model(client, self._prepare_pack(chunks))
+        return self._pack_embeddings(response, chunks)
+
+    """
+    Prepares the payload of a request embedding the chunks of a pack, one chunk unless the
+    model accepts several texts per request.
+    :param chunks: The chunks of the request.
+    :return: The payload.
+    """
+    def _prepare_pack(self, chunks: List[Chunk]) -> Dict:
+        return self._prepare_chunk(chunks[0])
+
+    """
+    Extracts the embeddings of a pack from the response.
+    :param response: The response, its body not read yet.
+    :param chunks: The chunks of the request.
+    :return: The embeddings in the order of the chunks.
+    """
+    def _pack_embeddings(self, response: Dict[str, Any], chunks: List[Chunk]) -> List[Embeddings]:
+        metadata = self._extract_metadata(response)
+        model_response = self._parse_model_response(response)
+        return [Embeddings(embeddings=self.extract_embedding(model_response),
+                           metadata=metadata, text=chunks[0].data)]
+
+    @BedRockRetryHander()
+    async def _ainvoke_model(self, client, payload: Dict[str, Any]) -> Dict[str, Any]:
+        response = await client.invoke_model(
+            modelId=self.model_id,
+            contentType=self._application_json,
+            accept=self._application_json,
+            body=json.dumps(payload)
+        )
+        # The streamed body is read here so the response parses like a synchronous one
+        async with response['body'] as stream:
+            response['body'] = io.BytesIO(await stream.read())
+        return response
+
     def _invoke_model(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         return self.client.invoke_model(
             modelId=self.model_id,
@@ -5,9 +5,10 @@ from flotorch_core.config.env_config_provider import EnvConfigProvider
 from flotorch_core.embedding.sagemaker_embedding import SageMakerEmbedder
 from flotorch_core.embedding.embedding_registry import register
 
-env_config_provider = EnvConfigProvider()
-config = Config(env_config_provider)
 
+def _sagemaker_role() -> str:
+    # Read when a model is created rather than at import, which only resolves the class
+    return Config(EnvConfigProvider()).get_sagemaker_arn_role()
 
 
 @register("huggingface-sentencesimilarity-bge-large-en-v1-5")
@@ -15,24 +16,38 @@ class BGELargeEmbedding(SageMakerEmbedder):
     """
     BGE Large Hugging Face model for sentence similarity.
     """
+    # text_inputs is a list, packs are bounded to keep the request within the endpoint memory
+    max_batch_size = 32
+    max_batch_tokens = 8192
+
     def __init__(self, model_id: str, region: str, dimensions: int = 256, normalize: bool = True) -> None:
-        super().__init__(model_id, region, config.get_sagemaker_arn_role(), dimensions, normalize)
+        super().__init__(model_id, region, _sagemaker_role(), dimensions, normalize)
 
     def _prepare_chunk(self, chunk: Chunk) -> Dict:
         return {"text_inputs": [chunk.data], "mode": "embedding"}
 
+    def _prepare_batch(self, chunks: List[Chunk]) -> Dict:
+        return {"text_inputs": [chunk.data for chunk in chunks], "mode": "embedding"}
+
 
 @register("huggingface-sentencesimilarity-bge-m3")
 class BGEM3Embedding(SageMakerEmbedder):
     """
     BGE M3 Hugging Face model for sentence similarity.
     """
+    # text_inputs is a list, packs are bounded to keep the request within the endpoint memory
+    max_batch_size = 32
+    max_batch_tokens = 8192
+
     def __init__(self, model_id: str, region: str, dimensions: int = 256, normalize: bool = True) -> None:
-        super().__init__(model_id, region, config.get_sagemaker_arn_role(), dimensions, normalize)
+        super().__init__(model_id, region, _sagemaker_role(), dimensions, normalize)
 
     def _prepare_chunk(self, chunk: Chunk) -> Dict:
         return {"text_inputs": [chunk.data], "mode": "embedding"}
 
+    def _prepare_batch(self, chunks: List[Chunk]) -> Dict:
+        return {"text_inputs": [chunk.data for chunk in chunks], "mode": "embedding"}
+
 
 @register("huggingface-textembedding-gte-qwen2-7b-instruct")
 class GTEQwen2Embedding(SageMakerEmbedder):
@@ -40,7 +55,7 @@ class GTEQwen2Embedding(SageMakerEmbedder):
     GTE Qwen2-7B Instruct Hugging Face model for text embedding.
     """
     def __init__(self, model_id: str, region: str, dimensions: int = 256, normalize: bool = True) -> None:
-        super().__init__(model_id, region, config.get_sagemaker_arn_role(), dimensions, normalize)
+        super().__init__(model_id, region, _sagemaker_role(), dimensions, normalize)
 
     def _prepare_chunk(self, chunk: Chunk) -> Dict:
         return {"inputs": [chunk.data]}
@@ -0,0 +1,318 @@
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from flotorch_core.chunking.chunking import Chunk
+from flotorch_core.embedding.embedding import BaseEmbedding, EmbeddingMetadata, Embeddings
+from flotorch_core.logger.global_logger import get_logger
+
+logger = get_logger()
+
+
+@dataclass
+class CacheStats:
+    """
+    Lookup counters of a CachedEmbedding.
+    """
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    memory_evictions: int = 0
+    disk_evictions: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class _MemoryTier:
+    """
+    LRU of float32 vectors bounded by the bytes of the vectors it holds.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._vectors: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        vector = self._vectors.get(key)
+        if vector is not None:
+            self._vectors.move_to_end(key)
+        return vector
+
+    def put(self, key: str, vector: np.ndarray) -> int:
+        """
+        Stores the vector and evicts the least recently used ones above max_bytes.
+        :return: The number of evicted vectors.
+        """
+        if vector.nbytes > self.max_bytes:
+            return 0
+        previous = self._vectors.pop(key, None)
+        if previous is not None:
+            self.bytes -= previous.nbytes
+        if vector.base is not None:
+            # A row of a batch matrix would keep the whole matrix alive, beyond the bytes counted
+            vector = vector.copy()
+        self._vectors[key] = vector
+        self.bytes += vector.nbytes
+        evicted = 0
+        while self.bytes > self.max_bytes:
+            _, oldest = self._vectors.popitem(last=False)
+            self.bytes -= oldest.nbytes
+            evicted += 1
+        return evicted
+
+    def __len__(self):
+        return len(self._vectors)
+
+
+class _DiskTier:
+    """
+    SQLite table of float32 blobs bounded by the bytes of the blobs, evicting the least
+    recently used rows first. The key columns are the model settings and the text hash.
+    """
+    # SQLite accepts at most 999 parameters per statement in older builds
+    _lookup_batch = 500
+
+    def __init__(self, path: str, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "model_id TEXT NOT NULL, dimension INTEGER NOT NULL, normalize INTEGER NOT NULL, "
+                "text_hash TEXT NOT NULL, vector BLOB NOT NULL, size INTEGER NOT NULL, "
+                "accessed INTEGER NOT NULL, "
+                "PRIMARY KEY (model_id, dimension, normalize, text_hash))"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS embeddings_accessed ON embeddings (accessed)")
+        self.bytes, clock = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0), COALESCE(MAX(accessed), 0) FROM embeddings").fetchone()
+        self._clock = clock
+
+    def get_many(self, model: Tuple, hashes: List[str]) -> Dict[str, np.ndarray]:
+        vectors = {}
+        for i in range(0, len(hashes), self._lookup_batch):
+            batch = hashes[i:i + self._lookup_batch]
+            rows = self._connection.execute(
+                "SELECT text_hash, vector FROM embeddings WHERE model_id = ? AND dimension = ? "
+                f"AND normalize = ? AND text_hash IN ({','.join('?' * len(batch))})",
+                (*model, *batch)
+            ).fetchall()
+            vectors.update((text_hash, np.frombuffer(blob, dtype=np.float32)) for text_hash, blob in rows)
+        if vectors:
+            self._clock += 1
+            with self._connection:
+                self._connection.executemany(
+                    "UPDATE embeddings SET accessed = ? WHERE model_id = ? AND dimension = ? "
+                    "AND normalize = ? AND text_hash = ?",
+                    [(self._clock, *model, text_hash) for text_hash in vectors]
+                )
+        return vectors
+
+    def put_many(self, model: Tuple, vectors: Dict[str, np.ndarray]) -> int:
+        """
+        Stores the vectors in one transaction and evicts the least recently used rows above
+        max_bytes.
+        :return: The number of evicted rows.
+        """
+        self._clock += 1
+        rows = [(*model, text_hash, vector.tobytes(), vector.nbytes, self._clock)
+                for text_hash, vector in vectors.items() if vector.nbytes <= self.max_bytes]
+        with self._connection:
+            for row in rows:
+                previous = self._connection.execute(
+                    "SELECT size FROM embeddings WHERE model_id = ? AND dimension = ? AND normalize = ? "
+                    "AND text_hash = ?", row[:4]).fetchone()
+                self.bytes += row[5] - (previous[0] if previous else 0)
+                self._connection.execute("INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?, ?, ?, ?)", row)
+            return self._evict()
+
+    def _evict(self) -> int:
+        if self.bytes <= self.max_bytes:
+            return 0
+        excess = self.bytes - self.max_bytes
+        freed = 0
+        victims = []
+        # Row by row in LRU order, so a batch larger than the space left only evicts what it must
+        cursor = self._connection.execute("SELECT rowid, size FROM embeddings ORDER BY accessed, rowid")
+        for rowid, size in cursor:
+            victims.append((rowid,))
+            freed += size
+            if freed >= excess:
+                break
+        cursor.close()
+        self._connection.executemany("DELETE FROM embeddings WHERE rowid = ?", victims)
+        self.bytes -= freed
+        return len(victims)
+
+    def close(self):
+        self._connection.close()
+
+
+class CachedEmbedding(BaseEmbedding):
+    """
+    Wraps an embedding model with a cache of the vectors it returned, so that the same texts
+    are not embedded again by later runs with the same model settings.
+    Vectors are keyed on (model_id, dimension, normalize, sha256(text)) and stored as float32.
+    Lookups go to an in-memory LRU first and then to an optional SQLite file, both bounded in
+    bytes. Cached embeddings are returned with zero tokens and latency.
+    Batched, concurrent and async calls only send the missing texts to the wrapped model,
+    which packs and parallelizes them with its own settings.
+    :param base_embedding: The embedding model to cache.
+    :param path: The SQLite file of the disk tier, no disk tier when None.
+    :param max_memory_bytes: The most vector bytes kept in memory.
+    :param max_disk_bytes: The most vector bytes kept on disk.
+    """
+
+    def __init__(self, base_embedding: BaseEmbedding, path: Optional[str] = None,
+                 max_memory_bytes: int = 256 * 1024 * 1024, max_disk_bytes: int = 4 * 1024 * 1024 * 1024):
+        super().__init__(base_embedding.model_id, base_embedding.region,
+                         base_embedding.dimension, base_embedding.normalize)
+        if max_memory_bytes < 0 or max_disk_bytes < 0:
+            raise ValueError("cache sizes must not be negative")
+        self.base_embedding = base_embedding
+        self.max_batch_size = base_embedding.max_batch_size
+        self.max_batch_tokens = base_embedding.max_batch_tokens
+        self.stats = CacheStats()
+        self._model = (base_embedding.model_id, base_embedding.dimension, int(base_embedding.normalize))
+        self._memory = _MemoryTier(max_memory_bytes)
+        self._disk = _DiskTier(path, max_disk_bytes) if path is not None else None
+        self._lock = threading.Lock()
+
+    """
+    Concurrency is configured on the wrapped model, which sends the missing texts.
+    """
+    @property
+    def max_in_flight(self) -> int:
+        return self.base_embedding.max_in_flight
+
+    @max_in_flight.setter
+    def max_in_flight(self, max_in_flight: int):
+        self.base_embedding.max_in_flight = max_in_flight
+
+    def _prepare_chunk(self, chunk: Chunk) -> Dict:
+        return self.base_embedding._prepare_chunk(chunk)
+
+    """
+    Embeds the chunk, from the cache when its text was embedded before.
+    :param chunk: The chunk to be embedded.
+    :return: The embeddings.
+    """
+    def embed(self, chunk: Chunk) -> Embeddings:
+        return self.embed_batch([chunk])[0]
+
+    """
+    Embeds a list of chunks, sending the texts missing from the cache to the wrapped model
+    in one embed_batch call. A text repeated in the list is embedded once.
+    :param chunks: The chunks to be embedded.
+    :return: The embeddings in the order of the chunks.
+    """
+    def embed_batch(self, chunks: List[Chunk]) -> List[Embeddings]:
+        hashes, embeddings, missing = self._lookup(chunks)
+        if missing:
+            self._fill(hashes, embeddings, missing, self.base_embedding.embed_batch(list(missing.values())))
+        return embeddings
+
+    async def aembed(self, chunk: Chunk) -> Embeddings:
+        return (await self.aembed_batch([chunk]))[0]
+
+    async def aembed_batch(self, chunks: List[Chunk]) -> List[Embeddings]:
+        hashes, embeddings, missing = self._lookup(chunks)
+        if missing:
+            self._fill(hashes, embeddings, missing, await self.base_embedding.aembed_batch(list(missing.values())))
+        return embeddings
+
+    def clear_memory(self):
+        """
+        Drops the in-memory tier, e.g. to measure the disk tier alone.
+        """
+        with self._lock:
+            self._memory = _MemoryTier(self._memory.max_bytes)
+
+    def close(self):
+        if self._disk is not None:
+            self._disk.close()
+        super().close()
+
+    def log_stats(self):
+        logger.info(f"Embedding cache for {self.model_id}: {self.stats.hits} hits "
+                    f"({self.stats.memory_hits} memory, {self.stats.disk_hits} disk), "
+                    f"{self.stats.misses} misses, hit ratio {self.stats.hit_ratio:.1%}")
+
+    @staticmethod
+    def _hash(text: str) -> str:
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def _lookup(self, chunks: List[Chunk]) -> Tuple[List[str], List[Optional[Embeddings]], Dict[str, Chunk]]:
+        """
+        Resolves the chunks from the cache.
+        :return: The text hash of every chunk, the cached embeddings with None for misses and
+            the first chunk of every missing hash.
+        """
+        hashes = [self._hash(chunk.data) for chunk in chunks]
+        vectors: Dict[str, np.ndarray] = {}
+        with self._lock:
+            for text_hash in hashes:
+                vector = self._memory.get(text_hash)
+                if vector is not None:
+                    vectors[text_hash] = vector
+            self.stats.memory_hits += sum(text_hash in vectors for text_hash in hashes)
+            if self._disk is not None:
+                on_disk = self._disk.get_many(self._model, list({h for h in hashes if h not in vectors}))
+                self.stats.disk_hits += sum(text_hash in on_disk for text_hash in hashes)
+                for text_hash, vector in on_disk.items():
+                    self.stats.memory_evictions += self._memory.put(text_hash, vector)
+                vectors.update(on_disk)
+
+        embeddings: List[Optional[Embeddings]] = []
+        missing: Dict[str, Chunk] = {}
+        for chunk, text_hash in zip(chunks, hashes):
+            vector = vectors.get(text_hash)
+            if vector is None:
+                missing.setdefault(text_hash, chunk)
+                embeddings.append(None)
+            else:
+                embeddings.append(Embeddings(vector.tolist(), EmbeddingMetadata(0, 0), chunk.data))
+        with self._lock:
+            # A text repeated in the batch is sent once, its repeats count as memory hits
+            self.stats.misses += len(missing)
+            self.stats.memory_hits += embeddings.count(None) - len(missing)
+        return hashes, embeddings, missing
+
+    def _fill(self, hashes: List[str], embeddings: List[Optional[Embeddings]], missing: Dict[str, Chunk],
+              computed: List[Embeddings]):
+        """
+        Stores the embeddings of the missing hashes and puts them in place of the misses. A text
+        repeated in the batch reuses the vector with zero metadata.
+        """
+        by_hash = dict(zip(missing, computed))
+        vectors = {text_hash: np.asarray(embedding.embeddings, dtype=np.float32).reshape(-1)
+                   for text_hash, embedding in by_hash.items() if embedding is not None}
+        with self._lock:
+            for text_hash, vector in vectors.items():
+                self.stats.memory_evictions += self._memory.put(text_hash, vector)
+            if self._disk is not None and vectors:
+                self.stats.disk_evictions += self._disk.put_many(self._model, vectors)
+
+        for i, text_hash in enumerate(hashes):
+            if embeddings[i] is not None or text_hash not in by_hash:
+                continue
+            embedding = by_hash.pop(text_hash)
+            if embedding is None:
+                continue
+            embeddings[i] = embedding
+            # The other occurrences of the text are served from the vector just stored
+            if text_hash in vectors:
+                by_hash[text_hash] = Embeddings(embedding.embeddings, EmbeddingMetadata(0, 0), embedding.text)
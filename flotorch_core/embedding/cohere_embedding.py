@@ -1,7 +1,9 @@
 from typing import Any, Dict, List
 
 from flotorch_core.chunking.chunking import Chunk
+from flotorch_core.utils.bedrock_retry_handler import BedRockRetryHander
 from .bedrock_embedding import BedRockEmbedding
+from .embedding import Embeddings
 from .embedding_registry import register
 
 """
@@ -18,6 +20,9 @@ class CohereEmbedding(BedRockEmbedding):
     :param normalize: Normalize the embedding.
     """
 
+    # Bedrock accepts up to 96 texts per Cohere embed request
+    max_batch_size = 96
+
     def __init__(self, model_id: str, region: str, dimensions: int = 256, normalize: bool = True) -> None:
         super().__init__(model_id, region, dimensions, normalize)
 
@@ -33,3 +38,22 @@ class CohereEmbedding(BedRockEmbedding):
     def extract_embedding(self, response: Dict[str, Any]) -> List[float]:
         return response["embeddings"][0]
 
+    """
+    Embeds up to max_batch_size chunks in a single request.
+    :param chunks: The chunks to be embedded.
+    :return: The embeddings, the token count and latency of the request are split by text length.
+    """
+    @BedRockRetryHander()
+    def _embed_pack(self, chunks: List[Chunk]) -> List[Embeddings]:
+        return self._pack_embeddings(self._invoke_model(self._prepare_pack(chunks)), chunks)
+
+    def _prepare_pack(self, chunks: List[Chunk]) -> Dict:
+        return {"texts": [chunk.data for chunk in chunks], "input_type": "search_document"}
+
+    def _pack_embeddings(self, response: Dict[str, Any], chunks: List[Chunk]) -> List[Embeddings]:
+        texts = [chunk.data for chunk in chunks]
+        metadata = self._extract_metadata(response).split([len(text) for text in texts])
+        vectors = self._parse_model_response(response)["embeddings"]
+        return [Embeddings(embeddings=vector, metadata=item_metadata, text=text)
+                for vector, item_metadata, text in zip(vectors, metadata, texts)]
+
@@ -1,8 +1,15 @@
+import asyncio
+import weakref
 from abc import ABC, abstractmethod
-import re
-from typing import List, Dict
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from collections.abc import MutableSequence
+from contextlib import asynccontextmanager
+from typing import Iterator, List, Dict, Optional, Tuple
+
+import numpy as np
 
 from flotorch_core.chunking.chunking import Chunk
+from flotorch_core.utils.text_normalizer import clean_text_for_vector_db
 
 """
 This class is responsible for embedding the text using the Llama model.
@@ -21,6 +28,16 @@ class EmbeddingMetadata:
         self.input_tokens += int(metadata.input_tokens)
         self.latency_ms += int(metadata.latency_ms)
 
+    def split(self, weights: List[int]) -> List['EmbeddingMetadata']:
+        """
+        Splits the metadata of a packed request into per-item metadata proportional to the
+        weights, e.g. the text lengths. The parts add up to the totals of the request.
+        :param weights: The weight of every item of the request.
+        :return: The metadata of every item.
+        """
+        return [EmbeddingMetadata(input_tokens, latency_ms) for input_tokens, latency_ms in
+                zip(_apportion(int(self.input_tokens), weights), _apportion(int(self.latency_ms), weights))]
+
     def to_json(self):
         return {
             'input_token': self.input_tokens,
@@ -28,6 +45,22 @@ class EmbeddingMetadata:
         }
 
 
+def _apportion(total: int, weights: List[int]) -> List[int]:
+    """
+    Distributes an integer total proportionally to the weights, handing the remainder out by
+    largest fractional part so that the parts add up to the total.
+    """
+    weight_sum = sum(weights)
+    if weight_sum <= 0:
+        weights, weight_sum = [1] * len(weights), len(weights)
+    shares = [total * weight / weight_sum for weight in weights]
+    parts = [int(share) for share in shares]
+    remainders = sorted(range(len(shares)), key=lambda i: parts[i] - shares[i])
+    for i in remainders[:total - sum(parts)]:
+        parts[i] += 1
+    return parts
+
+
 class Embeddings:
     """
     Initializes the Embeddings class.
@@ -39,6 +72,12 @@ class Embeddings:
         self.metadata = metadata
         self.text = text
         self.id = ''
+        # The ID of the parent record holding the text of a hierarchical chunk
+        self.parent_id: Optional[str] = None
+        # The text of that parent, stored by to_json for writers without parent records
+        self.parent_text: Optional[str] = None
+        # The ID of the child chunk of a hierarchical chunk, id being the ID of its parent
+        self.child_id: Optional[str] = None
 
     def clean_text_for_vector_db(self, text):
         """
@@ -51,35 +90,353 @@ class Embeddings:
         Returns:
             str: The cleaned text.
         """
-        # Remove single and double quotes
-        text = text.replace('"', '').replace("'", "")
-        # Remove special symbols (keeping alphanumerics and spaces)
-        text = re.sub(r'[^a-zA-Z0-9\s]', '', text)
-        # Remove newlines and tabs
-        text = text.replace('\n', ' ').replace('\t', ' ')
-        # Normalize whitespace
-        text = re.sub(r'\s+', ' ', text)
-        # Strip leading and trailing spaces
-        return text.strip()
+        return clean_text_for_vector_db(text)
 
+    """
+    The document of the embedding. The children of a hierarchical chunk are stored with the
+    text of their parent, as they were before parent records, since the documents written one
+    by one with write or write_bulk have no parent record to fetch it from; bulk_bodies of
+    EmbeddingList stores their own text instead.
+    """
     def to_json(self) -> Dict:
-        return {
-            "vectors": self.embeddings,
-            "text": self.clean_text_for_vector_db(self.text),
+        document = {
+            "vectors": self.embeddings.tolist() if isinstance(self.embeddings, np.ndarray) else self.embeddings,
+            "text": self.clean_text_for_vector_db(self.text if self.parent_text is None else self.parent_text),
             "metadata": {
                     "inputTokens": self.metadata.input_tokens,
                     "latencyMs": self.metadata.latency_ms
                 }
         }
+        if self.parent_id is not None:
+            document["parent_id"] = self.parent_id
+        return document
+
+
+def _column(name: str) -> property:
+    def get(row: '_EmbeddingRow'):
+        return getattr(row._list, name)[row._index]
+
+    def set(row: '_EmbeddingRow', value):
+        getattr(row._list, name)[row._index] = value
+
+    return property(get, set)
+
+
+class _EmbeddingRow(Embeddings):
+    """
+    Embeddings reading and writing a row of an EmbeddingList, so that setting its attributes
+    changes the list. The row is addressed by position, deleting or inserting rows before it
+    moves it. The metadata is a copy, it is changed by assigning a new EmbeddingMetadata.
+    """
+
+    def __init__(self, embedding_list: 'EmbeddingList', index: int):
+        self._list = embedding_list
+        self._index = index
+
+    id = _column('ids')
+    text = _column('texts')
+    parent_id = _column('parent_ids')
+    child_id = _column('child_ids')
+
+    @property
+    def embeddings(self) -> np.ndarray:
+        return self._list._matrix[self._index]
+
+    @embeddings.setter
+    def embeddings(self, embeddings):
+        self._list._matrix[self._index] = np.asarray(embeddings, dtype=np.float32).reshape(-1)
+
+    @property
+    def metadata(self) -> EmbeddingMetadata:
+        return EmbeddingMetadata(self._list.input_tokens[self._index], self._list.latency_ms[self._index])
+
+    @metadata.setter
+    def metadata(self, metadata: EmbeddingMetadata):
+        self._list.input_tokens[self._index] = metadata.input_tokens
+        self._list.latency_ms[self._index] = metadata.latency_ms
+
+    @property
+    def parent_text(self) -> Optional[str]:
+        return self._list.parents.get(self.parent_id) if self.parent_id is not None else None
+
+    @parent_text.setter
+    def parent_text(self, parent_text: Optional[str]):
+        if parent_text is not None:
+            self._list.parents[self.parent_id] = parent_text
+
+    def detach(self) -> Embeddings:
+        """
+        Copies the row into Embeddings of its own.
+        """
+        embeddings = Embeddings(self.embeddings.copy(), self.metadata, self.text)
+        embeddings.id = self.id
+        embeddings.parent_id = self.parent_id
+        embeddings.child_id = self.child_id
+        embeddings.parent_text = self.parent_text
+        return embeddings
+
+
+class _EmbeddingsView(MutableSequence):
+    """
+    The rows of an EmbeddingList as a mutable sequence, compatible with the list of
+    Embeddings that EmbeddingList.embeddings used to be.
+    """
+
+    def __init__(self, embedding_list: 'EmbeddingList'):
+        self._list = embedding_list
+
+    def __len__(self) -> int:
+        return len(self._list)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._list[i] for i in range(len(self._list))[index]]
+        return self._list[index]
+
+    def __setitem__(self, index, embeddings: Embeddings):
+        if isinstance(index, slice):
+            raise TypeError("EmbeddingList rows cannot be assigned by slice")
+        row = self._list[index]
+        row.embeddings = embeddings.embeddings
+        row.metadata = embeddings.metadata
+        row.text = embeddings.text
+        row.id = embeddings.id
+        row.parent_id = embeddings.parent_id
+        row.child_id = embeddings.child_id
+        row.parent_text = embeddings.parent_text
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            for i in sorted(range(len(self._list))[index], reverse=True):
+                self._list.delete(i)
+        else:
+            self._list.delete(index)
+
+    def insert(self, index: int, embeddings: Embeddings) -> None:
+        self._list.insert(index, embeddings)
+
+    def pop(self, index: int = -1) -> Embeddings:
+        embeddings = self._list[index].detach()
+        self._list.delete(index)
+        return embeddings
+
+    def __add__(self, other) -> List[Embeddings]:
+        return list(self) + list(other)
+
+    def __radd__(self, other) -> List[Embeddings]:
+        return list(other) + list(self)
+
+    def __repr__(self) -> str:
+        return f"<{len(self)} embeddings of {type(self._list).__name__}>"
+
 
 class EmbeddingList:
+    """
+    Columnar list of embeddings. The vectors are the rows of one contiguous float32 matrix,
+    the IDs, texts and per-embedding metadata are parallel columns. Iterating, indexing or
+    reading embeddings yields Embeddings that read and write their row, and embeddings is a
+    mutable sequence of the rows that appends, inserts and deletes rows.
+    The children of a hierarchical chunk keep their own text and reference the parent record
+    in parents, which holds every parent text once by parent ID.
+    """
+    _initial_capacity = 16
+
     def __init__(self):
-        self.embeddings: List[Embeddings] = []
         self.metadata = EmbeddingMetadata(0, 0)
+        self.ids: List[str] = []
+        self.texts: List[str] = []
+        self.parent_ids: List[Optional[str]] = []
+        self.child_ids: List[Optional[str]] = []
+        self.parents: Dict[str, str] = {}
+        self.input_tokens: List[int] = []
+        self.latency_ms: List[int] = []
+        self._matrix: Optional[np.ndarray] = None
+
+    def append(self, embeddings: Embeddings, count_metadata: bool = True) -> 'EmbeddingList':
+        """
+        Appends the embeddings as a new row.
+        :param embeddings: The embeddings.
+        :param count_metadata: Adds the metadata to the totals of the list, False for a row that
+            reuses the vector of another request.
+        :return: The list.
+        """
+        vector = np.asarray(embeddings.embeddings, dtype=np.float32).reshape(-1)
+        count = len(self.ids)
+        if self._matrix is None:
+            self._matrix = np.empty((self._initial_capacity, vector.size), dtype=np.float32)
+        elif vector.size != self._matrix.shape[1]:
+            raise ValueError(f"Expected an embedding of dimension {self._matrix.shape[1]}, got {vector.size}")
+        if count == len(self._matrix):
+            # Doubling keeps appends amortized constant time
+            grown = np.empty((2 * count, self._matrix.shape[1]), dtype=np.float32)
+            grown[:count] = self._matrix
+            self._matrix = grown
+        self._matrix[count] = vector
+        self.ids.append(embeddings.id)
+        self.texts.append(embeddings.text)
+        self.parent_ids.append(embeddings.parent_id)
+        self.child_ids.append(embeddings.child_id)
+        if embeddings.parent_text is not None:
+            self.parents.setdefault(embeddings.parent_id, embeddings.parent_text)
+        self.input_tokens.append(embeddings.metadata.input_tokens)
+        self.latency_ms.append(embeddings.metadata.latency_ms)
+        if count_metadata:
+            self.metadata.append(embeddings.metadata)
+        return self
+
+    def insert(self, index: int, embeddings: Embeddings, count_metadata: bool = True) -> 'EmbeddingList':
+        """
+        Inserts the embeddings as a new row before index, moving the following rows.
+        :param embeddings: The embeddings.
+        :param count_metadata: Adds the metadata to the totals of the list.
+        :return: The list.
+        """
+        count = len(self.ids)
+        index = min(max(index + count if index < 0 else index, 0), count)
+        self.append(embeddings, count_metadata)
+        if index == count:
+            return self
+        self._matrix[index + 1:count + 1] = self._matrix[index:count].copy()
+        self._matrix[index] = np.asarray(embeddings.embeddings, dtype=np.float32).reshape(-1)
+        for column in (self.ids, self.texts, self.parent_ids, self.child_ids, self.input_tokens, self.latency_ms):
+            column.insert(index, column.pop())
+        return self
 
-    def append(self, embeddings: Embeddings):
-        self.embeddings.append(embeddings)
-        self.metadata.append(embeddings.metadata)
+    def delete(self, index: int) -> None:
+        """
+        Deletes a row, moving the following rows. The metadata totals are kept.
+        """
+        count = len(self.ids)
+        index = range(count)[index]
+        self._matrix[index:count - 1] = self._matrix[index + 1:count].copy()
+        for column in (self.ids, self.texts, self.parent_ids, self.child_ids, self.input_tokens, self.latency_ms):
+            del column[index]
+
+    def extend(self, embedding_list: 'EmbeddingList') -> 'EmbeddingList':
+        """
+        Appends the embeddings and parent records of another list.
+        :return: The list.
+        """
+        for embeddings in embedding_list:
+            self.append(embeddings)
+        self.parents.update(embedding_list.parents)
+        return self
+
+    def add_parent(self, parent_id: str, text: str) -> None:
+        """
+        Records the text of a parent chunk referenced by the parent_id of its children.
+        """
+        self.parents[parent_id] = text
+
+    def parent_records(self) -> List[Dict]:
+        """
+        The parent records to store next to the child vectors, one per parent.
+        """
+        return [{"parent_id": parent_id, "text": clean_text_for_vector_db(text)}
+                for parent_id, text in self.parents.items()]
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """
+        The (count, dimension) float32 matrix of the vectors, a view without copy.
+        """
+        if self._matrix is None:
+            return np.empty((0, 0), dtype=np.float32)
+        return self._matrix[:len(self.ids)]
+
+    @property
+    def embeddings(self) -> MutableSequence:
+        """
+        The rows as a mutable sequence of Embeddings: setting an attribute of a row, assigning,
+        appending, inserting or deleting a row changes the list.
+        """
+        return _EmbeddingsView(self)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index: int) -> Embeddings:
+        return _EmbeddingRow(self, range(len(self.ids))[index])
+
+    def __iter__(self) -> Iterator[Embeddings]:
+        return (self[i] for i in range(len(self.ids)))
+
+    def save_npy(self, file) -> None:
+        """
+        Writes the vector matrix in .npy format straight from its buffer.
+        :param file: A path or a binary file object.
+        """
+        np.save(file, self.vectors)
+
+    def to_arrow(self):
+        """
+        Converts the list to a pyarrow Table with id, text, parent_id, child_id, vector,
+        input_tokens and latency_ms columns. Parent records are in parents. The vector column wraps the float32 matrix without copying it.
+        :return: The pyarrow.Table.
+        """
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError("pyarrow is required to export embeddings to Arrow") from e
+        vectors = self.vectors
+        return pa.table({
+            "id": pa.array(self.ids, type=pa.string()),
+            "text": pa.array(self.texts, type=pa.string()),
+            "parent_id": pa.array(self.parent_ids, type=pa.string()),
+            "child_id": pa.array(self.child_ids, type=pa.string()),
+            "vector": pa.FixedSizeListArray.from_arrays(pa.array(vectors.reshape(-1)), vectors.shape[1]),
+            "input_tokens": pa.array([int(tokens) for tokens in self.input_tokens], type=pa.int64()),
+            "latency_ms": pa.array([int(latency) for latency in self.latency_ms], type=pa.int64())
+        })
+
+    def bulk_bodies(self, index: str, batch_size: int = 500, id_field: str = "chunk_id",
+                    parent_index: Optional[str] = None, quantizer=None) -> Iterator[List[Dict]]:
+        """
+        Builds OpenSearch bulk bodies for the list, batch_size documents at a time, so that
+        only one batch of vectors is held as Python floats while indexing.
+        Parent records come first, with the parent ID as document ID. Vector documents have the
+        layout of Embeddings.to_json plus the ID under id_field, with the own text of children
+        since their parent text is in the parent records. Their document ID is the embedding
+        ID, or the child ID for the children that share the ID of their parent, so that
+        indexing the same chunks again overwrites their documents.
+        :param index: The index to write the vectors to.
+        :param batch_size: The number of documents per body.
+        :param id_field: The document field holding the embedding ID.
+        :param parent_index: The index to write the parent records to, index when None.
+        :param quantizer: A fitted quantizer of flotorch_core.embedding.quantization to store
+            codes instead of float vectors.
+        :return: The bodies, each to be passed to write_bulk.
+        """
+        parent_index = parent_index or index
+        parent_records = self.parent_records()
+        for start in range(0, len(parent_records), batch_size):
+            body = []
+            for record in parent_records[start:start + batch_size]:
+                body.append({"index": {"_index": parent_index, "_id": record["parent_id"]}})
+                body.append(record)
+            yield body
+
+        vectors = self.vectors
+        for start in range(0, len(self.ids), batch_size):
+            end = min(start + batch_size, len(self.ids))
+            codes = quantizer.encode(vectors[start:end]) if quantizer is not None else None
+            body = []
+            for i in range(start, end):
+                document = {
+                    id_field: self.ids[i],
+                    "vectors": vectors[i].tolist() if codes is None else quantizer.index_vector(codes[i - start]),
+                    "text": clean_text_for_vector_db(self.texts[i]),
+                    "metadata": {
+                        "inputTokens": self.input_tokens[i],
+                        "latencyMs": self.latency_ms[i]
+                    }
+                }
+                if self.parent_ids[i] is not None:
+                    document["parent_id"] = self.parent_ids[i]
+                document_id = self.child_ids[i] or self.ids[i]
+                body.append({"index": {"_index": index, "_id": document_id} if document_id else {"_index": index}})
+                body.append(document)
+            yield body
 
 """
 This class is responsible for embedding the text."""
@@ -90,12 +447,64 @@ class BaseEmbedding(ABC):
     :param normalize: Normalize the embedding.
     """
 
+    # The most chunks and estimated tokens a backend accepts in a single request
+    max_batch_size: int = 1
+    max_batch_tokens: Optional[int] = None
+    # The most requests the async methods of an instance await at once on an event loop
+    async_max_in_flight: int = 64
+
     def __init__(self,  model_id: str, region: str, dimensions: int = 256, normalize: bool = True) -> None:
         super().__init__()
         self.model_id = model_id
         self.region = region
         self.dimension = dimensions
         self.normalize = normalize
+        self._max_in_flight = 1
+        self._executor = None
+        self._async_semaphores = weakref.WeakKeyDictionary()
+
+    """
+    The number of requests embed_batch and embed_list keep in flight at once for this instance.
+    Above one, packed requests are sent from a thread pool of that size shared by all calls.
+    """
+    @property
+    def max_in_flight(self) -> int:
+        return self._max_in_flight
+
+    @max_in_flight.setter
+    def max_in_flight(self, max_in_flight: int):
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be positive")
+        if max_in_flight == self._max_in_flight:
+            return
+        self._max_in_flight = max_in_flight
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self._size_connection_pool(max_in_flight)
+
+    """
+    Stops the thread pool of max_in_flight, waiting for the requests in flight. The instance
+    stays usable, the next concurrent call starts a new pool.
+    """
+    def close(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def __enter__(self) -> 'BaseEmbedding':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    """
+    Sizes the HTTP connection pool of the backend client for the given number of concurrent
+    requests. Backends whose client pool is smaller than their worker count override this.
+    :param size: The number of concurrent requests.
+    """
+    def _size_connection_pool(self, size: int) -> None:
+        pass
 
     """
     Prepares the chunk for embedding.
@@ -115,6 +524,64 @@ class BaseEmbedding(ABC):
     def embed(self, chunk: Chunk) -> Embeddings:
         pass
 
+    """
+    Embeds a list of chunks with as few requests as the backend allows, packing up to
+    max_batch_size chunks and max_batch_tokens estimated tokens into each request.
+    :param chunks: The chunks to be embedded.
+    :return: The embeddings in the order of the chunks, each with its own share of the metadata.
+    """
+    def embed_batch(self, chunks: List[Chunk]) -> List[Embeddings]:
+        packs = list(self._packs(chunks))
+        if self._max_in_flight <= 1 or len(packs) <= 1:
+            embeddings = []
+            for pack in packs:
+                embeddings.extend(self._embed_request(pack))
+            return embeddings
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_in_flight,
+                                                thread_name_prefix=f"{type(self).__name__}-embed")
+        futures = [self._executor.submit(self._embed_request, pack) for pack in packs]
+        done, pending = wait(futures, return_when=FIRST_EXCEPTION)
+        failed = next((future for future in futures if future in done and future.exception() is not None), None)
+        if failed is not None:
+            # Requests that have not started yet are dropped, the first failure is raised as is
+            for future in pending:
+                future.cancel()
+            raise failed.exception()
+        return [embedding for future in futures for embedding in future.result()]
+
+    def _embed_request(self, pack: List[Chunk]) -> List[Embeddings]:
+        return self._embed_pack(pack) if len(pack) > 1 else [self.embed(pack[0])]
+
+    """
+    Embeds the chunks of one packed request. Backends that accept several inputs per request
+    override this together with max_batch_size.
+    :param chunks: The chunks of the request.
+    :return: The embeddings in the order of the chunks.
+    """
+    def _embed_pack(self, chunks: List[Chunk]) -> List[Embeddings]:
+        return [self.embed(chunk) for chunk in chunks]
+
+    def _packs(self, chunks: List[Chunk]) -> Iterator[List[Chunk]]:
+        pack = []
+        pack_tokens = 0
+        for chunk in chunks:
+            tokens = self._estimate_tokens(chunk)
+            if pack and (len(pack) >= self.max_batch_size or
+                         (self.max_batch_tokens is not None and pack_tokens + tokens > self.max_batch_tokens)):
+                yield pack
+                pack, pack_tokens = [], 0
+            pack.append(chunk)
+            pack_tokens += tokens
+        if pack:
+            yield pack
+
+    @staticmethod
+    def _estimate_tokens(chunk: Chunk) -> int:
+        # Four characters per token, the estimate the chunkers size windows with
+        return len(chunk.data) // 4 + 1
+
     """
     Embeds the list of chunks.
     :param chunks: The list of chunks to be embedded.
@@ -124,15 +591,110 @@ class BaseEmbedding(ABC):
         embedding_list = EmbeddingList()
         if not isinstance(chunks, list):
             return embedding_list.append(self.embed(chunks))
+        inputs, owners = self._flatten(chunks)
+        return self._assemble(self.embed_batch(inputs), owners)
+
+    """
+    Embeds the chunk without blocking the event loop.
+    :param chunk: The chunk to be embedded.
+    :return: The embeddings.
+    """
+    async def aembed(self, chunk: Chunk) -> Embeddings:
+        async with self._async_scope():
+            return (await self._aembed_request([chunk]))[0]
+
+    """
+    Embeds a list of chunks without blocking the event loop, packing them like embed_batch.
+    At most async_max_in_flight requests of this instance are awaited at once per event loop.
+    :param chunks: The chunks to be embedded.
+    :return: The embeddings in the order of the chunks.
+    """
+    async def aembed_batch(self, chunks: List[Chunk]) -> List[Embeddings]:
+        packs = list(self._packs(chunks))
+        async with self._async_scope():
+            tasks = [asyncio.ensure_future(self._aembed_request(pack)) for pack in packs]
+            if not tasks:
+                return []
+            done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            failed = next((task for task in tasks if task in done and task.exception() is not None), None)
+            if failed is not None:
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                raise failed.exception()
+            return [embedding for task in tasks for embedding in task.result()]
+
+    """
+    Embeds the list of chunks without blocking the event loop.
+    :param chunks: The list of chunks to be embedded.
+    :return: The list of embeddings.
+    """
+    async def aembed_list(self, chunks: List[Chunk]) -> EmbeddingList:
+        if not isinstance(chunks, list):
+            embedding_list = EmbeddingList()
+            embedding_list.append(await self.aembed(chunks))
+            return embedding_list
+        inputs, owners = self._flatten(chunks)
+        return self._assemble(await self.aembed_batch(inputs), owners)
+
+    """
+    Embeds the chunks of one packed request asynchronously. Backends with an async client
+    override this; the default runs the blocking request in a worker thread.
+    :param chunks: The chunks of the request.
+    :return: The embeddings in the order of the chunks.
+    """
+    async def _aembed_pack(self, chunks: List[Chunk]) -> List[Embeddings]:
+        return await asyncio.to_thread(self._embed_request, chunks)
+
+    async def _aembed_request(self, pack: List[Chunk]) -> List[Embeddings]:
+        async with self._async_semaphore():
+            return await self._aembed_pack(pack)
+
+    """
+    Scope around the requests of one aembed or aembed_batch call, e.g. to open an async
+    client for its duration.
+    """
+    @asynccontextmanager
+    async def _async_scope(self):
+        yield
+
+    def _async_semaphore(self) -> asyncio.Semaphore:
+        # Semaphores are bound to the loop they are first awaited on
+        loop = asyncio.get_running_loop()
+        semaphore = self._async_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._async_semaphores[loop] = asyncio.Semaphore(self.async_max_in_flight)
+        return semaphore
+
+    @staticmethod
+    def _flatten(chunks: List[Chunk]) -> Tuple[List[Chunk], List[Tuple[str, Optional[Chunk], Optional[str]]]]:
+        """
+        Lists the chunks to embed, children in place of their parent, with the ID every
+        embedding is stored under and the parent chunk and the ID of children.
+        """
+        inputs = []
+        owners = []
         for chunk in chunks:
             if chunk.child_data:
                 for child_chunk in chunk.child_data:
-                    embedding = self.embed(child_chunk)
-                    embedding.id = chunk.id
-                    embedding.text = chunk.data
-                    embedding_list.append(embedding)
+                    inputs.append(child_chunk)
+                    owners.append((chunk.id, chunk, child_chunk.id))
             else:
-                embedding = self.embed(chunk)
-                embedding.id = chunk.id
-                embedding_list.append(embedding)
-        return embedding_list
\ No newline at end of file
+                inputs.append(chunk)
+                owners.append((chunk.id, None, None))
+        return inputs, owners
+
+    @staticmethod
+    def _assemble(embeddings: List[Embeddings],
+                  owners: List[Tuple[str, Optional[Chunk], Optional[str]]]) -> EmbeddingList:
+        embedding_list = EmbeddingList()
+        for embedding, (chunk_id, parent, child_id) in zip(embeddings, owners):
+            embedding.id = chunk_id
+            if parent is not None:
+                embedding.child_id = child_id
+                # Children keep their own text, the parent text is recorded once
+                embedding.parent_id = chunk_id
+                embedding.parent_text = parent.data
+                embedding_list.add_parent(chunk_id, parent.data)
+            embedding_list.append(embedding)
+        return embedding_list
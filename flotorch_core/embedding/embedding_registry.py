@@ -1,21 +1,64 @@
+import importlib
+
+# The module registering every model. Backends are imported on the first lookup of one of
+# their models, so that e.g. a Bedrock-only worker never loads the SageMaker SDK.
+_MODEL_MODULES = {
+    "amazon.titan-embed-image-v1": "flotorch_core.embedding.titanv1_embedding",
+    "amazon.titan-embed-text-v1": "flotorch_core.embedding.titanv1_embedding",
+    "amazon.titan-text-express-v1": "flotorch_core.embedding.titanv1_embedding",
+    "amazon.titan-embed-text-v2:0": "flotorch_core.embedding.titanv2_embedding",
+    "cohere.embed-multilingual-v3": "flotorch_core.embedding.cohere_embedding",
+    "cohere.embed-english-v3": "flotorch_core.embedding.cohere_embedding",
+    "huggingface-sentencesimilarity-bge-large-en-v1-5": "flotorch_core.embedding.bge_large_embedding",
+    "huggingface-sentencesimilarity-bge-m3": "flotorch_core.embedding.bge_large_embedding",
+    "huggingface-textembedding-gte-qwen2-7b-instruct": "flotorch_core.embedding.bge_large_embedding",
+    "gateway": "flotorch_core.embedding.gateway_embedding",
+    "hashing": "flotorch_core.embedding.hashing_embedding",
+    "llama2": "flotorch_core.embedding.llama_embedding",
+}
+
+
 class EmbeddingRegistry:
-    def __init__(self):
+    """
+    Maps model IDs to embedding classes.
+    Classes register themselves with @register when their module is imported; model IDs of
+    model_modules resolve to classes by importing their module on first lookup.
+    :param model_modules: The module path of every lazily imported model ID.
+    """
+    def __init__(self, model_modules=None):
         self._models = {}
+        self._model_modules = dict(model_modules or {})
 
     def register_model(self, model_id, embedding_class):
         self._models[model_id] = embedding_class
 
+    def register_module(self, model_id, module_path):
+        """
+        Registers the module to import on the first lookup of the model ID.
+        """
+        self._model_modules[model_id] = module_path
+
     def get_model(self, model_id):
         embedding_class = self._models.get(model_id)
+        if not embedding_class and model_id in self._model_modules:
+            # The import runs the @register decorators of the module
+            importlib.import_module(self._model_modules[model_id])
+            embedding_class = self._models.get(model_id)
         if not embedding_class:
             raise ValueError(f"Model '{model_id}' not found in the registry.")
         return embedding_class
 
+    def model_ids(self):
+        """
+        The registered model IDs, imported or not.
+        """
+        return sorted(set(self._models) | set(self._model_modules))
+
 # Global registry instance
-embedding_registry = EmbeddingRegistry()
+embedding_registry = EmbeddingRegistry(_MODEL_MODULES)
 
 def register(model_id):
     def decorator(cls):
         embedding_registry.register_model(model_id, cls)
         return cls
-    return decorator
\ No newline at end of file
+    return decorator
@@ -1,8 +1,8 @@
 """
 This class is responsible for embedding the text using the Gateway model.
 """
-from typing import Dict
-from openai import OpenAI
+from typing import Dict, List
+from openai import AsyncOpenAI, OpenAI
 from flotorch_core.embedding.embedding import BaseEmbedding
 from flotorch_core.chunking.chunking import Chunk
 from flotorch_core.embedding.embedding import Embeddings, EmbeddingMetadata
@@ -20,6 +20,10 @@ class GatewayEmbedding(BaseEmbedding):
     :param dimensions: The dimensions of the embedding.
     :param normalize: Normalize the embeddings.
     """
+    # OpenAI compatible endpoints accept a list input, bounded in items and total tokens
+    max_batch_size = 128
+    max_batch_tokens = 300000
+
     def __init__(
         self,
         model_id: str,
@@ -36,6 +40,16 @@ class GatewayEmbedding(BaseEmbedding):
         self.client = OpenAI(
             api_key=self.api_key, base_url=self.base_url, default_headers=self.headers
         )
+        self._async_client = None
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        # Created on first use, so that synchronous users never build it
+        if self._async_client is None:
+            self._async_client = AsyncOpenAI(
+                api_key=self.api_key, base_url=self.base_url, default_headers=self.headers
+            )
+        return self._async_client
 
     def _prepare_chunk(self, chunk: Chunk) -> Dict:
         return {"input": chunk.data}
@@ -48,3 +62,24 @@ class GatewayEmbedding(BaseEmbedding):
         return Embeddings(
             embeddings=response.data[0].embedding, metadata=metadata, text=chunk.data
         )
+
+    def _embed_pack(self, chunks: List[Chunk]) -> List[Embeddings]:
+        texts = [chunk.data for chunk in chunks]
+        response = self.client.embeddings.create(input=texts, model=self.model_id)
+        return self._to_embeddings(response, texts)
+
+    async def _aembed_pack(self, chunks: List[Chunk]) -> List[Embeddings]:
+        texts = [chunk.data for chunk in chunks]
+        response = await self.async_client.embeddings.create(input=texts, model=self.model_id)
+        return self._to_embeddings(response, texts)
+
+    def _to_embeddings(self, response, texts: List[str]) -> List[Embeddings]:
+        metadata = EmbeddingMetadata(
+            input_tokens=response.usage.total_tokens, latency_ms=0.0
+        ).split([len(text) for text in texts])
+        # Items carry the index of their input, the order of the list is not guaranteed
+        vectors = [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+        return [
+            Embeddings(embeddings=vector, metadata=item_metadata, text=text)
+            for vector, item_metadata, text in zip(vectors, metadata, texts)
+        ]
@@ -1,17 +1,52 @@
+import asyncio
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from flotorch_core.embedding.embedding import BaseEmbedding
-from typing import List, Dict
+from typing import List, Dict, Optional
 from flotorch_core.chunking.chunking import Chunk
 from flotorch_core.embedding.embedding import Embeddings, EmbeddingList
 from flotorch_core.guardrails.guardrails import BaseGuardRail
+from flotorch_core.guardrails.verdict_cache import GuardrailVerdictCache
 
 
 class GuardrailsEmbedding(BaseEmbedding):
+    """
+    Embeds only the chunks the guardrail does not intervene on.
+    embed_list screens the chunks in batches of screening_batch_size through
+    BaseGuardRail.screen, which packs several texts per request, and embeds the chunks of a
+    batch as soon as it is screened while the following batches are screened, with up to
+    screening_concurrency batches in flight; aembed_list does the same on the event loop.
+    Verdicts are cached by guardrail ID and version and text hash, so that re-ingesting a
+    corpus skips the screening already paid for.
+    :param base_embedding: The embedding model.
+    :param base_guardrail: The guardrail screening the chunks.
+    :param verdict_cache: The verdict cache, a new in-memory one when None.
+    :param screening_batch_size: The number of chunks screened per batch.
+    :param screening_concurrency: The number of batches screened or embedded at once.
+    """
 
-    def __init__(self, base_embedding: BaseEmbedding, 
-                 base_guardrail: BaseGuardRail):
-        super().__init__(base_embedding.dimension, base_embedding.normalize)
+    def __init__(self, base_embedding: BaseEmbedding,
+                 base_guardrail: BaseGuardRail, verdict_cache: Optional[GuardrailVerdictCache] = None,
+                 screening_batch_size: int = 25, screening_concurrency: int = 4):
+        super().__init__(base_embedding.model_id, base_embedding.region,
+                         base_embedding.dimension, base_embedding.normalize)
+        if screening_batch_size < 1 or screening_concurrency < 1:
+            raise ValueError("screening_batch_size and screening_concurrency must be positive")
         self.base_embedding = base_embedding
         self.base_guardrail = base_guardrail
+        self.verdict_cache = verdict_cache if verdict_cache is not None else GuardrailVerdictCache()
+        self.screening_batch_size = screening_batch_size
+        self.screening_concurrency = screening_concurrency
+
+    """
+    Concurrency of the embedding requests is configured on the wrapped model.
+    """
+    @property
+    def max_in_flight(self) -> int:
+        return self.base_embedding.max_in_flight
+
+    @max_in_flight.setter
+    def max_in_flight(self, max_in_flight: int):
+        self.base_embedding.max_in_flight = max_in_flight
 
     def _prepare_chunk(self, chunk: Chunk) -> Dict:
         return self.base_embedding._prepare_chunk(chunk)
@@ -19,26 +54,130 @@ class GuardrailsEmbedding(BaseEmbedding):
     """
     Embeds the chunk.
     :param chunk: The chunk to be embedded.
-    :return: The embeddings.
+    :return: The embeddings, None if the guardrail intervened.
     """
     def embed(self, chunk: Chunk) -> Embeddings:
-        guardrail_response = self.base_guardrail.apply_guardrail(text=chunk.data)
-        if guardrail_response['action'] == 'GUARDRAIL_INTERVENED':
+        if self._blocked([chunk])[0]:
             return None
 
         return self.base_embedding.embed(chunk)
 
+    """
+    Embeds a list of chunks, screened together.
+    :param chunks: The chunks to be embedded.
+    :return: The embeddings in the order of the chunks, None for the chunks the guardrail
+        intervened on.
+    """
+    def embed_batch(self, chunks: List[Chunk]) -> List[Embeddings]:
+        blocked = self._blocked(chunks)
+        embeddings = iter(self.base_embedding.embed_batch([chunk for chunk, b in zip(chunks, blocked) if not b]))
+        return [None if b else next(embeddings) for b in blocked]
+
     """
     Embeds the list of chunks.
     :param chunks: The list of chunks to be embedded.
-    :return: The list of embeddings.
+    :return: The list of embeddings of the chunks the guardrail let through.
     """
     def embed_list(self, chunks: List[Chunk]) -> EmbeddingList:
         embedding_list = EmbeddingList()
         if not isinstance(chunks, list):
-            return embedding_list.append(self.embed(chunks))
-        for chunk in chunks:
-            embedding = self.embed(chunk)
-            if not embedding is None:
-                embedding_list.append(embedding)
+            embedding = self.embed(chunks)
+            return embedding_list if embedding is None else embedding_list.append(embedding)
+
+        batches = [chunks[i:i + self.screening_batch_size] for i in range(0, len(chunks), self.screening_batch_size)]
+        if self.screening_concurrency <= 1 or len(batches) <= 1:
+            for batch in batches:
+                embedding_list.extend(self._screen_and_embed(batch))
+            return embedding_list
+
+        with ThreadPoolExecutor(max_workers=self.screening_concurrency,
+                                thread_name_prefix=f"{type(self).__name__}-screen") as executor:
+            futures = [executor.submit(self._screen_and_embed, batch) for batch in batches]
+            done, pending = wait(futures, return_when=FIRST_EXCEPTION)
+            failed = next((future for future in futures if future in done and future.exception() is not None), None)
+            if failed is not None:
+                for future in pending:
+                    future.cancel()
+                raise failed.exception()
+        for future in futures:
+            embedding_list.extend(future.result())
+        return embedding_list
+
+    """
+    Embeds the chunk without blocking the event loop.
+    :param chunk: The chunk to be embedded.
+    :return: The embeddings, None if the guardrail intervened.
+    """
+    async def aembed(self, chunk: Chunk) -> Embeddings:
+        if (await asyncio.to_thread(self._blocked, [chunk]))[0]:
+            return None
+
+        return await self.base_embedding.aembed(chunk)
+
+    """
+    Embeds a list of chunks, screened together, without blocking the event loop.
+    :param chunks: The chunks to be embedded.
+    :return: The embeddings in the order of the chunks, None for the chunks the guardrail
+        intervened on.
+    """
+    async def aembed_batch(self, chunks: List[Chunk]) -> List[Embeddings]:
+        blocked = await asyncio.to_thread(self._blocked, chunks)
+        embeddings = iter(await self.base_embedding.aembed_batch([chunk for chunk, b in zip(chunks, blocked) if not b]))
+        return [None if b else next(embeddings) for b in blocked]
+
+    """
+    Embeds the list of chunks without blocking the event loop, screening batches like
+    embed_list with up to screening_concurrency batches in flight.
+    :param chunks: The list of chunks to be embedded.
+    :return: The list of embeddings of the chunks the guardrail let through.
+    """
+    async def aembed_list(self, chunks: List[Chunk]) -> EmbeddingList:
+        embedding_list = EmbeddingList()
+        if not isinstance(chunks, list):
+            embedding = await self.aembed(chunks)
+            return embedding_list if embedding is None else embedding_list.append(embedding)
+
+        slots = asyncio.Semaphore(self.screening_concurrency)
+
+        async def screen_and_embed(batch: List[Chunk]) -> EmbeddingList:
+            async with slots:
+                blocked = await asyncio.to_thread(self._blocked, batch)
+                passed = [chunk for chunk, b in zip(batch, blocked) if not b]
+                return await self.base_embedding.aembed_list(passed) if passed else EmbeddingList()
+
+        tasks = [asyncio.ensure_future(screen_and_embed(chunks[i:i + self.screening_batch_size]))
+                 for i in range(0, len(chunks), self.screening_batch_size)]
+        if not tasks:
+            return embedding_list
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        failed = next((task for task in tasks if task in done and task.exception() is not None), None)
+        if failed is not None:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            raise failed.exception()
+        for task in tasks:
+            embedding_list.extend(task.result())
         return embedding_list
+
+    def _screen_and_embed(self, chunks: List[Chunk]) -> EmbeddingList:
+        passed = [chunk for chunk, blocked in zip(chunks, self._blocked(chunks)) if not blocked]
+        return self.base_embedding.embed_list(passed) if passed else EmbeddingList()
+
+    def _blocked(self, chunks: List[Chunk]) -> List[bool]:
+        """
+        Screens the chunks whose text has no cached verdict, each distinct text once.
+        :return: For every chunk, True if the guardrail intervened.
+        """
+        guardrail = self.base_guardrail.cache_key
+        hashes = [self.verdict_cache.text_hash(chunk.data) for chunk in chunks]
+        verdicts = self.verdict_cache.get_many(guardrail, hashes)
+        unscreened = {}
+        for chunk, text_hash in zip(chunks, hashes):
+            if text_hash not in verdicts:
+                unscreened.setdefault(text_hash, chunk.data)
+        if unscreened:
+            screened = dict(zip(unscreened, self.base_guardrail.screen(list(unscreened.values()))))
+            self.verdict_cache.put_many(guardrail, screened)
+            verdicts.update(screened)
+        return [verdicts[text_hash] for text_hash in hashes]
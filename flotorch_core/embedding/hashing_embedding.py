@@ -0,0 +1,101 @@
+import re
+import time
+import zlib
+from typing import Dict, List
+
+import numpy as np
+
+from flotorch_core.chunking.chunking import Chunk
+from .embedding import BaseEmbedding, Embeddings, EmbeddingMetadata
+from .embedding_registry import register
+
+_TOKEN = re.compile(r"\w+")
+
+
+"""
+This class embeds text locally with the hashing trick, without a model or network access.
+"""
+@register("hashing")
+class HashingEmbedding(BaseEmbedding):
+    """
+    Initializes the HashingEmbedding class.
+    Every lowercased word of a text is hashed with CRC32 to a column of the vector and a sign,
+    and the signed counts are L2-normalized. Texts sharing words have a positive cosine
+    similarity, the same text always has the same vector on every machine, and a pack of texts
+    is embedded with a few NumPy operations, which makes it a stand-in for real models in load
+    tests and pipeline benchmarks. input_tokens counts the words and latency_ms the time spent
+    embedding.
+    :param model_id: The model id, "hashing".
+    :param region: Unused, the embedding runs locally.
+    :param dimensions: The dimension of the vectors.
+    :param normalize: Normalize the embedding.
+    :param seed: Seeds the hash, another seed gives unrelated vectors.
+    """
+
+    max_batch_size = 1024
+    # Embeddings hold float32 ndarrays instead of lists when set
+    return_arrays = False
+    # The most words whose code is kept, the cache starts over beyond
+    max_cached_tokens = 1_000_000
+
+    def __init__(self, model_id: str = "hashing", region: str = "local", dimensions: int = 256,
+                 normalize: bool = True, seed: int = 0) -> None:
+        super().__init__(model_id, region, dimensions, normalize)
+        if dimensions < 1:
+            raise ValueError("dimensions must be positive")
+        self.seed = seed
+        # Signed column + 1 of every word seen, the sign is the sign of the code
+        self._token_codes: Dict[str, int] = {}
+
+    def _prepare_chunk(self, chunk: Chunk) -> Dict:
+        return {"text": chunk.data}
+
+    def embed(self, chunk: Chunk) -> Embeddings:
+        return self._embed_pack([chunk])[0]
+
+    """
+    Embeds the chunks together: the codes of all the words are scattered into one matrix with
+    a single bincount.
+    :param chunks: The chunks to be embedded.
+    :return: The embeddings in the order of the chunks.
+    """
+    def _embed_pack(self, chunks: List[Chunk]) -> List[Embeddings]:
+        start = time.perf_counter()
+        texts = [chunk.data for chunk in chunks]
+        counts = []
+        tokens = []
+        for text in texts:
+            text_tokens = _TOKEN.findall(text.lower())
+            counts.append(len(text_tokens))
+            tokens.extend(text_tokens)
+
+        token_codes = self._token_codes
+        unseen = set(tokens).difference(token_codes)
+        if unseen:
+            if len(token_codes) + len(unseen) > self.max_cached_tokens:
+                # A new dict, concurrent packs keep reading the one they started with
+                token_codes = self._token_codes = {}
+                unseen = set(tokens)
+            for token in unseen:
+                token_codes[token] = self._token_code(token)
+        codes = np.fromiter(map(token_codes.__getitem__, tokens), dtype=np.int64, count=len(tokens))
+        rows = np.repeat(np.arange(len(texts), dtype=np.int64), counts)
+        matrix = np.bincount(rows * self.dimension + np.abs(codes) - 1, weights=np.sign(codes),
+                             minlength=len(texts) * self.dimension)
+        matrix = matrix.reshape(len(texts), self.dimension).astype(np.float32)
+        if self.normalize:
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            # Texts without words keep a zero vector
+            np.divide(matrix, norms, out=matrix, where=norms > 0)
+
+        latency_ms = int((time.perf_counter() - start) * 1000)
+        metadata = EmbeddingMetadata(sum(counts), latency_ms).split(counts)
+        return [Embeddings(embeddings=vector if self.return_arrays else vector.tolist(),
+                           metadata=item_metadata, text=text)
+                for vector, item_metadata, text in zip(matrix, metadata, texts)]
+
+    def _token_code(self, token: str) -> int:
+        value = zlib.crc32(token.encode('utf-8'), self.seed)
+        # The low bits pick the column and the high bit the sign
+        code = value % self.dimension + 1
+        return -code if value & 0x80000000 else code
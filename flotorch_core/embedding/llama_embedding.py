@@ -1,4 +1,4 @@
-from typing import List
+from typing import Dict, List
 
 import ollama
 from .embedding import BaseEmbedding, Embeddings, EmbeddingMetadata
@@ -16,15 +16,49 @@ class LlamaEmbedding(BaseEmbedding):
     :param model_id: The model id of the Llama model.
     """
 
+    max_batch_size = 64
+
     def __init__(self, model_id: str, region: str, dimensions: int = 256, normalize: bool = True):
         super().__init__(model_id, region, dimensions, normalize)
+        self._async_client = None
+
+    @property
+    def async_client(self) -> ollama.AsyncClient:
+        # Reads OLLAMA_HOST like the module level functions
+        if self._async_client is None:
+            self._async_client = ollama.AsyncClient()
+        return self._async_client
 
     """
     Prepares the chunk for embedding.
     :param chunk: The chunk to be embedded.
     :return: The prepared chunk.
     """
+    def _prepare_chunk(self, chunk: Chunk) -> Dict:
+        return {"model": self.model_id, "input": chunk.data}
+
     def embed(self, chunk: Chunk) -> Embeddings:
-        response = ollama.embeddings(model=self.model_id, prompt=chunk.data)
-        embedding = Embeddings(embeddings=response['embedding'], metadata=None)
-        return embedding
\ No newline at end of file
+        return self._embed_pack([chunk])[0]
+
+    """
+    Embeds the chunks with a single request to the embed endpoint, which takes a list input.
+    :param chunks: The chunks to be embedded.
+    :return: The embeddings, the prompt token count and duration of the request are split by text length.
+    """
+    def _embed_pack(self, chunks: List[Chunk]) -> List[Embeddings]:
+        texts = [chunk.data for chunk in chunks]
+        response = ollama.embed(model=self.model_id, input=texts)
+        return self._to_embeddings(response, texts)
+
+    async def _aembed_pack(self, chunks: List[Chunk]) -> List[Embeddings]:
+        texts = [chunk.data for chunk in chunks]
+        response = await self.async_client.embed(model=self.model_id, input=texts)
+        return self._to_embeddings(response, texts)
+
+    def _to_embeddings(self, response, texts: List[str]) -> List[Embeddings]:
+        metadata = EmbeddingMetadata(
+            input_tokens=response.get('prompt_eval_count') or 0,
+            latency_ms=(response.get('total_duration') or 0) // 1_000_000
+        ).split([len(text) for text in texts])
+        return [Embeddings(embeddings=vector, metadata=item_metadata, text=text)
+                for vector, item_metadata, text in zip(response['embeddings'], metadata, texts)]
@@ -0,0 +1,183 @@
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from flotorch_core.chunking.chunking import Chunk
+from flotorch_core.embedding.embedding import BaseEmbedding, Embeddings
+
+
+@dataclass
+class MicroBatchStats:
+    """
+    Counters of the embed calls a MicroBatchingEmbedding merged into batches.
+    """
+    requests: int = 0
+    batches: int = 0
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.requests / self.batches if self.batches else 0.0
+
+
+class MicroBatchingEmbedding(BaseEmbedding):
+    """
+    Wraps an embedding model so that concurrent embed calls, e.g. the query embeddings of
+    concurrent searches, are merged into batched requests.
+    The first pending call opens a window of max_wait_ms; the calls arriving within it, up to
+    max_batch_items, are sent together through the embed_batch of the wrapped model and every
+    caller receives its own embeddings. A call never waits more than max_wait_ms for others.
+    At most max_concurrent_batches batches are in flight; while they all are, new calls queue
+    up and leave in the next, larger batch.
+    :param base_embedding: The embedding model to batch calls for.
+    :param max_wait_ms: The longest a call waits for other calls to share its batch.
+    :param max_batch_items: The most calls per batch, by default what the wrapped model sends
+        in one round of requests.
+    :param max_concurrent_batches: The number of batches embedded at once.
+    """
+
+    def __init__(self, base_embedding: BaseEmbedding, max_wait_ms: float = 5.0,
+                 max_batch_items: Optional[int] = None, max_concurrent_batches: int = 4):
+        super().__init__(base_embedding.model_id, base_embedding.region,
+                         base_embedding.dimension, base_embedding.normalize)
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must not be negative")
+        if max_batch_items is not None and max_batch_items < 1:
+            raise ValueError("max_batch_items must be positive")
+        if max_concurrent_batches < 1:
+            raise ValueError("max_concurrent_batches must be positive")
+        self.base_embedding = base_embedding
+        self.max_batch_size = base_embedding.max_batch_size
+        self.max_batch_tokens = base_embedding.max_batch_tokens
+        self.max_wait_ms = max_wait_ms
+        self.max_batch_items = max_batch_items or base_embedding.max_batch_size * base_embedding.max_in_flight
+        self.stats = MicroBatchStats()
+        self._queue: "queue.Queue[Optional[Tuple[Chunk, Future]]]" = queue.Queue()
+        self._slots = threading.BoundedSemaphore(max_concurrent_batches)
+        self._batch_executor = ThreadPoolExecutor(max_workers=max_concurrent_batches,
+                                                  thread_name_prefix=f"{type(base_embedding).__name__}-batch")
+        self._lock = threading.Lock()
+        self._dispatcher: Optional[threading.Thread] = None
+        self._closed = False
+
+    """
+    Concurrency of a batch is configured on the wrapped model.
+    """
+    @property
+    def max_in_flight(self) -> int:
+        return self.base_embedding.max_in_flight
+
+    @max_in_flight.setter
+    def max_in_flight(self, max_in_flight: int):
+        self.base_embedding.max_in_flight = max_in_flight
+
+    def _prepare_chunk(self, chunk: Chunk) -> Dict:
+        return self.base_embedding._prepare_chunk(chunk)
+
+    """
+    Embeds the chunk in a batch with the concurrent calls.
+    :param chunk: The chunk to be embedded.
+    :return: The embeddings.
+    """
+    def embed(self, chunk: Chunk) -> Embeddings:
+        return self.submit(chunk).result()
+
+    async def aembed(self, chunk: Chunk) -> Embeddings:
+        return await asyncio.wrap_future(self.submit(chunk))
+
+    def submit(self, chunk: Chunk) -> Future:
+        """
+        Queues the chunk for the next batch.
+        :param chunk: The chunk to be embedded.
+        :return: A future of its embeddings.
+        """
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("MicroBatchingEmbedding is closed")
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(target=self._dispatch, daemon=True,
+                                                    name=f"{type(self.base_embedding).__name__}-micro-batcher")
+                self._dispatcher.start()
+            self._queue.put((chunk, future))
+        return future
+
+    """
+    Lists of chunks are already batched, they go to the wrapped model directly.
+    """
+    def embed_batch(self, chunks: List[Chunk]) -> List[Embeddings]:
+        return self.base_embedding.embed_batch(chunks)
+
+    async def aembed_batch(self, chunks: List[Chunk]) -> List[Embeddings]:
+        return await self.base_embedding.aembed_batch(chunks)
+
+    def close(self):
+        """
+        Embeds the pending calls and stops the dispatcher.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            dispatcher = self._dispatcher
+            self._queue.put(None)
+        if dispatcher is not None:
+            dispatcher.join()
+        self._batch_executor.shutdown(wait=True)
+        super().close()
+
+    def _dispatch(self):
+        stopped = False
+        while not stopped:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait_ms / 1000
+            while len(batch) < self.max_batch_items:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopped = True
+                    break
+                batch.append(item)
+
+            self._slots.acquire()
+            # Calls that queued while every batch was in flight join this one
+            while not stopped and len(batch) < self.max_batch_items:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopped = True
+                    break
+                batch.append(item)
+            self._batch_executor.submit(self._run, batch)
+
+    def _run(self, batch: List[Tuple[Chunk, Future]]):
+        try:
+            pending = [(chunk, future) for chunk, future in batch if future.set_running_or_notify_cancel()]
+            with self._lock:
+                self.stats.requests += len(pending)
+                self.stats.batches += 1 if pending else 0
+            if not pending:
+                return
+            try:
+                embeddings = self.base_embedding.embed_batch([chunk for chunk, _ in pending])
+            except BaseException as e:
+                for _, future in pending:
+                    future.set_exception(e)
+                return
+            for (_, future), embedding in zip(pending, embeddings):
+                future.set_result(embedding)
+        finally:
+            self._slots.release()
@@ -0,0 +1,295 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from flotorch_core.embedding.embedding import EmbeddingList
+
+"""
+Compression of embedding vectors for storage and search.
+Quantizers are fitted on a sample of vectors, encode float32 matrices into compact codes and
+turn codes into the vector values of an OpenSearch knn_vector field.
+"""
+
+# Number of set bits of every byte value
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+class BaseQuantizer(ABC):
+    """
+    Encodes float32 vectors into compact codes.
+    """
+
+    @abstractmethod
+    def fit(self, vectors: np.ndarray) -> 'BaseQuantizer':
+        """
+        Learns the parameters of the encoding from a sample of vectors.
+        :param vectors: A (count, dimension) sample.
+        :return: The quantizer.
+        """
+        pass
+
+    @abstractmethod
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Encodes a (count, dimension) matrix into one code per row.
+        """
+        pass
+
+    @abstractmethod
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """
+        Approximates the float32 vectors of the codes.
+        """
+        pass
+
+    @abstractmethod
+    def search(self, query: np.ndarray, codes: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Finds the k codes closest to a float query vector, scored the way the OpenSearch
+        field of knn_field_mapping scores the query vector of encode_query against the codes.
+        :return: The indices of the codes, best first, and their scores.
+        """
+        pass
+
+    @abstractmethod
+    def knn_field_mapping(self) -> Dict:
+        """
+        The OpenSearch knn_vector mapping of a field holding the codes.
+        """
+        pass
+
+    def encode_list(self, embedding_list: EmbeddingList) -> np.ndarray:
+        return self.encode(embedding_list.vectors)
+
+    def index_vector(self, code: np.ndarray) -> List:
+        """
+        The value of a knn_vector field for one code.
+        """
+        return code.tolist()
+
+    def encode_query(self, query: List[float]) -> List:
+        """
+        The knn query vector for a float query embedding.
+        """
+        return self.index_vector(self.encode(np.asarray(query, dtype=np.float32).reshape(1, -1))[0])
+
+    def bytes_per_vector(self, dimension: int) -> int:
+        return self.encode(np.zeros((1, dimension), dtype=np.float32)).nbytes
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        k = min(k, len(scores))
+        if k == 0:
+            return np.empty(0, dtype=np.int64), scores[:0]
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return top, scores[top]
+
+
+class ScalarQuantizer(BaseQuantizer):
+    """
+    int8 scalar quantization, a 4x reduction of float32, whose codes rank by their int8 inner
+    product like the vectors do by their float inner product, which is how an OpenSearch byte
+    index scores int8 query codes against int8 document codes.
+    Vectors are centred on the mean of the sample and divided by one scale shared by all
+    dimensions; a query is not centred and is scaled on its own so that its largest value maps
+    to 127. The int8 score is then (v - mean) . q / (scale * query_scale): the mean shifts all
+    the scores of a query by the same amount and the scales multiply them, the ranking is kept.
+    The scale maps the percentile of the absolute centred values of the sample to 127, values
+    beyond it are clipped.
+    :param percentile: The percentile of the absolute centred sample values mapped to 127.
+    :param center: Centres the vectors on the sample mean, which spends the levels on the
+        spread of the values rather than on their offset.
+    """
+
+    def __init__(self, percentile: float = 99.9, center: bool = True):
+        if not 0.0 < percentile <= 100.0:
+            raise ValueError("percentile must satisfy 0 < percentile <= 100")
+        self.percentile = percentile
+        self.center = center
+        self.mean: Optional[np.ndarray] = None
+        self.scale: Optional[float] = None
+
+    def fit(self, vectors: np.ndarray) -> 'ScalarQuantizer':
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self.mean = vectors.mean(axis=0) if self.center else np.zeros(vectors.shape[1], dtype=np.float32)
+        limit = float(np.percentile(np.abs(vectors - self.mean), self.percentile))
+        # Constant vectors keep a unit step instead of dividing by zero
+        self.scale = limit / 127 if limit > 0 else 1.0
+        return self
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        self._check_fitted()
+        levels = np.rint((np.asarray(vectors, dtype=np.float32) - self.mean) / self.scale)
+        return np.clip(levels, -127, 127).astype(np.int8)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        self._check_fitted()
+        return codes.astype(np.float32) * self.scale + self.mean
+
+    @staticmethod
+    def _query_code(query: np.ndarray) -> np.ndarray:
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        largest = np.abs(query).max(initial=0.0)
+        if largest == 0:
+            return np.zeros(query.shape, dtype=np.int8)
+        return np.rint(query * (127 / largest)).astype(np.int8)
+
+    def encode_query(self, query: List[float]) -> List:
+        self._check_fitted()
+        return self._query_code(query).tolist()
+
+    def search(self, query: np.ndarray, codes: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        self._check_fitted()
+        # The int8 inner product of the query code and the document codes, as the index scores them
+        scores = codes.astype(np.int32) @ self._query_code(query).astype(np.int32)
+        return self._top_k(scores, k)
+
+    def knn_field_mapping(self) -> Dict:
+        self._check_fitted()
+        return {"type": "knn_vector", "dimension": len(self.mean), "data_type": "byte",
+                "method": {"name": "hnsw", "engine": "lucene", "space_type": "innerproduct"}}
+
+    def _check_fitted(self):
+        if self.mean is None:
+            raise ValueError("The quantizer must be fitted before use")
+
+
+class BinaryQuantizer(BaseQuantizer):
+    """
+    1-bit quantization: every dimension becomes one bit, set when the value is above the
+    threshold of the dimension, and the bits are packed 8 per byte, a 32x reduction of float32.
+    Codes are compared by Hamming distance.
+    The thresholds are zero, which suits centered embeddings, or the per-dimension medians of
+    the sample when fitted with center=True. Bits already returned by a model, e.g. binary
+    Titan V2 embeddings, are packed with pack_bits.
+    :param center: Learns per-dimension median thresholds in fit.
+    """
+
+    def __init__(self, center: bool = False):
+        self.center = center
+        self.thresholds: Optional[np.ndarray] = None
+        self.dimension: Optional[int] = None
+
+    def fit(self, vectors: np.ndarray) -> 'BinaryQuantizer':
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self.dimension = vectors.shape[1]
+        self.thresholds = np.median(vectors, axis=0).astype(np.float32) if self.center else None
+        return self
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.dimension is None:
+            self.dimension = vectors.shape[1]
+        thresholds = self.thresholds if self.thresholds is not None else 0.0
+        return self.pack_bits(vectors > thresholds)
+
+    @staticmethod
+    def pack_bits(bits) -> np.ndarray:
+        """
+        Packs a (count, dimension) matrix of 0 and 1 values into (count, dimension / 8) bytes.
+        """
+        return np.packbits(np.asarray(bits, dtype=bool), axis=-1)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        bits = np.unpackbits(codes, axis=-1, count=self.dimension).astype(np.float32)
+        return bits * 2 - 1
+
+    @staticmethod
+    def hamming_distances(query_code: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """
+        The number of differing bits between a packed query code and every packed code.
+        """
+        return _POPCOUNT[np.bitwise_xor(codes, query_code)].sum(axis=-1, dtype=np.int64)
+
+    def search(self, query: np.ndarray, codes: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        query_code = self.encode(np.asarray(query, dtype=np.float32).reshape(1, -1))[0]
+        indices, scores = self._top_k(-self.hamming_distances(query_code, codes), k)
+        return indices, -scores
+
+    def index_vector(self, code: np.ndarray) -> List:
+        # OpenSearch binary vectors are the packed bytes as signed int8 values
+        return code.view(np.int8).tolist()
+
+    def knn_field_mapping(self) -> Dict:
+        if self.dimension is None:
+            raise ValueError("The quantizer must be fitted before use")
+        return {"type": "knn_vector", "dimension": self.dimension, "data_type": "binary",
+                "method": {"name": "hnsw", "engine": "faiss", "space_type": "hamming"}}
+
+
+class PCAQuantizer(BaseQuantizer):
+    """
+    Reduces vectors to the n_components principal directions of a sample, keeping float32
+    values, a dimension / n_components reduction. Reduced vectors are normalized again when
+    normalize is set so that the inner product stays a cosine similarity.
+    :param n_components: The reduced dimension.
+    :param normalize: Normalizes the reduced vectors.
+    """
+
+    def __init__(self, n_components: int, normalize: bool = True):
+        if n_components < 1:
+            raise ValueError("n_components must be positive")
+        self.n_components = n_components
+        self.normalize = normalize
+        self.mean: Optional[np.ndarray] = None
+        self.components: Optional[np.ndarray] = None
+        self.explained_variance_ratio: Optional[np.ndarray] = None
+
+    def fit(self, vectors: np.ndarray) -> 'PCAQuantizer':
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.n_components > min(vectors.shape):
+            raise ValueError("n_components cannot exceed the sample size or the dimension")
+        self.mean = vectors.mean(axis=0)
+        _, singular_values, components = np.linalg.svd(vectors - self.mean, full_matrices=False)
+        self.components = components[:self.n_components].astype(np.float32)
+        variance = singular_values ** 2
+        self.explained_variance_ratio = variance[:self.n_components] / variance.sum()
+        return self
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        self._check_fitted()
+        reduced = (np.asarray(vectors, dtype=np.float32) - self.mean) @ self.components.T
+        if self.normalize:
+            norms = np.linalg.norm(reduced, axis=-1, keepdims=True)
+            np.divide(reduced, norms, out=reduced, where=norms > 0)
+        return reduced
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        self._check_fitted()
+        return codes @ self.components + self.mean
+
+    def search(self, query: np.ndarray, codes: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        query_code = self.encode(np.asarray(query, dtype=np.float32).reshape(1, -1))[0]
+        return self._top_k(codes @ query_code, k)
+
+    def knn_field_mapping(self) -> Dict:
+        self._check_fitted()
+        return {"type": "knn_vector", "dimension": self.n_components,
+                "method": {"name": "hnsw", "engine": "faiss", "space_type": "innerproduct"}}
+
+    def _check_fitted(self):
+        if self.components is None:
+            raise ValueError("The quantizer must be fitted before use")
+
+
+def recall_at_k(quantizer: BaseQuantizer, vectors: np.ndarray, queries: np.ndarray, k: int = 10) -> float:
+    """
+    Measures the recall cost of a fitted quantizer: the fraction of the exact inner product
+    top k of every query that the search over the codes, scored like the index scores them,
+    also returns in its top k.
+    :param quantizer: The fitted quantizer.
+    :param vectors: The float32 vectors searched.
+    :param queries: The float32 query vectors.
+    :param k: The number of results per query.
+    :return: The mean recall@k over the queries.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    codes = quantizer.encode(vectors)
+    found = 0
+    for query in np.asarray(queries, dtype=np.float32):
+        exact, _ = BaseQuantizer._top_k(vectors @ query, k)
+        approximate, _ = quantizer.search(query, codes, k)
+        found += len(np.intersect1d(exact, approximate))
+    return found / (len(queries) * min(k, len(vectors)))
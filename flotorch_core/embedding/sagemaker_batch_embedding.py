@@ -0,0 +1,271 @@
+import hashlib
+import json
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from botocore.exceptions import ClientError
+
+from flotorch_core.chunking.chunking import Chunk
+from flotorch_core.embedding.embedding import BaseEmbedding, EmbeddingList, Embeddings
+from flotorch_core.embedding.sagemaker_embedding import SageMakerEmbedder
+from flotorch_core.logger.global_logger import get_logger
+from flotorch_core.storage.s3_storage import S3StorageProvider
+from flotorch_core.utils.sagemaker_utils import SageMakerUtils, EMBEDDING_MODELS
+
+logger = get_logger()
+
+
+class SageMakerBatchEmbedder:
+    """
+    Embeds a corpus offline with SageMaker Batch Transform instead of a real-time endpoint.
+    The chunks are written as JSONL shards of shard_size chunks under prefix, one request
+    payload of the embedder per line, packed like its embed_batch requests. A transform job
+    of the EMBEDDING_MODELS entry of the embedder embeds the shards, then the output shards
+    are streamed back into an EmbeddingList in chunk order.
+    Runs are resumable: a state file under prefix records the corpus and the jobs, shards
+    already uploaded are not written again, a job still running is waited for, and a new job
+    is only submitted for the shards without output, through a manifest listing them.
+    :param embedder: The SageMaker embedder whose payloads and response parsing are used.
+    :param storage: The S3 storage of the shards.
+    :param prefix: The key prefix of the run, reusing it resumes the run.
+    :param shard_size: The number of chunks per shard.
+    :param model_name: The SageMaker model of the jobs, by default a model of the JumpStart
+        model of the embedder, created if needed.
+    :param instance_type: The instance type of the jobs, by default the one of EMBEDDING_MODELS.
+    :param instance_count: The number of instances of the jobs.
+    :param max_concurrent_transforms: The number of requests in flight per instance.
+    :param poll_interval: The seconds between two job status checks.
+    :param sagemaker_client: The client of the transform job API, by default the one of the
+        embedder.
+    """
+
+    def __init__(self, embedder: SageMakerEmbedder, storage: S3StorageProvider, prefix: str,
+                 shard_size: int = 10000, model_name: Optional[str] = None,
+                 instance_type: Optional[str] = None, instance_count: int = 1,
+                 max_concurrent_transforms: int = 4, poll_interval: float = 30,
+                 sagemaker_client=None) -> None:
+        if shard_size < 1:
+            raise ValueError("shard_size must be positive")
+        self.embedder = embedder
+        self.storage = storage
+        self.prefix = prefix.strip("/")
+        self.shard_size = shard_size
+        self.model_name = model_name
+        self.instance_type = instance_type or EMBEDDING_MODELS.get(embedder.embedding_model_id, {}).get("instance_type")
+        self.instance_count = instance_count
+        self.max_concurrent_transforms = max_concurrent_transforms
+        self.poll_interval = poll_interval
+        self._sagemaker_client = sagemaker_client
+
+    @property
+    def sagemaker_client(self):
+        if self._sagemaker_client is None:
+            self._sagemaker_client = self.embedder.sagemaker_client
+        return self._sagemaker_client
+
+    def embed_list(self, chunks: List[Chunk]) -> EmbeddingList:
+        """
+        Embeds the chunks, resuming the run under prefix if there is one.
+        :param chunks: The chunks to be embedded, the same ones on every resumption.
+        :return: The list of embeddings.
+        """
+        inputs, owners = BaseEmbedding._flatten(chunks)
+        if any(not chunk.data or not chunk.data.strip() for chunk in inputs):
+            raise ValueError("Input text cannot be empty")
+        shards = [inputs[i:i + self.shard_size] for i in range(0, len(inputs), self.shard_size)]
+        state = self._load_state(inputs, len(shards))
+
+        pending = self._pending_shards(len(shards))
+        if pending and state["jobs"] and self._job_status(state["jobs"][-1]) == "InProgress":
+            logger.info(f"Resuming transform job {state['jobs'][-1]}")
+            self._wait(state["jobs"][-1], raise_on_failure=False)
+            pending = self._pending_shards(len(shards))
+        if pending:
+            self._upload(shards, pending)
+            job_name = self._submit(state, pending)
+            self._wait(job_name)
+            pending = self._pending_shards(len(shards))
+            if pending:
+                raise RuntimeError(f"Transform job {job_name} completed without the output of shards {pending}")
+
+        return BaseEmbedding._assemble(self._read_outputs(shards), owners)
+
+    def input_key(self, shard: int) -> str:
+        return f"{self.prefix}/input/{self._shard_name(shard)}"
+
+    def output_key(self, shard: int) -> str:
+        # Batch Transform names the output of an input object after it with an .out suffix
+        return f"{self.prefix}/output/{self._shard_name(shard)}.out"
+
+    @staticmethod
+    def _shard_name(shard: int) -> str:
+        return f"shard-{shard:05d}.jsonl"
+
+    def _uri(self, key: str) -> str:
+        return f"s3://{self.storage.bucket}/{key}"
+
+    def _load_state(self, inputs: List[Chunk], shard_count: int) -> Dict:
+        """
+        Reads the state of the run under prefix, or starts one. A prefix holding the run of
+        another corpus, model or sharding is refused rather than mixed with this one.
+        """
+        fingerprint = hashlib.sha256()
+        for chunk in inputs:
+            fingerprint.update(chunk.data.encode('utf-8'))
+            fingerprint.update(b"\0")
+        corpus = {"model_id": self.embedder.embedding_model_id, "shard_size": self.shard_size,
+                  "shards": shard_count, "fingerprint": fingerprint.hexdigest()}
+        state_key = f"{self.prefix}/state.json"
+        if state_key in self.storage.list_keys(state_key):
+            state = json.loads(b"".join(self.storage.read(state_key)))
+            if {key: state.get(key) for key in corpus} != corpus:
+                raise ValueError(f"s3://{self.storage.bucket}/{self.prefix} holds the run of other chunks, "
+                                 f"use another prefix")
+            return state
+        state = dict(corpus, jobs=[], model_name=None)
+        self._save_state(state)
+        return state
+
+    def _save_state(self, state: Dict) -> None:
+        self.storage.write(f"{self.prefix}/state.json", json.dumps(state).encode('utf-8'))
+
+    def _pending_shards(self, shard_count: int) -> List[int]:
+        outputs = set(self.storage.list_keys(f"{self.prefix}/output/"))
+        return [shard for shard in range(shard_count) if self.output_key(shard) not in outputs]
+
+    def _upload(self, shards: List[List[Chunk]], pending: List[int]) -> None:
+        uploaded = set(self.storage.list_keys(f"{self.prefix}/input/"))
+        for shard in pending:
+            if self.input_key(shard) in uploaded:
+                continue
+            lines = [json.dumps(self._payload(pack)) for pack in self.embedder._packs(shards[shard])]
+            self.storage.write(self.input_key(shard), "\n".join(lines).encode('utf-8'))
+
+    def _payload(self, pack: List[Chunk]) -> Dict:
+        return self.embedder._prepare_batch(pack) if len(pack) > 1 else self.embedder._prepare_chunk(pack[0])
+
+    def _submit(self, state: Dict, pending: List[int]) -> str:
+        name = SageMakerUtils.sanitize_name(self.embedder.embedding_model_id)[:44].rstrip("-")
+        model_name = self.model_name or state.get("model_name") or SageMakerUtils.create_jumpstart_model(
+            self.sagemaker_client, self.instance_type, self.embedder.region, self.embedder.role,
+            self.embedder.embedding_model_id, f"{name}-batch-model")
+        job_name = f"{name}-{int(time.time() * 1000)}"
+
+        # The manifest lists the shards of this job, shards embedded by earlier jobs are skipped
+        manifest_key = f"{self.prefix}/manifests/{job_name}.json"
+        manifest = [{"prefix": self._uri(f"{self.prefix}/input/")}] + [self._shard_name(shard) for shard in pending]
+        self.storage.write(manifest_key, json.dumps(manifest).encode('utf-8'))
+
+        self.sagemaker_client.create_transform_job(
+            TransformJobName=job_name,
+            ModelName=model_name,
+            BatchStrategy="SingleRecord",
+            MaxConcurrentTransforms=self.max_concurrent_transforms,
+            MaxPayloadInMB=6,
+            TransformInput={
+                "DataSource": {"S3DataSource": {"S3DataType": "ManifestFile", "S3Uri": self._uri(manifest_key)}},
+                "ContentType": "application/json",
+                "SplitType": "Line",
+            },
+            TransformOutput={
+                "S3OutputPath": self._uri(f"{self.prefix}/output/"),
+                "Accept": "application/json",
+                "AssembleWith": "Line",
+            },
+            TransformResources={"InstanceType": self.instance_type, "InstanceCount": self.instance_count},
+        )
+        state["model_name"] = model_name
+        state["jobs"].append(job_name)
+        self._save_state(state)
+        logger.info(f"Submitted transform job {job_name} for {len(pending)} shards")
+        return job_name
+
+    def _job_status(self, job_name: str) -> str:
+        return self.sagemaker_client.describe_transform_job(TransformJobName=job_name)["TransformJobStatus"]
+
+    def _wait(self, job_name: str, raise_on_failure: bool = True) -> None:
+        while True:
+            response = self.sagemaker_client.describe_transform_job(TransformJobName=job_name)
+            status = response["TransformJobStatus"]
+            if status == "Completed":
+                return
+            if status in ("Failed", "Stopped"):
+                # The shards embedded before the failure keep their output for the next run
+                message = f"Transform job {job_name} {status.lower()}: {response.get('FailureReason', '')}"
+                if raise_on_failure:
+                    raise RuntimeError(message)
+                logger.warning(message)
+                return
+            time.sleep(self.poll_interval)
+
+    def _read_outputs(self, shards: List[List[Chunk]]) -> Iterator[Embeddings]:
+        for shard, chunks in enumerate(shards):
+            packs = self.embedder._packs(chunks)
+            lines = self._lines(self.output_key(shard))
+            for pack in packs:
+                line = next(lines, None)
+                if line is None:
+                    raise ValueError(f"The output of shard {shard} has fewer records than its input")
+                for chunk, vector in zip(pack, self.embedder._parse_batch_response(line, len(pack))):
+                    # The latency of offline requests is not reported
+                    yield Embeddings(embeddings=self.embedder._output(vector),
+                                     metadata=self.embedder._extract_metadata(chunk, 0), text=chunk.data)
+
+    def _lines(self, key: str) -> Iterator[bytes]:
+        """
+        Streams the non-empty lines of an object without holding it in memory.
+        """
+        rest = b""
+        for block in self.storage.read_stream(key):
+            lines = (rest + block).split(b"\n")
+            rest = lines.pop()
+            yield from (line for line in lines if line.strip())
+        if rest.strip():
+            yield rest
+
+
+class LocalTransformJobs:
+    """
+    Local stand-in of the SageMaker transform job API for SageMakerBatchEmbedder, e.g. in tests
+    and offline pipeline runs. create_transform_job reads the manifest and input shards from
+    storage, calls handler with the JSON payload of every line the way the model container is
+    invoked, and writes the output shards where Batch Transform does. A shard whose handler call
+    raises gets no output and fails the job, like a failed record does.
+    :param storage: The storage of the shards.
+    :param handler: Returns the JSON response of the model to a JSON payload.
+    """
+
+    def __init__(self, storage: S3StorageProvider, handler: Callable[[Any], Any]):
+        self.storage = storage
+        self.handler = handler
+        self.jobs: Dict[str, Dict] = {}
+
+    def create_transform_job(self, TransformJobName: str, TransformInput: Dict, TransformOutput: Dict, **kwargs):
+        if TransformJobName in self.jobs:
+            raise ClientError({"Error": {"Code": "ValidationException",
+                                         "Message": f"Job {TransformJobName} already exists"}}, "CreateTransformJob")
+        manifest_key = self.storage.get_path(TransformInput["DataSource"]["S3DataSource"]["S3Uri"])
+        manifest = json.loads(b"".join(self.storage.read(manifest_key)))
+        input_prefix = self.storage.get_path(manifest[0]["prefix"])
+        output_prefix = self.storage.get_path(TransformOutput["S3OutputPath"]).rstrip("/")
+
+        failures = []
+        for name in manifest[1:]:
+            try:
+                records = b"".join(self.storage.read(f"{input_prefix.rstrip('/')}/{name}")).splitlines()
+                output = [json.dumps(self.handler(json.loads(record))) for record in records if record.strip()]
+            except Exception as e:
+                failures.append(f"{name}: {e}")
+                continue
+            self.storage.write(f"{output_prefix}/{name}.out", "\n".join(output).encode('utf-8'))
+        self.jobs[TransformJobName] = {"TransformJobName": TransformJobName,
+                                       "TransformJobStatus": "Failed" if failures else "Completed"}
+        if failures:
+            self.jobs[TransformJobName]["FailureReason"] = "; ".join(failures)
+        return {"TransformJobArn": f"arn:aws:sagemaker:local:000000000000:transform-job/{TransformJobName}"}
+
+    def describe_transform_job(self, TransformJobName: str):
+        if TransformJobName not in self.jobs:
+            raise ClientError({"Error": {"Code": "ValidationException",
+                                         "Message": f"Could not find job {TransformJobName}"}}, "DescribeTransformJob")
+        return dict(self.jobs[TransformJobName])
@@ -1,5 +1,8 @@
 from abc import abstractmethod
+import asyncio
+import threading
 import boto3
+from botocore.config import Config
 from typing import Any, Dict, List
 from flotorch_core.chunking.chunking import Chunk
 from flotorch_core.embedding.embedding import EmbeddingMetadata, Embeddings
@@ -17,7 +20,7 @@ import time
 from botocore.exceptions import ClientError
 
 from flotorch_core.logger.global_logger import get_logger
-from flotorch_core.utils.sagemaker_utils import SageMakerUtils, EMBEDDING_MODELS
+from flotorch_core.utils.sagemaker_utils import SageMakerUtils, EMBEDDING_MODELS, endpoint_registry
 
 logger = get_logger()
 
@@ -25,58 +28,124 @@ class SageMakerEmbedder(BaseEmbedding):
     def __init__(self, model_id: str, region: str, role_arn: str, dimensions: int = 256, normalize: bool = True) -> None:
         """
         Initializes the SageMakerEmbedder with the given model ID, region, and role ARN.
-        Sets up necessary SageMaker runtime clients, session, and endpoint predictor.
+        No AWS call is made here: the clients, the session and the endpoint predictor are
+        created on first use, and the endpoint is resolved through the process-wide
+        endpoint_registry so that instances for the same endpoint check it once per TTL.
+        Call awarm_up to resolve the endpoint ahead of the first embed.
 
         Args:
             model_id (str): The unique identifier for the model.
             region (str): The AWS region where the SageMaker services are hosted.
-            role_arn (str): The ARN of the IAM role. Currently not used but included for future extensions.
+            role_arn (str): The ARN of the IAM role the endpoint is created with.
         """
 
         # Initialize the base class
         super().__init__(model_id, region, dimensions, normalize)
-        
+
         self.role = role_arn
-        
-        # Initialize the SageMaker runtime and client for general operations
-        self.client = boto3.client("sagemaker-runtime", region_name=region)
-        self.sagemaker_client = boto3.client('sagemaker', region_name=region)
-        
-        # Create a new SageMaker session
-        self.session = Session(boto_session=boto3.Session(region_name=region))
-        
+
         # Initialize additional embedding-related attributes
         self.embedding_model_id = model_id
-        # self.embedding_model_endpoint_name = 'flotorch-embedding-endpoint'
         self.embedding_model_endpoint_name = f"{SageMakerUtils.sanitize_name(model_id)[:44]}-embedding-endpoint"
-        
+
         self.embedding_dimension = EMBEDDING_MODELS.get(model_id, {}).get('dimension', 1024)
-        
+
         self.wait_time = 5
 
-        if not SageMakerUtils.check_endpoint_exists(self.sagemaker_client, self.embedding_model_endpoint_name):
-            model_config = EMBEDDING_MODELS.get(model_id)
-            SageMakerUtils.create_jumpstart_endpoint(self.sagemaker_client, model_config.get("instance_type"), self.region, self.role, model_id, self.embedding_model_endpoint_name)
+        # Embeddings are float32 NumPy rows instead of lists when set, e.g. for EmbeddingList
+        # or the quantizers, which take arrays without converting them
+        self.return_arrays = False
+        self._dimension_warned = False
 
-        SageMakerUtils.wait_for_endpoint_creation(self.sagemaker_client, self.embedding_model_endpoint_name)
-        
-        # Ensure the endpoint exists or create it if necessary
-        # self._ensure_endpoint_exists()
-        
-        # Initialize the predictor to interact with the SageMaker endpoint
-        self.predictor = Predictor(
-            endpoint_name=self.embedding_model_endpoint_name,
-            sagemaker_session=self.session
+        self._client = None
+        self._sagemaker_client = None
+        self._session = None
+        self._predictor = None
+        self._init_lock = threading.Lock()
+
+    @property
+    def client(self):
+        """
+        The SageMaker runtime client, its connection pool sized for max_in_flight.
+        """
+        if self._client is None:
+            self._client = boto3.client("sagemaker-runtime", region_name=self.region,
+                                        config=Config(max_pool_connections=max(10, self.max_in_flight)))
+        return self._client
+
+    @client.setter
+    def client(self, client):
+        self._client = client
+        if self._session is not None:
+            self._session.sagemaker_runtime_client = client
+
+    @property
+    def sagemaker_client(self):
+        if self._sagemaker_client is None:
+            self._sagemaker_client = boto3.client('sagemaker', region_name=self.region)
+        return self._sagemaker_client
+
+    @sagemaker_client.setter
+    def sagemaker_client(self, sagemaker_client):
+        self._sagemaker_client = sagemaker_client
+
+    @property
+    def session(self) -> Session:
+        if self._session is None:
+            self._session = Session(boto_session=boto3.Session(region_name=self.region),
+                                    sagemaker_client=self.sagemaker_client,
+                                    sagemaker_runtime_client=self.client)
+        return self._session
+
+    @session.setter
+    def session(self, session: Session):
+        self._session = session
+
+    @property
+    def predictor(self) -> Predictor:
+        """
+        The predictor of the endpoint, created once the endpoint is in service.
+        """
+        if self._predictor is None:
+            with self._init_lock:
+                if self._predictor is None:
+                    self._resolve_endpoint()
+                    predictor = Predictor(
+                        endpoint_name=self.embedding_model_endpoint_name,
+                        sagemaker_session=self.session
+                    )
+                    # Set up the serializer and deserializer for the predictor
+                    predictor.serializer = JSONSerializer()
+                    predictor.deserializer = JSONDeserializer()
+                    self._predictor = predictor
+                    logger.info(f"Initialized SageMakerEmbedder for model {self.embedding_model_id} in region {self.region}.")
+        return self._predictor
+
+    @predictor.setter
+    def predictor(self, predictor: Predictor):
+        self._predictor = predictor
+
+    embedding_predictor = predictor
+
+    def _resolve_endpoint(self) -> None:
+        """
+        Waits until the endpoint is in service, creating it when it does not exist.
+        """
+        model_config = EMBEDDING_MODELS.get(self.embedding_model_id, {})
+        endpoint_registry.ensure_ready(
+            self.embedding_model_endpoint_name,
+            self.sagemaker_client,
+            create=lambda: SageMakerUtils.create_jumpstart_endpoint(
+                self.sagemaker_client, model_config.get("instance_type"), self.region, self.role,
+                self.embedding_model_id, self.embedding_model_endpoint_name)
         )
-        
-        # Set up the serializer and deserializer for the predictor
-        self.predictor.serializer = JSONSerializer()
-        self.predictor.deserializer = JSONDeserializer()
 
-        self.embedding_predictor = self.predictor
-        
-        # Log initialization success
-        logger.info(f"Initialized SageMakerEmbedder for model {model_id} in region {region}.")
+    async def awarm_up(self) -> None:
+        """
+        Resolves the endpoint and creates the predictor in a worker thread, so that several
+        embedders can be warmed up concurrently, e.g. with asyncio.gather, at pipeline start.
+        """
+        await asyncio.to_thread(lambda: self.predictor)
 
     @abstractmethod
     def _prepare_chunk(self, chunk: Chunk) -> Dict:
@@ -84,6 +153,17 @@ class SageMakerEmbedder(BaseEmbedding):
         Abstract method for preparing payload for SageMaker models.
         """
         pass
+
+    def _size_connection_pool(self, size: int) -> None:
+        """
+        Replaces the runtime client the predictor invokes the endpoint with by one whose
+        connection pool fits max_in_flight concurrent requests.
+        """
+        if self._client is None:
+            # The client is created on first use with a pool for max_in_flight
+            return
+        self.client = boto3.client("sagemaker-runtime", region_name=self.region,
+                                   config=Config(max_pool_connections=max(10, size)))
           
     def _check_model_status(self, endpoint_name, loop = True):
         """
@@ -300,33 +380,98 @@ class SageMakerEmbedder(BaseEmbedding):
         )
     
     def _parse_model_response(self, response: Dict[str, Any]) -> Dict[str, Any]:
-        # If the response is in byte format, decode it
-        if isinstance(response, (bytes, bytearray)):
-            response = json.loads(response.decode('utf-8'))
-        elif isinstance(response, str):
-            response = json.loads(response)
+        response = self._decode_response(response)
 
         # Extract the embedding from the response
         if isinstance(response, dict) and 'embedding' in response:
-            embedding = np.array(response['embedding'][0] if isinstance(response['embedding'], list) else response['embedding'])
+            embedding = response['embedding'][0] if isinstance(response['embedding'], list) else response['embedding']
         else:
-            embedding = np.array(response[0] if isinstance(response, list) else response)
+            embedding = response[0] if isinstance(response, list) else response
+
+        return self._output(self._fit_embeddings(np.asarray(embedding, dtype=np.float32).reshape(1, -1))[0])
+
+    def _parse_batch_response(self, response: Any, count: int) -> np.ndarray:
+        """
+        Extracts one embedding per input from the response to a packed request as a single
+        float32 matrix, normalized and fitted to the embedding dimension in bulk.
+
+        Args:
+            response: The raw response of the endpoint.
+            count (int): The number of inputs of the request.
+
+        Returns:
+            np.ndarray: A (count, embedding_dimension) float32 matrix in input order.
+        """
+        response = self._decode_response(response)
 
-        embedding = embedding.flatten()
+        vectors = response['embedding'] if isinstance(response, dict) and 'embedding' in response else response
+        if not isinstance(vectors, (list, np.ndarray)) or len(vectors) != count:
+            raise ValueError(f"Expected {count} embeddings in the response, got {len(vectors) if isinstance(vectors, (list, np.ndarray)) else 0}")
+        try:
+            # One C level conversion of the nested lists, each row flattened like a single response
+            matrix = np.asarray(vectors, dtype=np.float32).reshape(count, -1)
+        except ValueError:
+            raise ValueError("The embeddings in the response have different dimensions")
+        return self._fit_embeddings(matrix)
+
+    @staticmethod
+    def _decode_response(response: Any) -> Any:
+        # If the response is in byte format, decode it
+        if isinstance(response, (bytes, bytearray)):
+            return json.loads(response.decode('utf-8'))
+        if isinstance(response, str):
+            return json.loads(response)
+        return response
 
-        # Normalize the embedding to unit length
-        embedding = embedding / np.linalg.norm(embedding)
+    def _fit_embeddings(self, matrix: np.ndarray) -> np.ndarray:
+        """
+        Normalizes every row of the matrix to unit length and pads or truncates the rows to
+        embedding_dimension, in place where possible.
+        """
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
 
-        # Check if the embedding dimension matches the expected value (1024)
-        if len(embedding) != self.embedding_dimension:
-            logger.warning(f"Embedding dimension mismatch. Expected 1024, got {len(embedding)}")
-            # Adjust the dimension by truncating or padding
-            if len(embedding) > self.embedding_dimension:
-                embedding = embedding[:self.embedding_dimension]
+        dimension = matrix.shape[1]
+        if dimension != self.embedding_dimension:
+            if not self._dimension_warned:
+                # Every response of the endpoint has the same dimension, once is enough
+                logger.warning(f"Embedding dimension mismatch. Expected {self.embedding_dimension}, got {dimension}")
+                self._dimension_warned = True
+            if dimension > self.embedding_dimension:
+                matrix = matrix[:, :self.embedding_dimension]
             else:
-                embedding = np.pad(embedding, (0, self.embedding_dimension - len(embedding)))
+                matrix = np.pad(matrix, ((0, 0), (0, self.embedding_dimension - dimension)))
+        return matrix
+
+    def _output(self, vector: np.ndarray):
+        # Float32 rows are handed out as is when the caller accepts arrays
+        return vector if self.return_arrays else vector.tolist()
+
+    def _prepare_batch(self, chunks: List[Chunk]) -> Dict:
+        """
+        Prepares the payload of a packed request, for models whose max_batch_size is above one.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support packed requests")
+
+    def _embed_pack(self, chunks: List[Chunk]) -> List[Embeddings]:
+        if not self.predictor:
+            raise ValueError("Embedding predictor not initialized")
+
+        if any(not chunk.data or not chunk.data.strip() for chunk in chunks):
+            raise ValueError("Input text cannot be empty")
 
-        return embedding.tolist()
+        payload = self._prepare_batch(chunks)
+        start_time = time.time()
+        response = self._invoke_model(payload)
+        latency = int((time.time() - start_time) * 1000)
+        vectors = self._parse_batch_response(response, len(chunks))
+        # Token counts are estimated per text, the latency of the request is shared by its texts
+        latencies = EmbeddingMetadata(0, latency).split([len(chunk.data) for chunk in chunks])
+        return [
+            Embeddings(embeddings=self._output(vector), metadata=self._extract_metadata(chunk, share.latency_ms),
+                       text=chunk.data)
+            for vector, chunk, share in zip(vectors, chunks, latencies)
+        ]
 
     def embed(self, chunk: Chunk) -> Embeddings:
         if not self.predictor:
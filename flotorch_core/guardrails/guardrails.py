@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import List
 import boto3
 
 class BaseGuardRail(ABC):
@@ -6,29 +7,88 @@ class BaseGuardRail(ABC):
     def __init__(self, prompt=True, response=True):
         self.prompt = prompt
         self.response = response
-        
+
     @abstractmethod
     def apply_guardrail(self, text: str,
         source: str = 'INPUT'):
         pass
 
+    @property
+    def cache_key(self) -> str:
+        """
+        Identifies the policy of the guardrail in verdict caches, verdicts of another
+        guardrail or version must not be reused.
+        """
+        return type(self).__name__
+
+    def screen(self, texts: List[str], source: str = 'INPUT') -> List[bool]:
+        """
+        Screens several texts.
+        :param texts: The texts to screen.
+        :param source: INPUT or OUTPUT.
+        :return: For every text, True if the guardrail intervened.
+        """
+        return [self.apply_guardrail(text, source)['action'] == 'GUARDRAIL_INTERVENED' for text in texts]
+
 class BedrockGuardrail(BaseGuardRail):
+    # ApplyGuardrail accepts several text blocks per request; packs stay within a few text
+    # units of 1000 characters so that one long text does not make a request too large
+    max_batch_items = 25
+    max_batch_chars = 25000
+
     def __init__(self, guardrail_id: str, guardrail_version: str, region_name: str = 'us-east-1', runtime_client = None):
         self.guardrail_id = guardrail_id
         self.guardrail_version = guardrail_version
         self.runtime_client = runtime_client or boto3.client('bedrock-runtime', region_name=region_name)
-        
+
     def apply_guardrail(self, text: str,
         source: str = 'INPUT'):
+        return self._apply_content([text], source)
+
+    @property
+    def cache_key(self) -> str:
+        return f"{self.guardrail_id}:{self.guardrail_version}"
+
+    def screen(self, texts: List[str], source: str = 'INPUT') -> List[bool]:
+        """
+        Screens the texts with as few requests as possible: texts are packed into the content
+        list of one request, and a pack the guardrail intervenes on is split in halves until
+        the intervening texts are isolated. Mostly clean texts cost one request per pack.
+        """
+        blocked = [False] * len(texts)
+        pack = []
+        pack_chars = 0
+        for i, text in enumerate(texts):
+            if pack and (len(pack) >= self.max_batch_items or pack_chars + len(text) > self.max_batch_chars):
+                self._screen_pack(texts, pack, blocked, source)
+                pack, pack_chars = [], 0
+            pack.append(i)
+            pack_chars += len(text)
+        if pack:
+            self._screen_pack(texts, pack, blocked, source)
+        return blocked
+
+    def _screen_pack(self, texts: List[str], pack: List[int], blocked: List[bool], source: str):
+        response = self._apply_content([texts[i] for i in pack], source)
+        if response['action'] != 'GUARDRAIL_INTERVENED':
+            return
+        if len(pack) == 1:
+            blocked[pack[0]] = True
+            return
+        middle = len(pack) // 2
+        self._screen_pack(texts, pack[:middle], blocked, source)
+        self._screen_pack(texts, pack[middle:], blocked, source)
+
+    def _apply_content(self, texts: List[str], source: str):
         try:
             request_params = {
                 'guardrailIdentifier': self.guardrail_id,
                 'guardrailVersion': self.guardrail_version,
                 'source': source,
-                'content': [{"text": {"text": text}}]
+                'content': [{"text": {"text": text}} for text in texts]
             }
             response = self.runtime_client.apply_guardrail(**request_params)
             return response
         except Exception as e:
             print(f"Error applying guardrail: {str(e)}")
-            raise
\ No newline at end of file
+            raise
@@ -0,0 +1,85 @@
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+
+class GuardrailVerdictCache:
+    """
+    Remembers whether a guardrail intervened on a text, keyed by the guardrail ID and version
+    and the sha256 of the text, so that texts screened before are not screened again.
+    Verdicts are kept in an LRU of max_entries and, when path is set, in a SQLite file that
+    outlives the process.
+    :param path: The SQLite file, memory only when None.
+    :param max_entries: The most verdicts kept in memory.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 100000):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._verdicts: "OrderedDict[Tuple[str, str], bool]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = None
+        if path is not None:
+            self._connection = sqlite3.connect(path, check_same_thread=False)
+            with self._connection:
+                self._connection.execute(
+                    "CREATE TABLE IF NOT EXISTS verdicts (guardrail TEXT NOT NULL, text_hash TEXT NOT NULL, "
+                    "blocked INTEGER NOT NULL, PRIMARY KEY (guardrail, text_hash))"
+                )
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def get_many(self, guardrail: str, hashes: List[str]) -> Dict[str, bool]:
+        """
+        Looks up the verdicts of the text hashes.
+        :return: The verdict of every hash found, True if the guardrail intervened.
+        """
+        verdicts = {}
+        with self._lock:
+            for text_hash in hashes:
+                verdict = self._verdicts.get((guardrail, text_hash))
+                if verdict is not None:
+                    self._verdicts.move_to_end((guardrail, text_hash))
+                    verdicts[text_hash] = verdict
+            missing = list({text_hash for text_hash in hashes if text_hash not in verdicts})
+            if self._connection is not None and missing:
+                # SQLite accepts at most 999 parameters per statement in older builds
+                for i in range(0, len(missing), 500):
+                    batch = missing[i:i + 500]
+                    rows = self._connection.execute(
+                        f"SELECT text_hash, blocked FROM verdicts WHERE guardrail = ? "
+                        f"AND text_hash IN ({','.join('?' * len(batch))})", (guardrail, *batch)
+                    ).fetchall()
+                    for text_hash, blocked in rows:
+                        verdicts[text_hash] = bool(blocked)
+                        self._remember(guardrail, text_hash, bool(blocked))
+            found = sum(text_hash in verdicts for text_hash in hashes)
+            self.hits += found
+            self.misses += len(hashes) - found
+        return verdicts
+
+    def put_many(self, guardrail: str, verdicts: Dict[str, bool]) -> None:
+        with self._lock:
+            for text_hash, blocked in verdicts.items():
+                self._remember(guardrail, text_hash, blocked)
+            if self._connection is not None and verdicts:
+                with self._connection:
+                    self._connection.executemany(
+                        "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?)",
+                        [(guardrail, text_hash, int(blocked)) for text_hash, blocked in verdicts.items()]
+                    )
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+
+    def _remember(self, guardrail: str, text_hash: str, blocked: bool):
+        self._verdicts[(guardrail, text_hash)] = blocked
+        self._verdicts.move_to_end((guardrail, text_hash))
+        while len(self._verdicts) > self.max_entries:
+            self._verdicts.popitem(last=False)
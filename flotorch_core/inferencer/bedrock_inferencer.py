@@ -2,6 +2,7 @@ from flotorch_core.inferencer.inferencer import BaseInferencer, DEFAULT_SYSTEM_P
 from typing import List, Dict, Any, Tuple
 from flotorch_core.logger.global_logger import get_logger
 import boto3
+from botocore.config import Config
 import random
 
 from flotorch_core.utils.bedrock_retry_handler import BedRockRetryHander
@@ -14,7 +15,7 @@ class BedrockInferencer(BaseInferencer):
     Bedrock-specific implementation of the BaseInferencer.
     """
 
-    def __init__(self, model_id: str, region: str = "us-east-1", n_shot_prompts: int = 0, temperature: float = 0.7, n_shot_prompt_guide_obj: Dict[str, List[Dict[str, str]]] = None, max_tokens: int = None, topP: int = None):
+    def __init__(self, model_id: str, region: str = "us-east-1", n_shot_prompts: int = 0, temperature: float = 0.7, n_shot_prompt_guide_obj: Dict[str, List[Dict[str, str]]] = None, max_tokens: int = None, topP: int = None, max_concurrency: int = None):
         """
         Initialize the BedrockInferencer with Bedrock-specific parameters.
 
@@ -24,11 +25,16 @@ class BedrockInferencer(BaseInferencer):
             n_shot_prompts (int): Number of examples to include in few-shot learning.
             temperature (float): Sampling temperature for response generation.
             n_shot_prompt_guide_obj (Dict[str, List[Dict[str, str]]]): Guide object for few-shot examples.
+            max_concurrency (int): The number of requests generate_text_batch keeps in flight.
         """
         super().__init__(model_id, region, n_shot_prompts, temperature, n_shot_prompt_guide_obj)
+        if max_concurrency:
+            self.max_concurrency = max_concurrency
+        # One pooled connection per concurrent request of generate_text_batch
         self.client = boto3.client(
             service_name='bedrock-runtime',
-            region_name=region
+            region_name=region,
+            config=Config(max_pool_connections=max(10, self.max_concurrency))
         )
         self.max_tokens = max_tokens
         self.topP = topP
@@ -8,8 +8,10 @@ import time
 logger = get_logger()
 
 class GatewayInferencer(BaseInferencer):
-    def __init__(self, model_id: str, api_key: str, base_url: str = None, headers: Dict[str, str] = None, n_shot_prompts: int = 0, n_shot_prompt_guide_obj: Dict[str, List[Dict[str, str]]] = None):
+    def __init__(self, model_id: str, api_key: str, base_url: str = None, headers: Dict[str, str] = None, n_shot_prompts: int = 0, n_shot_prompt_guide_obj: Dict[str, List[Dict[str, str]]] = None, max_concurrency: int = None):
         super().__init__(model_id, None, n_shot_prompts, None, n_shot_prompt_guide_obj)
+        if max_concurrency:
+            self.max_concurrency = max_concurrency
         self.api_key = api_key
         self.base_url = base_url
         self.headers = headers or {}
@@ -1,5 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
+
+from flotorch_core.logger.global_logger import get_logger
+
+logger = get_logger()
 
 DEFAULT_SYSTEM_PROMPT = "You are a helpful assistant. Use the provided context to answer questions accurately. If you cannot find the answer in the context, say so"
 class BaseInferencer(ABC):
@@ -8,6 +13,9 @@ class BaseInferencer(ABC):
     Defines the common interface and shared functionality for inferencers.
     """
 
+    # The number of generate_text calls generate_text_batch keeps in flight by default
+    max_concurrency: int = 10
+
     def __init__(self, model_id: str, region: str = "us-east-1", n_shot_prompts: int = 0, temperature: float = 0.7, n_shot_prompt_guide_obj: Dict[str, List[Dict[str, str]]] = None):
         """
         Initialize the inferencer with required parameters.
@@ -41,6 +49,57 @@ class BaseInferencer(ABC):
         """
         pass
 
+    def generate_text_batch(self, user_queries: List[str], contexts: Optional[List[List[Dict]]] = None,
+                            max_concurrency: Optional[int] = None, **kwargs) -> List[Tuple[Dict[Any, Any], str]]:
+        """
+        Generate responses for several queries concurrently, e.g. the questions of an evaluation,
+        so that the time taken is bound by the throughput the model allows rather than by the
+        latency of one request after the other.
+        Every query is answered by generate_text, with at most max_concurrency calls in flight.
+        A failing query does not abort the batch, its result is ({"error": "<type>: <message>"}, None).
+
+        Args:
+            user_queries (List[str]): The questions.
+            contexts (List[List[Dict]]): The context of every question. Defaults to no context.
+            max_concurrency (int): The most calls in flight. Defaults to the max_concurrency of the inferencer.
+            **kwargs: Additional arguments of generate_text, e.g. use_system.
+
+        Returns:
+            List[Tuple[Dict[Any, Any], str]]: Metadata and the generated response text of every query,
+            in the order of the queries.
+        """
+        if contexts is None:
+            contexts = [None] * len(user_queries)
+        elif len(contexts) != len(user_queries):
+            raise ValueError(f"Expected one context per query, got {len(contexts)} contexts for {len(user_queries)} queries")
+        max_concurrency = max_concurrency or self.max_concurrency
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be positive")
+        if not user_queries:
+            return []
+
+        def generate(item: Tuple[str, List[Dict]]) -> Tuple[Dict[Any, Any], str]:
+            user_query, context = item
+            try:
+                return self._generate_batch_item(user_query, context, **kwargs)
+            except Exception as e:
+                logger.error(f"Error generating text for query '{user_query[:100]}': {str(e)}")
+                return {"error": f"{type(e).__name__}: {e}"}, None
+
+        if max_concurrency == 1 or len(user_queries) == 1:
+            return [generate(item) for item in zip(user_queries, contexts)]
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(user_queries)),
+                                thread_name_prefix=f"{type(self).__name__}-generate") as executor:
+            # map yields the results in the order of the queries
+            return list(executor.map(generate, zip(user_queries, contexts)))
+
+    def _generate_batch_item(self, user_query: str, context: List[Dict], **kwargs) -> Tuple[Dict[Any, Any], str]:
+        """
+        Answers one query of generate_text_batch, raising when it fails. Inferencers whose
+        generate_text reports failures in its return value override this.
+        """
+        return self.generate_text(user_query, context, **kwargs)
+
     @abstractmethod
     def generate_prompt(self, user_query: str, context: List[Dict]) -> str:
         """
@@ -2,6 +2,7 @@ import random
 import time
 from typing import Any, Dict, List, Tuple
 import boto3
+from botocore.config import Config
 from flotorch_core.inferencer.inferencer import BaseInferencer, DEFAULT_SYSTEM_PROMPT
 from flotorch_core.logger.global_logger import get_logger
 from flotorch_core.utils.sagemaker_utils import SageMakerUtils, INFERENCER_MODELS
@@ -13,7 +14,7 @@ from sagemaker.predictor import Predictor
 logger = get_logger()
 
 class SageMakerInferencer(BaseInferencer):
-    def __init__(self, model_id: str, region: str, role_arn: str, n_shot_prompts: int = 0, temperature: float = 0.7, n_shot_prompt_guide_obj: Dict[str, List[Dict[str, str]]] = None, max_tokens: int = None, topP: int = None):
+    def __init__(self, model_id: str, region: str, role_arn: str, n_shot_prompts: int = 0, temperature: float = 0.7, n_shot_prompt_guide_obj: Dict[str, List[Dict[str, str]]] = None, max_tokens: int = None, topP: int = None, max_concurrency: int = None):
         """
         Initialize the BedrockInferencer with Bedrock-specific parameters.
 
@@ -23,17 +24,25 @@ class SageMakerInferencer(BaseInferencer):
             n_shot_prompts (int): Number of examples to include in few-shot learning.
             temperature (float): Sampling temperature for response generation.
             n_shot_prompt_guide_obj (Dict[str, List[Dict[str, str]]]): Guide object for few-shot examples.
+            max_concurrency (int): The number of requests generate_text_batch keeps in flight.
         """
         super().__init__(model_id, region, n_shot_prompts, temperature, n_shot_prompt_guide_obj)
+        if max_concurrency:
+            self.max_concurrency = max_concurrency
         self.role = role_arn
-        self.client = boto3.client("sagemaker-runtime", region_name=region)
+        # One pooled connection per concurrent request of generate_text_batch
+        self.client = boto3.client("sagemaker-runtime", region_name=region,
+                                   config=Config(max_pool_connections=max(10, self.max_concurrency)))
         self.sagemaker_client = boto3.client('sagemaker', region_name=region)
         self.max_tokens = max_tokens
         self.topP = topP
 
         logger.info(f"Initializing SageMaker Generator for model: {model_id}")
 
-        self.session = Session(boto_session=boto3.Session(region_name=region))
+        # The predictor invokes the endpoint with the pooled runtime client
+        self.session = Session(boto_session=boto3.Session(region_name=region),
+                               sagemaker_client=self.sagemaker_client,
+                               sagemaker_runtime_client=self.client)
 
         self.inferencing_model_id = model_id
         self.inferencing_model_endpoint_name = f"{SageMakerUtils.sanitize_name(model_id)[:42]}-inferencing-endpoint"
@@ -59,49 +68,60 @@ class SageMakerInferencer(BaseInferencer):
         self.inferencing_predictor = self.predictor
 
     def generate_text(self, user_query: str, context: List[Dict], use_system: bool = True) -> Tuple[Dict[Any, Any], str]:
+        """
+        Generates the response, or returns an error message when the request fails.
+        """
+        prompt, payload = self._prepare_request(user_query, context, use_system)
+
+        try:
+            return self._predict(prompt, payload)
+        except Exception as e:
+            logger.error(f"Error generating response: {str(e)}")
+            return f"Error generating response: {str(e)}"
+
+    def _generate_batch_item(self, user_query: str, context: List[Dict], use_system: bool = True) -> Tuple[Dict[Any, Any], str]:
+        # Failures raise so that generate_text_batch reports them in the result of the query
+        return self._predict(*self._prepare_request(user_query, context, use_system))
+
+    def _prepare_request(self, user_query: str, context: List[Dict], use_system: bool) -> Tuple[str, Dict]:
         if not self.inferencing_predictor:
             raise ValueError("Generation predictor not initialized")
         
         system_prompt, prompt = self.generate_prompt(user_query, use_system, context)
 
-        payload = self.construct_payload(system_prompt, prompt)
-
-        try:
-            start_time = time.time()
-            response = self.inferencing_predictor.predict(payload)
-            latency = int((time.time() - start_time) * 1000)
+        return prompt, self.construct_payload(system_prompt, prompt)
 
-            generated_text = self._extract_response(response)
-            
-            if "The final answer is:" in generated_text:
-                answer = generated_text.split("The final answer is:")[1].strip()
-            elif "Assistant:" in generated_text:
-                answer = generated_text.split("Assistant:")[1].strip()
-            else:
-                answer = generated_text.strip()
+    def _predict(self, prompt: str, payload: Dict) -> Tuple[Dict[Any, Any], str]:
+        start_time = time.time()
+        response = self.inferencing_predictor.predict(payload)
+        latency = int((time.time() - start_time) * 1000)
 
-            cleaned_response = self._clean_response(answer)
+        generated_text = self._extract_response(response)
+        
+        if "The final answer is:" in generated_text:
+            answer = generated_text.split("The final answer is:")[1].strip()
+        elif "Assistant:" in generated_text:
+            answer = generated_text.split("Assistant:")[1].strip()
+        else:
+            answer = generated_text.strip()
 
-            if not cleaned_response or cleaned_response.isspace() or 'DRAFT' in cleaned_response:
-                return None, "Unable to generate a proper response. Please try again."
-            
-            input_tokens = len(prompt) // 4
-            output_tokens = len(generated_text) // 4
-            total_tokens = input_tokens + output_tokens
-            
-            answer_metadata = {
-                'inputTokens': input_tokens,
-                'outputTokens': output_tokens,
-                'totalTokens': total_tokens,
-                'latencyMs': latency
-            }
-            
-            return answer_metadata, cleaned_response
-            
+        cleaned_response = self._clean_response(answer)
 
-        except Exception as e:
-            logger.error(f"Error generating response: {str(e)}")
-            return f"Error generating response: {str(e)}"
+        if not cleaned_response or cleaned_response.isspace() or 'DRAFT' in cleaned_response:
+            return None, "Unable to generate a proper response. Please try again."
+        
+        input_tokens = len(prompt) // 4
+        output_tokens = len(generated_text) // 4
+        total_tokens = input_tokens + output_tokens
+        
+        answer_metadata = {
+            'inputTokens': input_tokens,
+            'outputTokens': output_tokens,
+            'totalTokens': total_tokens,
+            'latencyMs': latency
+        }
+        
+        return answer_metadata, cleaned_response
 
     def _clean_response(self, text: str) -> str:
         """
@@ -1,22 +1,31 @@
 import os
 from opensearchpy import OpenSearch
 from flotorch_core.chunking.chunking import Chunk
-from flotorch_core.embedding.embedding import BaseEmbedding
+from flotorch_core.embedding.embedding import BaseEmbedding, EmbeddingList
+from flotorch_core.embedding.quantization import BaseQuantizer
+from flotorch_core.utils.text_normalizer import clean_text_for_vector_db
 from flotorch_core.storage.db.vector.vector_storage import VectorStorage, VectorStorageSearchItem, VectorStorageSearchResponse
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 """
 This class is responsible for storing the data in the OpenSearch.
+The children of hierarchical chunks are indexed with their own text and a parent_id; the
+parent texts are stored once as parent records in parent_index, the vector index by default,
+with the parent ID as document ID.
 """
 
 class OpenSearchClient(VectorStorage):
     def __init__(self, host, port, username, password, index, use_ssl=True, verify_certs=False, ssl_assert_hostname=False, ssl_show_warn=False,
-                 embedder: Optional[BaseEmbedding] = None):
+                 embedder: Optional[BaseEmbedding] = None, parent_index: Optional[str] = None,
+                 quantizer: Optional[BaseQuantizer] = None):
         self.host = host
         self.port = port
         self.username = username
         self.password = password
         self.index = index
+        self.parent_index = parent_index or index
+        # Vectors are indexed and queried as the codes of the quantizer when one is set
+        self.quantizer = quantizer
         self.embedder = embedder
         
         self.client = OpenSearch(
@@ -29,31 +38,63 @@ class OpenSearchClient(VectorStorage):
         )
     
     def write(self, body):
-        return self.client.index(index=self.index, body=body)
+        return self.client.index(index=self.index, body=self._clean_document(body))
     
     def read(self, body):
         return self.search(self.index, body)
     
     def write_bulk(self, body: List[dict]):
+        if isinstance(body, list):
+            body = [self._clean_document(line) for line in body]
         return self.client.bulk(body=body)
 
+    def write_embeddings(self, embedding_list: EmbeddingList, batch_size: int = 500, id_field: str = "chunk_id"):
+        """
+        Indexes an embedding list with bulk requests of batch_size documents, the parent
+        records first so that children never reference a missing parent.
+        """
+        responses = []
+        for body in embedding_list.bulk_bodies(self.index, batch_size, id_field, self.parent_index, self.quantizer):
+            responses.append(self.client.bulk(body=body))
+        return responses
+
+    @staticmethod
+    def _clean_document(document):
+        """
+        Normalizes the text of a document before it is indexed. Texts produced by
+        Embeddings.to_json are already clean and are served from the normalization cache.
+        """
+        if isinstance(document, dict) and isinstance(document.get('text'), str):
+            document = {**document, 'text': clean_text_for_vector_db(document['text'])}
+        return document
+
     # TODO: Need to create a model class for the return type of the search method
     # This model class has to be created in the base class and this return type has to be consitent in all the vector_sotrage classes
     def search(self, chunk: Chunk,  knn: int, hierarchical=False):
         embedding = self.embedder.embed(chunk)
         query_vector = embedding.embeddings
+        if self.quantizer is not None:
+            query_vector = self.quantizer.encode_query(query_vector)
         body = self.embed_query(query_vector, knn, hierarchical)
         response = self.client.search(index=self.index, body=body)
 
+        hits = response['hits']['hits']
+        parent_texts = {}
+        if hierarchical:
+            parent_texts = self._parent_texts([hit['_source']['parent_id'] for hit in hits
+                                               if 'parent_id' in hit['_source']])
+
         result = []
-        for hit in response['hits']['hits']:
+        for hit in hits:
             source = hit['_source']
+            parent_id = source['parent_id'] if 'parent_id' in source else None
             result.append(
                 VectorStorageSearchItem(
                     execution_id=hit['_id'],
                     chunk_id=source['chunk_id'] if 'chunk_id' in source else None,
-                    parent_id=source['parent_id'] if 'parent_id' in source else None,
-                    text=source['text'],
+                    parent_id=parent_id,
+                    # Documents indexed before parent records carry the parent text themselves
+                    text=parent_texts.get(parent_id, source['text']),
                     vectors=source['vectors'],
                     metadata=source['metadata']
                 )
@@ -67,6 +108,17 @@ class OpenSearchClient(VectorStorage):
             }
         )
     
+    def _parent_texts(self, parent_ids: List[str]) -> Dict[str, str]:
+        """
+        Fetches the parent records of the hits in one request.
+        :return: The text of every parent found by parent ID.
+        """
+        parent_ids = list(dict.fromkeys(parent_ids))
+        if not parent_ids:
+            return {}
+        response = self.client.mget(index=self.parent_index, body={"ids": parent_ids})
+        return {doc['_id']: doc['_source']['text'] for doc in response['docs'] if doc.get('found')}
+
     def embed_query(self, query_vector: List[float], knn: int, hierarchical=False):
         vector_field = next((field for field, props in 
                             self.client.indices.get_mapping(index=self.index)[self.index]['mappings']['properties'].items() 
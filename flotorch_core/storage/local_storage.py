@@ -50,6 +50,35 @@ class LocalStorageProvider(StorageProvider):
             with open(path, "rb") as file:
                 yield file.read()
 
+    def read_stream(self, path: str, block_size: int = 1024 * 1024) -> Generator[bytes, None, None]:
+        """
+        Reads data from the specified path in local storage block by block. The files of a
+        directory are read one after the other, separated by a newline so that the last word
+        of a file is never joined to the first word of the next.
+        Args:
+            path (str): The path to read the data from in local storage.
+            block_size (int): The maximum number of bytes per yielded block.
+        Returns:
+            Generator[bytes, None, None]: A generator that yields the file content in blocks.
+        """
+        logger.info('Streaming data from local storage')
+        paths = [path]
+        if os.path.isdir(path):
+            paths = [os.path.join(path, filename) for filename in sorted(os.listdir(path))]
+        separator = b""
+        for file_path in paths:
+            if not os.path.isfile(file_path):
+                continue
+            if separator:
+                yield separator
+            separator = b"\n"
+            with open(file_path, "rb") as file:
+                while True:
+                    block = file.read(block_size)
+                    if not block:
+                        break
+                    yield block
+
     def _read_directory(self, path):
         """
         Reads all files in a directory.
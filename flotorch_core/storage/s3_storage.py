@@ -1,6 +1,6 @@
 import logging
 import os
-from typing import Generator
+from typing import Generator, List
 from urllib.parse import urlparse
 import boto3
 from .storage import StorageProvider
@@ -40,7 +40,7 @@ class S3StorageProvider(StorageProvider):
             path (str): The path to write the data to in the S3 bucket.
             data (bytes): The data to write to the S3 bucket.
         """
-        logger.info(f'Writing data to S3 storage: {data}')
+        logger.info(f'Writing {len(data)} bytes to S3 storage: {path}')
         if not path.endswith("/"):
             key = path
         else:
@@ -62,6 +62,41 @@ class S3StorageProvider(StorageProvider):
             response = self.s3_client.get_object(Bucket=self.bucket, Key=path)
             yield response['Body'].read()
 
+    def read_stream(self, path: str, block_size: int = 1024 * 1024) -> Generator[bytes, None, None]:
+        """
+        Reads data from the specified path in the S3 bucket block by block,
+        without buffering the whole object in memory. The objects under a directory prefix
+        are read one after the other, separated by a newline.
+        Args:
+            path (str): The path to read the data from in the S3 bucket.
+            block_size (int): The maximum number of bytes per yielded block.
+        Returns:
+            Generator[bytes, None, None]: A generator that yields the object content in blocks.
+        """
+        logger.info('Streaming data from S3 storage')
+        keys = [path]
+        if self._is_directory(path):
+            prefix = path if path.endswith("/") else path + "/"
+            response = self.s3_client.list_objects_v2(Bucket=self.bucket, Prefix=prefix)
+            keys = [obj["Key"] for obj in response.get("Contents", []) if not obj["Key"].endswith("/")]
+        for i, key in enumerate(keys):
+            if i:
+                yield b"\n"
+            response = self.s3_client.get_object(Bucket=self.bucket, Key=key)
+            yield from response['Body'].iter_chunks(chunk_size=block_size)
+
+    def list_keys(self, prefix: str) -> List[str]:
+        """
+        Lists the keys under the specified prefix, across as many listing pages as needed.
+        Args:
+            prefix (str): The key prefix.
+        Returns:
+            List[str]: The keys of the objects under the prefix.
+        """
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        return [obj["Key"] for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix)
+                for obj in page.get("Contents", [])]
+
     def _is_directory(self, path: str) -> bool:
         """
         Determines if the given S3 path is a directory by checking if multiple files exist under the prefix.
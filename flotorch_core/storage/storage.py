@@ -52,3 +52,18 @@ class StorageProvider(ABC):
             Generator[str, None, None]: A generator that yields the data read as a string.
         """
         yield from (data.decode('utf-8') for data in self.read(path))
+
+    def read_stream(self, path: str, block_size: int = 1024 * 1024) -> Generator[bytes, None, None]:
+        """
+        Reads data from the specified path in blocks of at most block_size bytes.
+        Providers that can read incrementally override this so that the whole
+        object never has to be held in memory; the default re-slices the output of read.
+        Args:
+            path (str): The path to read the data from.
+            block_size (int): The maximum number of bytes per yielded block.
+        Returns:
+            Generator[bytes, None, None]: A generator that yields the data in blocks.
+        """
+        for data in self.read(path):
+            for start in range(0, len(data), block_size):
+                yield data[start:start + block_size]
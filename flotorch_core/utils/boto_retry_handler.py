@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+import asyncio
+import inspect
 import time
 from pydantic import BaseModel
 import botocore
@@ -27,6 +29,17 @@ class BotoRetryHandler(ABC):
         
         
     def __call__(self, func):
+        if inspect.iscoroutinefunction(func):
+            async def async_wrapper(*args, **kwargs):
+                retries = 0
+                while True:
+                    try:
+                        return await func(*args, **kwargs)
+                    except botocore.exceptions.ClientError as e:
+                        retries += 1
+                        await asyncio.sleep(self._backoff_time(e, retries))
+            return async_wrapper
+
         def wrapper(*args, **kwargs):
             retries = 0
             retry_params = self.retry_params
@@ -54,4 +67,24 @@ class BotoRetryHandler(ABC):
                     logger.error(f"Unexpected error in Bedrock converse: {str(e)}")
                     raise
             
-        return wrapper
\ No newline at end of file
+        return wrapper
+
+    def _backoff_time(self, error: "botocore.exceptions.ClientError", retries: int) -> float:
+        """
+        Decides whether a failed async call is retried, re-raising the error when it is not.
+        Args:
+            error (ClientError): The error of the attempt.
+            retries (int): The number of failed attempts so far.
+        Returns:
+            float: The number of seconds to wait before the next attempt.
+        """
+        retry_params = self.retry_params
+        if error.response['Error']['Code'] not in self.retryable_errors:
+            raise error
+        logger.error(f"Rate limit error in Bedrock converse (Attempt {retries}/{retry_params.max_retries}): {str(error)}")
+        if retries >= retry_params.max_retries:
+            logger.error("Max retries reached. Could not complete Bedrock converse operation.")
+            raise error
+        backoff_time = retry_params.retry_delay * (retry_params.backoff_factor ** (retries - 1))
+        logger.info(f"Retrying in {backoff_time} seconds...")
+        return backoff_time
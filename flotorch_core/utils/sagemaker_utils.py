@@ -1,4 +1,7 @@
 import json
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
 import boto3
 from botocore.exceptions import ClientError
 from enum import Enum
@@ -160,6 +163,34 @@ class SageMakerUtils:
             return False
 
 
+    @staticmethod
+    def create_jumpstart_model(sagemaker_client, instance_type, region, role, model_id: str, model_name: str) -> str:
+        """
+        Creates the SageMaker model of a JumpStart model without deploying it, e.g. for
+        Batch Transform jobs. An existing model of that name is reused.
+
+        Args:
+            model_id (str): The model ID for the SageMaker JumpStart model.
+            model_name (str): The name of the SageMaker model.
+
+        Returns:
+            str: The name of the model.
+        """
+        try:
+            sagemaker_client.describe_model(ModelName=model_name)
+            logger.info(f"Model '{model_name}' exists.")
+            return model_name
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ValidationException':
+                raise
+
+        sagemaker_session = sagemaker.Session(boto_session=boto3.Session(region_name=region),
+                                              sagemaker_client=sagemaker_client)
+        model = JumpStartModel(role=role, model_id=model_id, name=model_name, sagemaker_session=sagemaker_session)
+        model.create(instance_type=instance_type, accept_eula=True)
+        logger.info(f"Created model '{model_name}' for '{model_id}'.")
+        return model_name
+
     @staticmethod
     def create_huggingface_endpoint(sagemaker_client, instance_type, model_id: str, endpoint_name: str, role: str, region_name: str) -> bool:
         """
@@ -266,4 +297,133 @@ class SageMakerUtils:
         if not name[0].isalpha(): 
             name = 'n' + name
         # Truncate to 63 characters (AWS limit)
-        return name[:63]
\ No newline at end of file
+        return name[:63]
+
+
+class EndpointReadiness:
+    """
+    Readiness of one endpoint, shared by every thread that needs it.
+    """
+
+    def __init__(self):
+        self.ready_at: Optional[float] = None
+        self.waiter: Optional[threading.Event] = None
+        self.error: Optional[BaseException] = None
+
+
+class EndpointRegistry:
+    """
+    Process-wide record of the SageMaker endpoints known to be in service.
+    An endpoint checked within ttl seconds is used without control plane calls. Otherwise the
+    first caller describes it, creates it when it does not exist and polls it with exponential
+    backoff until it is in service, while concurrent callers for the same endpoint wait for
+    that outcome instead of polling themselves.
+    :param ttl: The seconds an in service endpoint is trusted without a new check.
+    :param initial_wait: The first pause between status checks, in seconds.
+    :param max_wait: The longest pause between status checks, in seconds.
+    :param timeout: The longest an endpoint may take to come into service, in seconds.
+    """
+
+    def __init__(self, ttl: float = 900, initial_wait: float = 1, max_wait: float = 30, timeout: float = 3600):
+        self.ttl = ttl
+        self.initial_wait = initial_wait
+        self.max_wait = max_wait
+        self.timeout = timeout
+        self._endpoints: Dict[str, EndpointReadiness] = {}
+        self._lock = threading.Lock()
+
+    def is_ready(self, endpoint_name: str) -> bool:
+        with self._lock:
+            readiness = self._endpoints.get(endpoint_name)
+            return readiness is not None and self._fresh(readiness)
+
+    def ensure_ready(self, endpoint_name: str, sagemaker_client, create: Optional[Callable[[], Any]] = None) -> None:
+        """
+        Returns once the endpoint is in service.
+        Args:
+            endpoint_name (str): The name of the SageMaker endpoint.
+            sagemaker_client: The boto3 SageMaker client to describe the endpoint with.
+            create (Callable): Starts the creation of the endpoint when it does not exist.
+        Raises:
+            RuntimeError: If the endpoint failed, does not exist without create or timed out.
+        """
+        with self._lock:
+            readiness = self._endpoints.setdefault(endpoint_name, EndpointReadiness())
+            if self._fresh(readiness):
+                return
+            waiter = readiness.waiter
+            resolving = waiter is None
+            if resolving:
+                waiter = readiness.waiter = threading.Event()
+                readiness.error = None
+
+        if not resolving:
+            waiter.wait()
+            with self._lock:
+                if readiness.error is not None:
+                    raise readiness.error
+            return
+
+        error = None
+        try:
+            self._wait_in_service(endpoint_name, sagemaker_client, create)
+        except BaseException as e:
+            error = e
+        with self._lock:
+            readiness.waiter = None
+            readiness.error = error
+            readiness.ready_at = time.monotonic() if error is None else None
+        waiter.set()
+        if error is not None:
+            raise error
+
+    def invalidate(self, endpoint_name: str) -> None:
+        """
+        Forgets the readiness of an endpoint, e.g. after it was deleted.
+        """
+        with self._lock:
+            readiness = self._endpoints.get(endpoint_name)
+            if readiness is not None and readiness.waiter is None:
+                del self._endpoints[endpoint_name]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._endpoints = {name: readiness for name, readiness in self._endpoints.items()
+                               if readiness.waiter is not None}
+
+    def _fresh(self, readiness: EndpointReadiness) -> bool:
+        return readiness.ready_at is not None and time.monotonic() - readiness.ready_at < self.ttl
+
+    def _wait_in_service(self, endpoint_name: str, sagemaker_client, create: Optional[Callable[[], Any]]):
+        deadline = time.monotonic() + self.timeout
+        wait = self.initial_wait
+        created = False
+        while True:
+            try:
+                status = sagemaker_client.describe_endpoint(EndpointName=endpoint_name)["EndpointStatus"]
+            except ClientError as e:
+                error = e.response['Error']
+                # Throttling, access errors and the like are not a missing endpoint
+                if error['Code'] != 'ValidationException' or 'Could not find endpoint' not in error.get('Message', ''):
+                    raise
+                if created or create is None:
+                    raise RuntimeError(f"Endpoint '{endpoint_name}' does not exist") from e
+                logger.info(f"Endpoint '{endpoint_name}' does not exist, creating it.")
+                create()
+                created = True
+                continue
+
+            if status == "InService":
+                logger.info(f"Endpoint '{endpoint_name}' is in service.")
+                return
+            if status in ("Failed", "OutOfService", "Deleting"):
+                raise RuntimeError(f"Endpoint '{endpoint_name}' is not usable, status: {status}")
+            if time.monotonic() + wait > deadline:
+                raise RuntimeError(f"Timeout while waiting for endpoint '{endpoint_name}', status: {status}")
+            logger.info(f"Waiting {wait:.0f}s for endpoint '{endpoint_name}', status: {status}")
+            time.sleep(wait)
+            wait = min(wait * 2, self.max_wait)
+
+
+# Global registry instance
+endpoint_registry = EndpointRegistry()
@@ -0,0 +1,82 @@
+import re
+from typing import Dict, Iterable
+
+"""
+Text normalization shared by chunking, embedding serialization and vector storage writes.
+"""
+
+# ASCII characters clean_text_for_vector_db removes: everything but letters, digits and whitespace
+_VECTOR_DB_TABLE = str.maketrans('', '', ''.join(
+    c for c in map(chr, range(128)) if not c.isalnum() and not c.isspace()
+))
+_VECTOR_DB_PATTERN = re.compile(r'[^a-zA-Z0-9\s]+')
+
+_VECTOR_DB_CACHE_SIZE = 4096
+_vector_db_cache: Dict[str, str] = {}
+
+
+def replace_separators(text: str, separators: Iterable[str], space: str = ' ') -> str:
+    """
+    Replaces every separator with space. Runs of separators are kept, every separator
+    character becomes one space.
+    Args:
+        text (str): The input text.
+        separators (Iterable[str]): The single character separators.
+        space (str): The replacement.
+    Returns:
+        str: The text with the separators replaced.
+    """
+    # str.replace scans with memchr and returns the text itself when the separator is
+    # absent, which beats str.translate as soon as the text is not pure ASCII
+    for separator in separators:
+        if separator != space:
+            text = text.replace(separator, space)
+    return text
+
+
+def collapse_repeated(text: str, separator: str = ' ') -> str:
+    """
+    Collapses runs of the separator into one.
+    Args:
+        text (str): The input text.
+        separator (str): The separator.
+    Returns:
+        str: The text without repeated separators.
+    """
+    repeated = separator * 2
+    # Every pass halves the longest run, plain replace is cheaper than a regex here
+    while repeated in text:
+        text = text.replace(repeated, separator)
+    return text
+
+
+def clean_text_for_vector_db(text: str) -> str:
+    """
+    Cleans the text stored next to the vectors: quotes and special symbols are removed,
+    whitespace runs become a single space and the result is stripped.
+    Results are cached by text, a cleaned text is cached as its own result so that
+    cleaning it again on the write path costs a lookup.
+    Args:
+        text (str): The input text to clean.
+    Returns:
+        str: The cleaned text.
+    """
+    cleaned = _vector_db_cache.get(text)
+    if cleaned is not None:
+        return cleaned
+
+    # str.translate is only fast on ASCII text, isascii is a flag check
+    if text.isascii():
+        cleaned = text.translate(_VECTOR_DB_TABLE)
+    else:
+        cleaned = _VECTOR_DB_PATTERN.sub('', text)
+    # str.split without arguments splits on the same whitespace as \s and drops the ends
+    cleaned = ' '.join(cleaned.split())
+
+    if len(_vector_db_cache) >= _VECTOR_DB_CACHE_SIZE:
+        # Oldest first, dicts keep insertion order
+        for key in list(_vector_db_cache)[:_VECTOR_DB_CACHE_SIZE // 4]:
+            _vector_db_cache.pop(key, None)
+    _vector_db_cache[text] = cleaned
+    _vector_db_cache[cleaned] = cleaned
+    return cleaned
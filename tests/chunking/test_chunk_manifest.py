@@ -0,0 +1,106 @@
+import pytest
+from flotorch_core.chunking.chunk_manifest import ChunkManifest
+from flotorch_core.chunking.fixedsize_chunking import FixedSizeChunker
+from flotorch_core.chunking.hierarical_chunking import HieraricalChunker
+from flotorch_core.storage.local_storage import LocalStorageProvider
+
+
+def _document(count, offset=0):
+    return " ".join(f"word{i}" for i in range(offset, offset + count))
+
+
+@pytest.fixture
+def chunker():
+    return FixedSizeChunker(chunk_size=10, chunk_overlap=10)
+
+
+def _assert_consistent(manifest, document_id, indexed, text, chunker):
+    """The indexed chunks are exactly the windows recorded for the current text."""
+    prepared = chunker.prepare(text)
+    records = manifest.documents[document_id]['chunks']
+    assert set(indexed) == {record.chunk_id for record in records}
+    for record in records:
+        assert indexed[record.chunk_id] == prepared[record.start:record.end]
+
+
+def test_new_document_emits_all_chunks(chunker):
+    manifest = ChunkManifest()
+    text = _document(200)
+    delta = manifest.update("doc", text, chunker)
+    assert [chunk.data for chunk in delta.chunks] == [chunk.data for chunk in chunker.chunk(text)]
+    assert delta.stale_ids == []
+    assert manifest.chunk_ids("doc") == [chunk.id for chunk in delta.chunks]
+
+
+def test_unchanged_document_emits_nothing(chunker):
+    manifest = ChunkManifest()
+    text = _document(200)
+    first = manifest.update("doc", text, chunker)
+    delta = manifest.update("doc", text, chunker)
+    assert delta.is_empty
+    assert delta.unchanged == len(first.chunks)
+
+
+@pytest.mark.parametrize("edit", [
+    lambda words: words[:100] + ["inserted", "words"] + words[100:],
+    lambda words: words[:100] + words[103:],
+    lambda words: words[:100] + ["changed"] + words[101:],
+    lambda words: words + ["appended"],
+    lambda words: ["prepended"] + words,
+])
+def test_edit_only_reindexes_changed_region(chunker, edit):
+    manifest = ChunkManifest()
+    words = _document(400).split()
+    first = manifest.update("doc", " ".join(words), chunker)
+    indexed = {chunk.id: chunk.data for chunk in first.chunks}
+
+    text = " ".join(edit(words))
+    delta = manifest.update("doc", text, chunker)
+    for stale_id in delta.stale_ids:
+        del indexed[stale_id]
+    indexed.update({chunk.id: chunk.data for chunk in delta.chunks})
+
+    _assert_consistent(manifest, "doc", indexed, text, chunker)
+    assert 0 < len(delta.chunks) <= 3
+    assert len(delta.stale_ids) <= 3
+    assert delta.unchanged >= len(first.chunks) - 3
+
+
+def test_hierarchical_edit_emits_changed_parents():
+    chunker = HieraricalChunker(chunk_size=5, chunk_overlap=10, parent_chunk_size=20)
+    manifest = ChunkManifest()
+    words = _document(400).split()
+    first = manifest.update("doc", " ".join(words), chunker)
+    text = " ".join(words[:200] + ["edited"] + words[200:])
+    delta = manifest.update("doc", text, chunker)
+
+    assert 0 < len(delta.chunks) <= 2
+    assert len(delta.chunks) < len(first.chunks)
+    for chunk in delta.chunks:
+        assert chunk.child_data
+        assert all(child.data in chunk.data for child in chunk.child_data)
+
+
+def test_remove_returns_all_chunk_ids(chunker):
+    manifest = ChunkManifest()
+    delta = manifest.update("doc", _document(50), chunker)
+    assert manifest.remove("doc") == [chunk.id for chunk in delta.chunks]
+    assert "doc" not in manifest
+    assert manifest.remove("doc") == []
+
+
+def test_save_and_load(chunker, tmp_path):
+    storage = LocalStorageProvider()
+    path = str(tmp_path / "manifest.json")
+    manifest = ChunkManifest()
+    manifest.update("doc", _document(200), chunker)
+    manifest.save(storage, path)
+
+    loaded = ChunkManifest.load(storage, path)
+    assert loaded.to_json() == manifest.to_json()
+    assert loaded.update("doc", _document(200), chunker).is_empty
+
+
+def test_empty_input(chunker):
+    with pytest.raises(ValueError, match="Input text cannot be empty or None"):
+        ChunkManifest().update("doc", "", chunker)
@@ -1,5 +1,6 @@
 import pytest
-from flotorch_core.chunking.chunking import Chunk, BaseChunker
+from flotorch_core.chunking.chunking import Chunk, ChunkSource, BaseChunker
+from flotorch_core.chunking.fixedsize_chunking import FixedSizeChunker
 from typing import List
 
 
@@ -141,3 +142,37 @@ def test_chunk_id_uniqueness():
     chunk1 = Chunk("data1")
     chunk2 = Chunk("data2")
     assert chunk1.id != chunk2.id
+
+def test_chunk_has_no_instance_dict():
+    chunk = Chunk("data")
+    assert not hasattr(chunk, "__dict__")
+
+def test_chunk_from_source_references_offsets():
+    source = ChunkSource("Hello shared World", "doc-1")
+    chunk = Chunk.from_source(source, 6, 12)
+
+    assert chunk.data == "shared"
+    assert chunk.source is source
+    assert (chunk.source_id, chunk.start, chunk.end) == ("doc-1", 6, 12)
+
+def test_chunk_data_setter_detaches_source():
+    chunk = Chunk.from_source(ChunkSource("Hello World"), 0, 5)
+    chunk.data = "replaced"
+    assert chunk.data == "replaced"
+    assert chunk.source is None
+
+def test_chunk_content_id_is_stable():
+    first = Chunk.from_source(ChunkSource("same text"), 0, 9, deterministic_id=True)
+    second = Chunk.from_source(ChunkSource("same text"), 0, 9, deterministic_id=True)
+    assert first.id == second.id
+    assert first.id == Chunk.content_id("same text")
+    assert Chunk.content_id("same text", "doc-1") != Chunk.content_id("same text", "doc-2")
+
+def test_chunk_list_passes_document_ids():
+    chunker = FixedSizeChunker(chunk_size=5, chunk_overlap=0)
+    chunker.deterministic_ids = True
+    first, second = chunker.chunk_list(["same text", "same text"], ["doc-1", "doc-2"])
+    assert (first.source_id, second.source_id) == ("doc-1", "doc-2")
+    assert first.id != second.id
+    with pytest.raises(ValueError, match="one document ID per text"):
+        chunker.chunk_list(["same text"], ["doc-1", "doc-2"])
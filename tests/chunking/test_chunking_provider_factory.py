@@ -0,0 +1,59 @@
+import pytest
+from flotorch_core.chunking.chunking_provider_factory import ChunkingFactory
+from flotorch_core.chunking.fixedsize_chunking import FixedSizeChunker
+from flotorch_core.chunking.hierarical_chunking import HieraricalChunker
+
+
+def _documents():
+    return [f"Document {i} talks about topic {i % 7}. " * (20 + i % 13) for i in range(40)]
+
+def test_create_fixed_chunker():
+    chunker = ChunkingFactory.create_chunker("fixed", 100, 20)
+    assert isinstance(chunker, FixedSizeChunker)
+    assert chunker.max_workers == 1
+
+def test_create_hierarchical_chunker():
+    chunker = ChunkingFactory.create_chunker("Hierarchical", 100, 20, 500, max_workers=4, batch_size=8,
+                                             parent_chunk_overlap=10)
+    assert isinstance(chunker, HieraricalChunker)
+    assert chunker.parent_chunk_overlap == 200
+    assert chunker.max_workers == 4
+    assert chunker.batch_size == 8
+
+def test_create_unsupported_chunker():
+    with pytest.raises(ValueError, match="Unsupported chunking type"):
+        ChunkingFactory.create_chunker("unknown", 100, 20)
+
+def test_create_chunker_invalid_workers():
+    with pytest.raises(ValueError):
+        ChunkingFactory.create_chunker("fixed", 100, 20, max_workers=0)
+
+@pytest.mark.parametrize("strategy", ["fixed", "hierarchical"])
+def test_parallel_chunk_list_preserves_order(strategy):
+    serial = ChunkingFactory.create_chunker(strategy, 20, 10, 60)
+    parallel = ChunkingFactory.create_chunker(strategy, 20, 10, 60, max_workers=2, batch_size=3)
+    parallel.parallel_min_size = 0
+    documents = _documents()
+
+    assert parallel._use_process_pool(documents)
+    expected = serial.chunk_list(documents)
+    chunks = parallel.chunk_list(documents)
+
+    assert [chunk.data for chunk in chunks] == [chunk.data for chunk in expected]
+    if strategy == "hierarchical":
+        assert [[child.data for child in chunk.child_data] for chunk in chunks] == \
+            [[child.data for child in chunk.child_data] for chunk in expected]
+
+def test_small_input_stays_in_process():
+    chunker = ChunkingFactory.create_chunker("fixed", 20, 10, max_workers=4, batch_size=3)
+    documents = _documents()
+    # Below parallel_min_size characters
+    assert not chunker._use_process_pool(documents)
+    # Fits in a single batch
+    chunker.parallel_min_size = 0
+    assert not chunker._use_process_pool(documents[:3])
+
+def test_create_chunker_with_deterministic_ids():
+    chunker = ChunkingFactory.create_chunker("fixed", 20, 10, deterministic_ids=True)
+    text = "Stable identifiers for every chunk of the document. " * 5
+    assert [c.id for c in chunker.chunk(text)] == [c.id for c in chunker.chunk(text)]
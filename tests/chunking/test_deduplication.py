@@ -0,0 +1,92 @@
+import pytest
+from flotorch_core.chunking.chunking import Chunk
+from flotorch_core.chunking.deduplication import MinHashDeduplicator
+from flotorch_core.embedding.embedding import EmbeddingList, EmbeddingMetadata, Embeddings
+
+DISCLAIMER = ("This page is provided for information only and does not constitute legal advice. "
+              "Contact the support team before acting on any of the content published here")
+
+
+def _unique(i):
+    return f"Document {i} describes topic {i} " + " ".join(f"term{i}_{j}" for j in range(30))
+
+
+def test_drops_exact_and_near_duplicates():
+    chunks = [Chunk(_unique(0)), Chunk(DISCLAIMER), Chunk(_unique(1)), Chunk(DISCLAIMER),
+              Chunk(DISCLAIMER + " today"), Chunk(_unique(2))]
+    result = MinHashDeduplicator(threshold=0.8).deduplicate(chunks)
+
+    assert [chunk.data for chunk in result.chunks] == [_unique(0), DISCLAIMER, _unique(1), _unique(2)]
+    assert result.aliases == {chunks[3].id: chunks[1].id, chunks[4].id: chunks[1].id}
+    assert result.dedup_ratio == pytest.approx(2 / 6)
+    assert result.embedding_calls_saved == 2
+
+
+def test_keeps_dissimilar_chunks():
+    chunks = [Chunk(_unique(i)) for i in range(50)]
+    result = MinHashDeduplicator().deduplicate(chunks)
+    assert result.chunks == chunks
+    assert result.dedup_ratio == 0.0
+
+
+def test_saved_calls_count_children():
+    parent = Chunk(DISCLAIMER)
+    duplicate = Chunk(DISCLAIMER)
+    for chunk in (parent, duplicate):
+        chunk.add_child(Chunk("first half"))
+        chunk.add_child(Chunk("second half"))
+    result = MinHashDeduplicator().deduplicate([parent, duplicate])
+    assert result.embedding_calls_saved == 2
+
+
+def test_estimated_jaccard_tracks_overlap():
+    deduplicator = MinHashDeduplicator(num_perm=256)
+    words = [f"w{i}" for i in range(200)]
+    first = deduplicator.signature(" ".join(words))
+    second = deduplicator.signature(" ".join(words[:150] + [f"x{i}" for i in range(50)]))
+    # 148 of the 198 shingles of each text are shared
+    assert deduplicator.jaccard(first, second) == pytest.approx(148 / 248, abs=0.08)
+    assert deduplicator.jaccard(first, first) == 1.0
+
+
+def test_expand_aliases_embeddings():
+    chunks = [Chunk(DISCLAIMER), Chunk(DISCLAIMER)]
+    result = MinHashDeduplicator().deduplicate(chunks)
+    embedding = Embeddings([0.1, 0.2], EmbeddingMetadata(10, 5), DISCLAIMER)
+    embedding.id = chunks[0].id
+    embedding_list = EmbeddingList()
+    embedding_list.append(embedding)
+
+    expanded = result.expand(embedding_list)
+    assert [e.id for e in expanded.embeddings] == [chunks[0].id, chunks[1].id]
+    assert expanded.embeddings[1].embeddings.tolist() == pytest.approx([0.1, 0.2])
+    assert expanded.metadata.input_tokens == 10
+
+
+def test_expand_points_duplicate_children_at_their_own_parent():
+    chunks = []
+    for _ in range(2):
+        chunk = Chunk(DISCLAIMER)
+        chunk.add_child(Chunk("first half"))
+        chunk.add_child(Chunk("second half"))
+        chunks.append(chunk)
+    result = MinHashDeduplicator().deduplicate(chunks)
+    embedding_list = EmbeddingList()
+    for child in chunks[0].child_data:
+        embedding = Embeddings([0.1, 0.2], EmbeddingMetadata(1, 1), child.data)
+        embedding.id = embedding.parent_id = chunks[0].id
+        embedding.child_id = child.id
+        embedding_list.append(embedding)
+    embedding_list.add_parent(chunks[0].id, DISCLAIMER)
+
+    expanded = result.expand(embedding_list)
+    assert [(e.parent_id, e.text) for e in expanded.embeddings[2:]] == \
+        [(chunks[1].id, "first half"), (chunks[1].id, "second half")]
+    assert expanded.parents == {chunks[0].id: DISCLAIMER, chunks[1].id: DISCLAIMER}
+    # Every child is indexed under its own document ID
+    assert len(set(expanded.child_ids)) == 4
+
+
+def test_invalid_threshold():
+    with pytest.raises(ValueError, match="threshold must be between 0 and 1"):
+        MinHashDeduplicator(threshold=0)
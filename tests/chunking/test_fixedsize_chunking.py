@@ -199,3 +199,59 @@ def test_chunk_content_preservation(chunker):
     reconstructed_cleaned = ' '.join(reconstructed.split())
     
     assert original_cleaned == reconstructed_cleaned
+
+def _as_stream(text, block_size):
+    encoded = text.encode("utf-8")
+    return (encoded[i:i + block_size] for i in range(0, len(encoded), block_size))
+
+def test_chunk_iter_matches_chunk():
+    # Streaming the document in small blocks must produce the same chunks
+    chunker = FixedSizeChunker(chunk_size=10, chunk_overlap=20)
+    chunker.stream_buffer_size = 100
+    text = "Streaming\tchunks across block boundaries with unicode 世界 text.\n" * 40
+
+    expected = [chunk.data for chunk in chunker.chunk(text)]
+    streamed = [chunk.data for chunk in chunker.chunk_iter(_as_stream(text, 7))]
+
+    assert streamed == expected
+
+def test_chunk_iter_is_lazy():
+    # Chunks are yielded before the stream is exhausted
+    chunker = FixedSizeChunker(chunk_size=10, chunk_overlap=0)
+    chunker.stream_buffer_size = 100
+    consumed = []
+
+    def stream():
+        for i in range(1000):
+            consumed.append(i)
+            yield b"word " * 10
+
+    first = next(chunker.chunk_iter(stream()))
+    assert first.data
+    assert len(consumed) < 1000
+
+def test_chunk_iter_buffers_cleaned_characters():
+    class MarkupChunker(FixedSizeChunker):
+        def _clean_data(self, data):
+            return super()._clean_data(data.replace("#", ""))
+
+    chunker = MarkupChunker(chunk_size=10, chunk_overlap=0)
+    chunker.stream_buffer_size = 100
+    windows = []
+    chunk_window = chunker._chunk_window
+    chunker._chunk_window = lambda data, *args: windows.append(data) or chunk_window(data, *args)
+
+    # 10 characters are left of every 50 character block
+    list(chunker.chunk_iter([b"#" * 40 + b"word word "] * 20))
+    assert all(len(window) >= 90 for window in windows[:-1])
+    assert len(windows) <= 3
+
+def test_chunk_iter_accepts_str_blocks():
+    chunker = FixedSizeChunker(chunk_size=100, chunk_overlap=20)
+    chunks = list(chunker.chunk_iter(["Hello ", "World"]))
+    assert [chunk.data for chunk in chunks] == ["Hello World"]
+
+def test_chunk_iter_empty_stream():
+    chunker = FixedSizeChunker(chunk_size=100, chunk_overlap=20)
+    assert list(chunker.chunk_iter([])) == []
+    assert list(chunker.chunk_iter([b"   ", b"\n"])) == []
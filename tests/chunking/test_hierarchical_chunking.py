@@ -378,3 +378,81 @@ def test_basic_section_identification(chunker):
     assert "Section 1.1" in all_content, "Section 1.1 not found in content"
     assert "Section 2.1" in all_content, "Section 2.1 not found in content"
 
+
+def test_chunk_iter_matches_chunk():
+    chunker = HieraricalChunker(chunk_size=10, chunk_overlap=20, parent_chunk_size=30)
+    chunker.stream_buffer_size = 200
+    text = "Parent and child windows are rebuilt from the streamed blocks. " * 30
+    encoded = text.encode("utf-8")
+    stream = (encoded[i:i + 11] for i in range(0, len(encoded), 11))
+
+    expected = chunker.chunk(text)
+    streamed = list(chunker.chunk_iter(stream))
+
+    assert [chunk.data for chunk in streamed] == [chunk.data for chunk in expected]
+    assert [[child.data for child in chunk.child_data] for chunk in streamed] == \
+        [[child.data for child in chunk.child_data] for chunk in expected]
+
+def test_children_share_parent_source():
+    chunker = HieraricalChunker(chunk_size=10, chunk_overlap=20, parent_chunk_size=40)
+    chunks = chunker.chunk("Children reference offsets of the parent source buffer. " * 10)
+
+    for parent in chunks:
+        for child in parent.child_data:
+            assert child.source is parent.source
+            assert parent.start <= child.start < child.end <= parent.end
+
+def test_deterministic_ids_on_reingest():
+    chunker = HieraricalChunker(chunk_size=10, chunk_overlap=20, parent_chunk_size=40)
+    chunker.deterministic_ids = True
+    text = "Re-ingesting the same document yields the same chunk IDs. " * 10
+
+    first = chunker.chunk(text)
+    second = chunker.chunk(text)
+
+    assert [chunk.id for chunk in first] == [chunk.id for chunk in second]
+    assert [child.id for chunk in first for child in chunk.child_data] == \
+        [child.id for chunk in second for child in chunk.child_data]
+
+def test_deterministic_ids_are_unique_in_overlapping_parents():
+    chunker = HieraricalChunker(chunk_size=10, chunk_overlap=0, parent_chunk_size=40, parent_chunk_overlap=50)
+    chunker.deterministic_ids = True
+    text = "Boilerplate repeats. " * 30 + " ".join(f"word{i}" for i in range(150))
+
+    chunks = chunker.chunk(text, "doc-1")
+    parent_ids = [chunk.id for chunk in chunks]
+    child_ids = [child.id for chunk in chunks for child in chunk.child_data]
+    assert len(set(parent_ids)) == len(parent_ids)
+    assert len(set(child_ids)) == len(child_ids)
+    assert not set(parent_ids) & set(child_ids)
+    # The same text in another document has other IDs
+    assert not set(parent_ids) & {chunk.id for chunk in chunker.chunk(text, "doc-2")}
+
+    chunker.stream_buffer_size = 300
+    streamed = list(chunker.chunk_iter([text[i:i + 97] for i in range(0, len(text), 97)], document_id="doc-1"))
+    assert [chunk.id for chunk in streamed] == parent_ids
+
+def test_parent_overlap():
+    chunker = HieraricalChunker(chunk_size=5, chunk_overlap=20, parent_chunk_size=20, parent_chunk_overlap=25)
+    assert chunker.parent_chunk_overlap == 20  # 25% of 80 characters
+    chunks = chunker.chunk(" ".join(f"word{i}" for i in range(200)))
+
+    for previous, following in zip(chunks, chunks[1:]):
+        assert following.start < previous.end
+        assert previous.end - following.start <= chunker.parent_chunk_overlap
+    for parent in chunks:
+        assert parent.child_data
+        for child in parent.child_data:
+            assert parent.start <= child.start < child.end <= parent.end
+
+def test_invalid_parent_overlap():
+    with pytest.raises(ValueError, match="parent_chunk_overlap must be less than parent_chunk_size"):
+        HieraricalChunker(chunk_size=100, chunk_overlap=20, parent_chunk_size=500, parent_chunk_overlap=100)
+
+def test_children_match_splitting_each_parent():
+    chunker = HieraricalChunker(chunk_size=10, chunk_overlap=20, parent_chunk_size=40, parent_chunk_overlap=10)
+    chunks = chunker.chunk("Parent and child windows come from one scan over the words. " * 20)
+
+    for parent in chunks:
+        expected = chunker.text_splitter.split_offsets(parent.source.text, parent.start, parent.end)
+        assert [(child.start, child.end) for child in parent.child_data] == expected
@@ -0,0 +1,80 @@
+import pytest
+from flotorch_core.chunking.chunking_provider_factory import ChunkingFactory
+from flotorch_core.chunking.semantic_chunking import SemanticChunker
+from flotorch_core.embedding.embedding import BaseEmbedding, EmbeddingMetadata, Embeddings
+
+TOPICS = {"cat": [1.0, 0.0, 0.0], "car": [0.0, 1.0, 0.0], "tax": [0.0, 0.0, 1.0]}
+
+
+class TopicEmbedding(BaseEmbedding):
+    """Embeds a sentence on the axis of the topic word it contains."""
+
+    def __init__(self):
+        super().__init__("topic", "local")
+        self.batches = []
+
+    def _prepare_chunk(self, chunk):
+        return {"text": chunk.data}
+
+    def embed(self, chunk):
+        vector = next(vector for topic, vector in TOPICS.items() if topic in chunk.data)
+        return Embeddings(vector, EmbeddingMetadata(0, 0), chunk.data)
+
+    def embed_list(self, chunks):
+        self.batches.append(len(chunks))
+        return super().embed_list(chunks)
+
+
+def _text(topics):
+    return " ".join(f"The {topic} sentence number {i}." for i, topic in enumerate(topics))
+
+
+def test_merges_similar_sentences():
+    chunker = SemanticChunker(TopicEmbedding(), chunk_size=200)
+    chunks = chunker.chunk(_text(["cat"] * 3 + ["car"] * 2 + ["tax"] * 4))
+    assert [chunk.data.count(".") for chunk in chunks] == [3, 2, 4]
+    assert all(topic in chunk.data for chunk, topic in zip(chunks, ["cat", "car", "tax"]))
+
+
+def test_chunk_size_caps_merging():
+    chunker = SemanticChunker(TopicEmbedding(), chunk_size=15)
+    chunks = chunker.chunk(_text(["cat"] * 6))
+    assert len(chunks) > 1
+    assert all(len(chunk.data) <= chunker.chunk_size for chunk in chunks)
+    assert all(chunk.data.endswith(".") for chunk in chunks)
+
+
+def test_long_sentence_is_split():
+    chunker = SemanticChunker(TopicEmbedding(), chunk_size=5)
+    chunks = chunker.chunk("The cat " + "word " * 30 + "ends here. The car stops.")
+    assert len(chunks) > 2
+    assert all(len(chunk.data) <= chunker.chunk_size for chunk in chunks)
+
+
+def test_sentences_are_embedded_in_batches():
+    embedder = TopicEmbedding()
+    chunker = SemanticChunker(embedder, chunk_size=1000, embedding_batch_size=4)
+    chunker.chunk(_text(["cat"] * 10))
+    assert embedder.batches == [4, 4, 2]
+
+
+def test_chunk_iter_matches_chunk():
+    chunker = SemanticChunker(TopicEmbedding(), chunk_size=40)
+    chunker.stream_buffer_size = 120
+    text = _text(["cat", "cat", "car", "tax", "tax", "cat"] * 10)
+    encoded = text.encode("utf-8")
+    stream = (encoded[i:i + 17] for i in range(0, len(encoded), 17))
+    assert [chunk.data for chunk in chunker.chunk_iter(stream)] == [chunk.data for chunk in chunker.chunk(text)]
+
+
+def test_factory_creates_semantic_chunker():
+    embedder = TopicEmbedding()
+    chunker = ChunkingFactory.create_chunker("semantic", 100, 0, embedder=embedder, similarity_threshold=0.5)
+    assert isinstance(chunker, SemanticChunker)
+    assert chunker.embedder is embedder
+    assert chunker.similarity_threshold == 0.5
+
+
+def test_requires_embedder():
+    with pytest.raises(ValueError, match="embedder is required for semantic chunking"):
+        ChunkingFactory.create_chunker("semantic", 100, 0)
@@ -0,0 +1,67 @@
+import random
+
+import pytest
+from langchain.text_splitter import CharacterTextSplitter
+
+from flotorch_core.chunking.text_splitter import FixedSizeTextSplitter
+from flotorch_core.chunking.fixedsize_chunking import FixedSizeChunker
+from flotorch_core.chunking.hierarical_chunking import HieraricalChunker
+
+
+def _langchain_split(text, chunk_size, chunk_overlap):
+    splitter = CharacterTextSplitter(
+        separator=' ',
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        length_function=len,
+        is_separator_regex=False
+    )
+    return splitter.split_text(text)
+
+def _random_text(rng, words):
+    vocabulary = ["a", "to", "the", "chunk", "overlap", "世界", "αβγ", "👋🌍", " ",
+                  "supercalifragilisticexpialidocious" * 3, "x" * 45]
+    gaps = [" ", " ", " ", "  ", "   "]
+    return "".join(rng.choice(vocabulary) + rng.choice(gaps) for _ in range(words))
+
+@pytest.mark.parametrize("chunk_size,chunk_overlap", [
+    (10, 0), (10, 5), (40, 8), (80, 40), (400, 80), (1, 0), (50, 49)
+])
+def test_parity_with_langchain(chunk_size, chunk_overlap):
+    rng = random.Random(chunk_size * 1000 + chunk_overlap)
+    splitter = FixedSizeTextSplitter(chunk_size, chunk_overlap)
+    for _ in range(25):
+        text = _random_text(rng, rng.randint(0, 300))
+        assert splitter.split_text(text) == _langchain_split(text, chunk_size, chunk_overlap)
+
+def test_parity_edge_cases():
+    splitter = FixedSizeTextSplitter(10, 4)
+    for text in ["", " ", "     ", "a", " a ", "averyveryverylongword", "a  b   c", "    x"]:
+        assert splitter.split_text(text) == _langchain_split(text, 10, 4)
+
+def test_offsets_slice_normalized_text():
+    splitter = FixedSizeTextSplitter(10, 4)
+    text = splitter.normalize("one  two   three four five six")
+    windows = splitter.split_offsets(text)
+    assert [text[start:end] for start, end in windows] == splitter.split_text(text)
+    assert all(0 <= start < end <= len(text) for start, end in windows)
+
+def test_empty_separator():
+    with pytest.raises(ValueError):
+        FixedSizeTextSplitter(10, 0, '')
+
+def test_fixed_size_chunker_parity():
+    chunker = FixedSizeChunker(chunk_size=25, chunk_overlap=20)
+    text = "Line 1\nLine  2\tLine 3 " * 50
+    expected = _langchain_split(chunker._clean_data(text), chunker.chunk_size, chunker.chunk_overlap)
+    assert [chunk.data for chunk in chunker.chunk(text)] == expected
+
+def test_hierarchical_chunker_parity():
+    chunker = HieraricalChunker(chunk_size=10, chunk_overlap=20, parent_chunk_size=40)
+    text = "Chapter 1\n    Section 1.1 content for the section.\n" * 30
+    parents = _langchain_split(chunker._clean_data(text), chunker.parent_chunk_size, 0)
+    chunks = chunker.chunk(text)
+    assert [chunk.data for chunk in chunks] == parents
+    for chunk, parent in zip(chunks, parents):
+        expected = _langchain_split(parent, chunker.chunk_size, chunker.chunk_overlap)
+        assert [child.data for child in chunk.child_data] == expected
@@ -0,0 +1,86 @@
+import pickle
+import re
+
+import numpy as np
+
+from flotorch_core.chunking.chunking import ChunkSource
+from flotorch_core.chunking.fixedsize_chunking import FixedSizeChunker
+from flotorch_core.chunking.hierarical_chunking import HieraricalChunker
+from flotorch_core.chunking.tokenizer import BaseTokenizer, TiktokenTokenizer
+
+
+class PieceTokenizer(BaseTokenizer):
+    """Splits every word into pieces of at most three characters, the space joins the next piece."""
+
+    def __init__(self):
+        self.calls = 0
+        self.tokenized = 0
+
+    def token_ends(self, text):
+        self.calls += 1
+        self.tokenized += len(text)
+        return np.array([m.end() for m in re.finditer(r" ?[^ ]{1,3}", text)], dtype=np.int64)
+
+
+def _text():
+    return " ".join(["a", "tokenizer", "sized", "chunk", "extraordinarily", "of", "text"] * 40)
+
+def test_tokens_before():
+    ends = np.array([2, 5, 9])
+    assert BaseTokenizer.tokens_before(ends, [0, 2, 6, 9, 20]) == [0, 1, 2, 3, 3]
+
+def test_fixed_chunks_respect_token_budget():
+    tokenizer = PieceTokenizer()
+    chunker = FixedSizeChunker(chunk_size=20, chunk_overlap=20, tokenizer=tokenizer)
+    assert chunker.chunk_size == 20
+    assert chunker.chunk_overlap == 4
+
+    chunks = chunker.chunk(_text())
+    assert len(chunks) > 1
+    assert all(tokenizer.count(chunk.data) <= 20 for chunk in chunks)
+    # Windows are filled up to the budget
+    assert max(tokenizer.count(chunk.data) for chunk in chunks) >= 18
+
+def test_fixed_chunks_overlap_in_tokens():
+    tokenizer = PieceTokenizer()
+    chunker = FixedSizeChunker(chunk_size=20, chunk_overlap=25, tokenizer=tokenizer)
+    chunks = chunker.chunk(_text())
+    overlaps = []
+    for current, following in zip(chunks, chunks[1:]):
+        shared = current.source.text[following.start:current.end] if following.start < current.end else ""
+        overlaps.append(tokenizer.count(shared))
+    assert all(overlap <= chunker.chunk_overlap for overlap in overlaps)
+    assert any(overlap > 0 for overlap in overlaps)
+
+def test_chunk_source_tokenizes_only_its_range():
+    tokenizer = PieceTokenizer()
+    chunker = FixedSizeChunker(chunk_size=20, chunk_overlap=20, tokenizer=tokenizer)
+    text = chunker.prepare(_text())
+    start = text.index(" ", 500)
+    end = text.index(" ", 900)
+
+    chunks = chunker.chunk_source(ChunkSource(text), start, end)
+    assert tokenizer.tokenized <= end - start
+    # The same windows as chunking the range on its own
+    assert [chunk.data for chunk in chunks] == [chunk.data for chunk in chunker.chunk(text[start + 1:end])]
+
+def test_hierarchical_tokenizes_document_once():
+    tokenizer = PieceTokenizer()
+    chunker = HieraricalChunker(chunk_size=10, chunk_overlap=20, parent_chunk_size=40, tokenizer=tokenizer)
+    chunks = chunker.chunk(_text())
+
+    assert tokenizer.calls == 1
+    for parent in chunks:
+        assert tokenizer.count(parent.data) <= 40
+        assert all(tokenizer.count(child.data) <= 10 for child in parent.child_data)
+
+def test_without_tokenizer_sizes_in_characters():
+    chunker = FixedSizeChunker(chunk_size=20, chunk_overlap=20)
+    assert chunker.chunk_size == 80
+
+def test_tiktoken_tokenizer_pickles_without_encoding():
+    tokenizer = TiktokenTokenizer("cl100k_base")
+    tokenizer._encoding = object()
+    restored = pickle.loads(pickle.dumps(tokenizer))
+    assert restored.encoding_name == "cl100k_base"
+    assert restored._encoding is None
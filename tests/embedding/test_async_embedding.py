@@ -0,0 +1,165 @@
+import asyncio
+import io
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from flotorch_core.chunking.chunking import Chunk
+from flotorch_core.embedding.cohere_embedding import CohereEmbedding
+from flotorch_core.embedding.embedding import BaseEmbedding, EmbeddingMetadata, Embeddings
+from flotorch_core.embedding.gateway_embedding import GatewayEmbedding
+from flotorch_core.embedding.llama_embedding import LlamaEmbedding
+from flotorch_core.embedding.titanv2_embedding import TitanV2Embedding
+
+
+class AsyncCountingEmbedding(BaseEmbedding):
+    """Native async backend that records how many requests are awaited at once."""
+    async_max_in_flight = 8
+
+    def __init__(self, fail_on=None):
+        super().__init__("async", "local")
+        self.fail_on = fail_on
+        self.in_flight = 0
+        self.peak = 0
+
+    def _prepare_chunk(self, chunk):
+        return {"text": chunk.data}
+
+    def embed(self, chunk):
+        return Embeddings([float(len(chunk.data))], EmbeddingMetadata(1, 1), chunk.data)
+
+    async def _aembed_pack(self, chunks):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            index = int(chunks[0].data.split()[-1])
+            await asyncio.sleep(0.001 * (10 - index % 10))
+            if chunks[0].data == self.fail_on:
+                raise RuntimeError(f"failed on {chunks[0].data}")
+            return [Embeddings([float(index)], EmbeddingMetadata(1, 1), chunks[0].data)]
+        finally:
+            self.in_flight -= 1
+
+
+class ThreadedEmbedding(AsyncCountingEmbedding):
+    _aembed_pack = BaseEmbedding._aembed_pack
+
+    def embed(self, chunk):
+        return Embeddings([float(chunk.data.split()[-1])], EmbeddingMetadata(1, 1), chunk.data)
+
+
+def test_aembed_list_preserves_order_and_limits_concurrency():
+    embedder = AsyncCountingEmbedding()
+    parent = Chunk("parent 0")
+    parent.add_child(Chunk("child 1"))
+    parent.add_child(Chunk("child 2"))
+    chunks = [parent] + [Chunk(f"chunk {i}") for i in range(3, 100)]
+
+    embedding_list = asyncio.run(embedder.aembed_list(chunks))
+
+    assert [e.embeddings[0] for e in embedding_list.embeddings] == [float(i) for i in range(1, 100)]
+    assert [(e.parent_id, e.text) for e in embedding_list.embeddings[:2]] == [(parent.id, "child 1"), (parent.id, "child 2")]
+    assert embedding_list.parents == {parent.id: "parent 0"}
+    assert embedding_list.metadata.input_tokens == 99
+    assert embedder.peak == 8
+
+
+def test_aembed_batch_raises_first_error():
+    embedder = AsyncCountingEmbedding(fail_on="chunk 3")
+    with pytest.raises(RuntimeError, match="failed on chunk 3"):
+        asyncio.run(embedder.aembed_batch([Chunk(f"chunk {i}") for i in range(50)]))
+
+
+def test_blocking_backends_run_in_threads():
+    embedder = ThreadedEmbedding()
+    embeddings = asyncio.run(embedder.aembed_batch([Chunk(f"chunk {i}") for i in range(5)]))
+    assert [e.embeddings[0] for e in embeddings] == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert asyncio.run(embedder.aembed(Chunk("chunk 7"))).embeddings == [7.0]
+
+
+def test_gateway_uses_async_openai():
+    embedder = GatewayEmbedding("text-embedding-3-small", "http://localhost:9999", "key")
+    response = SimpleNamespace(data=[SimpleNamespace(index=0, embedding=[1.0])],
+                               usage=SimpleNamespace(total_tokens=4))
+    with patch.object(embedder.async_client.embeddings, "create", new=AsyncMock(return_value=response)) as create:
+        embedding = asyncio.run(embedder.aembed(Chunk("one")))
+
+    create.assert_awaited_once_with(input=["one"], model="text-embedding-3-small")
+    assert embedding.embeddings == [1.0]
+    assert embedding.metadata.input_tokens == 4
+
+
+def test_llama_uses_async_client():
+    embedder = LlamaEmbedding("llama2", None)
+    response = {"embeddings": [[1.0], [2.0]], "prompt_eval_count": 4, "total_duration": 0}
+    embedder.max_batch_size = 2
+    with patch.object(embedder.async_client, "embed", new=AsyncMock(return_value=response)) as embed:
+        embeddings = asyncio.run(embedder.aembed_batch([Chunk("one"), Chunk("two")]))
+
+    embed.assert_awaited_once_with(model="llama2", input=["one", "two"])
+    assert [e.embeddings for e in embeddings] == [[1.0], [2.0]]
+
+
+class FakeStream:
+    def __init__(self, body):
+        self.body = body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def read(self):
+        return self.body
+
+
+class FakeAioClient:
+    def __init__(self, body):
+        self.payloads = []
+        self.body = body
+
+    async def invoke_model(self, **kwargs):
+        self.payloads.append(json.loads(kwargs["body"]))
+        return {
+            "ResponseMetadata": {"HTTPHeaders": {"x-amzn-bedrock-input-token-count": "6",
+                                                 "x-amzn-bedrock-invocation-latency": "20"}},
+            "body": FakeStream(json.dumps(self.body).encode("utf-8")),
+        }
+
+
+def _with_client(embedder, client, coroutine_function):
+    async def run():
+        embedder._async_client.set(client)
+        return await coroutine_function()
+    return asyncio.run(run())
+
+
+def test_bedrock_titan_uses_async_client():
+    embedder = TitanV2Embedding("amazon.titan-embed-text-v2:0", "us-east-1")
+    client = FakeAioClient({"embedding": [0.5, 0.5]})
+    embeddings = _with_client(embedder, client, lambda: embedder.aembed_batch([Chunk("one"), Chunk("two")]))
+
+    assert [payload["inputText"] for payload in client.payloads] == ["one", "two"]
+    assert [e.embeddings for e in embeddings] == [[0.5, 0.5], [0.5, 0.5]]
+    assert embeddings[0].metadata.input_tokens == "6"
+
+
+def test_bedrock_cohere_sends_packed_async_request():
+    embedder = CohereEmbedding("cohere.embed-english-v3", "us-east-1")
+    client = FakeAioClient({"embeddings": [[0.1], [0.2]]})
+    embeddings = _with_client(embedder, client, lambda: embedder.aembed_batch([Chunk("one"), Chunk("three")]))
+
+    assert client.payloads == [{"texts": ["one", "three"], "input_type": "search_document"}]
+    assert [e.embeddings for e in embeddings] == [[0.1], [0.2]]
+    assert sum(e.metadata.input_tokens for e in embeddings) == 6
+
+
+def test_bedrock_without_async_client_falls_back_to_threads():
+    embedder = TitanV2Embedding("amazon.titan-embed-text-v2:0", "us-east-1")
+    response = {"ResponseMetadata": {}, "body": io.BytesIO(json.dumps({"embedding": [1.0]}).encode("utf-8"))}
+    with patch.dict("sys.modules", {"aiobotocore": None, "aiobotocore.config": None, "aiobotocore.session": None}), \
+            patch.object(embedder.client, "invoke_model", return_value=response):
+        embedding = asyncio.run(embedder.aembed(Chunk("one")))
+    assert embedding.embeddings == [1.0]
@@ -0,0 +1,152 @@
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+from flotorch_core.chunking.chunking import Chunk
+from flotorch_core.embedding.cached_embedding import CachedEmbedding
+from flotorch_core.embedding.embedding import BaseEmbedding, EmbeddingMetadata, Embeddings
+
+
+class CountingEmbedding(BaseEmbedding):
+    max_batch_size = 4
+
+    def __init__(self, model_id="counting", dimensions=4):
+        super().__init__(model_id, "local", dimensions)
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def _prepare_chunk(self, chunk):
+        return {"text": chunk.data}
+
+    def embed(self, chunk):
+        with self.lock:
+            self.calls.append(chunk.data)
+        value = float(len(chunk.data))
+        return Embeddings([value] * self.dimension, EmbeddingMetadata(3, 5), chunk.data)
+
+
+def _chunks(*texts):
+    return [Chunk(text) for text in texts]
+
+
+def test_repeated_texts_are_embedded_once():
+    base = CountingEmbedding()
+    cached = CachedEmbedding(base)
+
+    first = cached.embed_list(_chunks("a", "bb", "a"))
+    second = cached.embed_list(_chunks("bb", "ccc", "a"))
+
+    assert base.calls == ["a", "bb", "ccc"]
+    assert [e.embeddings[0] for e in first.embeddings + second.embeddings] == [1.0, 2.0, 1.0, 2.0, 3.0, 1.0]
+    assert first.metadata.input_tokens == 6
+    assert second.metadata.input_tokens == 3
+    assert (cached.stats.memory_hits, cached.stats.misses) == (3, 3)
+    assert cached.stats.hit_ratio == 0.5
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cached = CachedEmbedding(CountingEmbedding(), path)
+    cached.embed_list(_chunks("a", "bb"))
+    cached.close()
+
+    base = CountingEmbedding()
+    reopened = CachedEmbedding(base, path)
+    embedding = reopened.embed(Chunk("bb"))
+
+    assert base.calls == []
+    assert embedding.embeddings == [2.0] * 4
+    assert reopened.stats.disk_hits == 1
+    assert reopened.embed(Chunk("bb")) is not None
+    assert reopened.stats.memory_hits == 1
+
+
+@pytest.mark.parametrize("changed", [
+    {"model_id": "other"},
+    {"dimensions": 8},
+])
+def test_key_includes_model_settings(tmp_path, changed):
+    path = str(tmp_path / "cache.sqlite")
+    CachedEmbedding(CountingEmbedding(), path).embed(Chunk("a"))
+    base = CountingEmbedding(**changed)
+    CachedEmbedding(base, path).embed(Chunk("a"))
+    assert base.calls == ["a"]
+
+
+def test_memory_tier_evicts_least_recently_used():
+    base = CountingEmbedding()
+    # Room for two 4 x float32 vectors
+    cached = CachedEmbedding(base, max_memory_bytes=32)
+    cached.embed_list(_chunks("a", "bb"))
+    cached.embed(Chunk("a"))
+    cached.embed(Chunk("ccc"))
+    cached.embed_list(_chunks("a", "bb"))
+
+    assert base.calls == ["a", "bb", "ccc", "bb"]
+    assert cached.stats.memory_evictions == 2
+
+
+def test_memory_tier_does_not_keep_batch_matrices_alive():
+    from flotorch_core.embedding.hashing_embedding import HashingEmbedding
+    base = HashingEmbedding(dimensions=8)
+    # The vectors are rows of the matrix of their pack
+    base.return_arrays = True
+    cached = CachedEmbedding(base)
+    cached.embed_list(_chunks("a", "bb", "ccc"))
+
+    vectors = list(cached._memory._vectors.values())
+    assert len(vectors) == 3
+    assert all(vector.base is None for vector in vectors)
+    assert cached._memory.bytes == sum(vector.nbytes for vector in vectors) == 96
+
+
+def test_disk_tier_evicts_by_bytes(tmp_path):
+    base = CountingEmbedding()
+    cached = CachedEmbedding(base, str(tmp_path / "cache.sqlite"), max_memory_bytes=0, max_disk_bytes=48)
+    for text in ["a", "bb", "ccc", "dddd"]:
+        cached.embed(Chunk(text))
+    assert cached.stats.disk_evictions == 1
+    assert cached._disk.bytes == 48
+
+    cached.embed_list(_chunks("bb", "ccc", "dddd"))
+    assert base.calls == ["a", "bb", "ccc", "dddd"]
+    cached.embed(Chunk("a"))
+    assert base.calls[-1] == "a"
+
+
+def test_disk_tier_keeps_part_of_a_batch_larger_than_the_space_left(tmp_path):
+    base = CountingEmbedding()
+    cached = CachedEmbedding(base, str(tmp_path / "cache.sqlite"), max_memory_bytes=0, max_disk_bytes=48)
+    cached.embed(Chunk("a"))
+    # Five 16 byte vectors written together into room for three
+    cached.embed_list(_chunks("b", "cc", "ddd", "eeee", "fffff"))
+
+    assert cached._disk.bytes == 48
+    assert cached._disk._connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0] == 3
+    assert cached.stats.disk_evictions == 3
+    cached.embed_list(_chunks("ddd", "eeee", "fffff"))
+    assert base.calls == ["a", "b", "cc", "ddd", "eeee", "fffff"]
+
+
+def test_vectors_are_stored_as_float32(tmp_path):
+    cached = CachedEmbedding(CountingEmbedding(), str(tmp_path / "cache.sqlite"))
+    cached.embed(Chunk("a"))
+    blob, size = cached._disk._connection.execute("SELECT vector, size FROM embeddings").fetchone()
+    assert size == 16
+    assert np.frombuffer(blob, dtype=np.float32).tolist() == [1.0] * 4
+
+
+def test_concurrent_and_async_paths_only_embed_misses():
+    base = CountingEmbedding()
+    cached = CachedEmbedding(base)
+    cached.max_in_flight = 3
+    assert base.max_in_flight == 3
+
+    chunks = _chunks(*[f"text {i}" for i in range(20)])
+    cached.embed_batch(chunks[:10])
+    embeddings = asyncio.run(cached.aembed_batch(chunks))
+
+    assert sorted(base.calls) == sorted(chunk.data for chunk in chunks)
+    assert [e.text for e in embeddings] == [chunk.data for chunk in chunks]
+    assert cached.stats.memory_hits == 10
@@ -0,0 +1,107 @@
+import threading
+import time
+
+import pytest
+from flotorch_core.chunking.chunking import Chunk
+from flotorch_core.embedding.embedding import BaseEmbedding, EmbeddingMetadata, Embeddings
+from flotorch_core.embedding.titanv2_embedding import TitanV2Embedding
+
+
+class SlowEmbedding(BaseEmbedding):
+    """Sleeps longer for earlier chunks so that requests complete out of order."""
+
+    def __init__(self, fail_on=None):
+        super().__init__("slow", "local")
+        self.fail_on = fail_on
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def _prepare_chunk(self, chunk):
+        return {"text": chunk.data}
+
+    def embed(self, chunk):
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            self.calls.append(chunk.data)
+        try:
+            index = int(chunk.data.split()[-1])
+            time.sleep(0.002 * (20 - index % 20))
+            if chunk.data == self.fail_on:
+                raise RuntimeError(f"failed on {chunk.data}")
+            return Embeddings([float(index)], EmbeddingMetadata(1, 1), chunk.data)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+def test_concurrent_embed_list_preserves_order():
+    embedder = SlowEmbedding()
+    embedder.max_in_flight = 4
+    parent = Chunk("parent 0")
+    parent.add_child(Chunk("child 1"))
+    parent.add_child(Chunk("child 2"))
+    chunks = [parent] + [Chunk(f"chunk {i}") for i in range(3, 40)]
+
+    embedding_list = embedder.embed_list(chunks)
+
+    assert [e.embeddings[0] for e in embedding_list.embeddings] == [float(i) for i in range(1, 40)]
+    assert [(e.parent_id, e.text) for e in embedding_list.embeddings[:2]] == [(parent.id, "child 1"), (parent.id, "child 2")]
+    assert embedding_list.parents == {parent.id: "parent 0"}
+    assert embedding_list.embeddings[2].id == chunks[1].id
+    assert embedding_list.metadata.input_tokens == 39
+    assert 1 < embedder.peak <= 4
+
+
+def test_concurrent_embed_list_raises_first_error():
+    embedder = SlowEmbedding(fail_on="chunk 5")
+    embedder.max_in_flight = 2
+    chunks = [Chunk(f"chunk {i}") for i in range(200)]
+
+    with pytest.raises(RuntimeError, match="failed on chunk 5"):
+        embedder.embed_list(chunks)
+    # Requests queued behind the failure are dropped
+    time.sleep(0.1)
+    assert len(embedder.calls) < len(chunks)
+
+
+def test_sequential_by_default():
+    embedder = SlowEmbedding()
+    embedder.embed_list([Chunk(f"chunk {i}") for i in range(5)])
+    assert embedder.peak == 1
+    assert embedder._executor is None
+
+
+def test_close_stops_the_worker_threads():
+    # Threads left by the instances of other tests are not counted
+    others = set(threading.enumerate())
+
+    def workers():
+        return [thread for thread in threading.enumerate()
+                if thread.name.startswith("SlowEmbedding-embed") and thread not in others]
+
+    with SlowEmbedding() as embedder:
+        embedder.max_in_flight = 3
+        embedder.embed_list([Chunk(f"chunk {i}") for i in range(6)])
+        assert workers()
+    assert embedder._executor is None
+    assert not workers()
+
+    # A closed instance starts a new pool when it is used again
+    assert len(embedder.embed_list([Chunk(f"chunk {i}") for i in range(6)])) == 6
+    embedder.close()
+    assert not workers()
+
+
+def test_invalid_max_in_flight():
+    with pytest.raises(ValueError, match="max_in_flight must be positive"):
+        SlowEmbedding().max_in_flight = 0
+
+
+def test_bedrock_pool_matches_max_in_flight():
+    embedder = TitanV2Embedding("amazon.titan-embed-text-v2:0", "us-east-1")
+    assert embedder.client.meta.config.max_pool_connections == 10
+    embedder.max_in_flight = 32
+    assert embedder.client.meta.config.max_pool_connections == 32
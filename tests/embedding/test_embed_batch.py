@@ -0,0 +1,114 @@
+import io
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from flotorch_core.chunking.chunking import Chunk
+from flotorch_core.embedding.cohere_embedding import CohereEmbedding
+from flotorch_core.embedding.embedding import BaseEmbedding, EmbeddingMetadata, Embeddings
+from flotorch_core.embedding.gateway_embedding import GatewayEmbedding
+from flotorch_core.embedding.llama_embedding import LlamaEmbedding
+
+
+class CountingEmbedding(BaseEmbedding):
+    """Packs up to three chunks and 10 estimated tokens per request."""
+    max_batch_size = 3
+    max_batch_tokens = 10
+
+    def __init__(self):
+        super().__init__("counting", "local")
+        self.requests = []
+
+    def _prepare_chunk(self, chunk):
+        return {"text": chunk.data}
+
+    def embed(self, chunk):
+        self.requests.append([chunk.data])
+        return Embeddings([float(len(chunk.data))], EmbeddingMetadata(1, 1), chunk.data)
+
+    def _embed_pack(self, chunks):
+        self.requests.append([chunk.data for chunk in chunks])
+        metadata = EmbeddingMetadata(len(chunks), 10).split([len(chunk.data) for chunk in chunks])
+        return [Embeddings([float(len(chunk.data))], item, chunk.data) for chunk, item in zip(chunks, metadata)]
+
+
+def _bedrock_response(body, tokens, latency):
+    return {
+        "ResponseMetadata": {"HTTPHeaders": {"x-amzn-bedrock-input-token-count": str(tokens),
+                                             "x-amzn-bedrock-invocation-latency": str(latency)}},
+        "body": io.BytesIO(json.dumps(body).encode("utf-8")),
+    }
+
+
+def test_metadata_split_preserves_totals():
+    parts = EmbeddingMetadata("10", 7).split([1, 1, 1])
+    assert [part.input_tokens for part in parts] == [4, 3, 3]
+    assert sum(part.latency_ms for part in parts) == 7
+    assert [part.input_tokens for part in EmbeddingMetadata(9, 0).split([0, 0, 0])] == [3, 3, 3]
+
+
+def test_embed_batch_packs_by_size_and_tokens():
+    embedder = CountingEmbedding()
+    chunks = [Chunk("a"), Chunk("b"), Chunk("c"), Chunk("d"), Chunk("x" * 36), Chunk("e")]
+    embeddings = embedder.embed_batch(chunks)
+
+    # "x" * 36 is estimated at 10 tokens, it cannot share a request with any other chunk
+    assert embedder.requests == [["a", "b", "c"], ["d"], ["x" * 36], ["e"]]
+    assert [e.text for e in embeddings] == [chunk.data for chunk in chunks]
+
+
+def test_embed_list_routes_children_through_batches():
+    embedder = CountingEmbedding()
+    parent = Chunk("parent text")
+    parent.add_child(Chunk("p1"))
+    parent.add_child(Chunk("p2"))
+    flat = Chunk("flat")
+    embedding_list = embedder.embed_list([parent, flat])
+
+    assert embedder.requests == [["p1", "p2", "flat"]]
+    assert [(e.id, e.parent_id, e.text) for e in embedding_list.embeddings] == \
+        [(parent.id, parent.id, "p1"), (parent.id, parent.id, "p2"), (flat.id, None, "flat")]
+    assert embedding_list.parents == {parent.id: "parent text"}
+    assert embedding_list.metadata.input_tokens == 3
+    assert embedding_list.metadata.latency_ms == 10
+
+
+def test_cohere_sends_packed_texts():
+    embedder = CohereEmbedding("cohere.embed-english-v3", "us-east-1")
+    chunks = [Chunk("first text"), Chunk("second text here")]
+    response = _bedrock_response({"embeddings": [[0.1], [0.2]]}, tokens=12, latency=50)
+    with patch.object(embedder.client, "invoke_model", return_value=response) as invoke:
+        embeddings = embedder.embed_batch(chunks)
+
+    assert invoke.call_count == 1
+    assert json.loads(invoke.call_args.kwargs["body"])["texts"] == ["first text", "second text here"]
+    assert [e.embeddings for e in embeddings] == [[0.1], [0.2]]
+    assert sum(e.metadata.input_tokens for e in embeddings) == 12
+    assert sum(e.metadata.latency_ms for e in embeddings) == 50
+    assert CohereEmbedding.max_batch_size == 96
+
+
+def test_gateway_sends_list_input_and_orders_by_index():
+    embedder = GatewayEmbedding("text-embedding-3-small", "http://localhost:9999", "key")
+    response = SimpleNamespace(
+        data=[SimpleNamespace(index=1, embedding=[2.0]), SimpleNamespace(index=0, embedding=[1.0])],
+        usage=SimpleNamespace(total_tokens=9),
+    )
+    with patch.object(embedder.client.embeddings, "create", return_value=response) as create:
+        embeddings = embedder.embed_batch([Chunk("one"), Chunk("two")])
+
+    assert create.call_args.kwargs["input"] == ["one", "two"]
+    assert [e.embeddings for e in embeddings] == [[1.0], [2.0]]
+    assert sum(e.metadata.input_tokens for e in embeddings) == 9
+
+
+def test_llama_uses_embed_endpoint():
+    embedder = LlamaEmbedding("llama2", None)
+    response = {"embeddings": [[1.0], [2.0]], "prompt_eval_count": 6, "total_duration": 4_000_000}
+    with patch("flotorch_core.embedding.llama_embedding.ollama.embed", return_value=response) as embed:
+        embeddings = embedder.embed_batch([Chunk("one"), Chunk("two")])
+
+    embed.assert_called_once_with(model="llama2", input=["one", "two"])
+    assert [e.text for e in embeddings] == ["one", "two"]
+    assert [e.metadata.input_tokens for e in embeddings] == [3, 3]
+    assert sum(e.metadata.latency_ms for e in embeddings) == 4
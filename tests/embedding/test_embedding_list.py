@@ -0,0 +1,102 @@
+import io
+import json
+
+import numpy as np
+import pytest
+from flotorch_core.embedding.embedding import EmbeddingList, EmbeddingMetadata, Embeddings
+
+
+def _embedding_list(count, dimension=4):
+    embedding_list = EmbeddingList()
+    for i in range(count):
+        embedding = Embeddings([float(i)] * dimension, EmbeddingMetadata(i, 2 * i), f"text {i}!")
+        embedding.id = f"id-{i}"
+        embedding_list.append(embedding)
+    return embedding_list
+
+
+def test_rows_are_stored_in_one_float32_matrix():
+    embedding_list = _embedding_list(100)
+    assert embedding_list.vectors.dtype == np.float32
+    assert embedding_list.vectors.shape == (100, 4)
+    assert embedding_list.vectors.flags["C_CONTIGUOUS"]
+    assert embedding_list.ids[:2] == ["id-0", "id-1"]
+    assert embedding_list.metadata.input_tokens == sum(range(100))
+
+
+def test_iteration_api():
+    embedding_list = _embedding_list(3)
+    assert len(embedding_list) == 3
+    assert [e.id for e in embedding_list] == ["id-0", "id-1", "id-2"]
+    last = embedding_list.embeddings[-1]
+    assert (last.text, last.metadata.input_tokens, last.metadata.latency_ms) == ("text 2!", 2, 4)
+    assert np.shares_memory(last.embeddings, embedding_list.vectors)
+    assert last.to_json() == {"vectors": [2.0] * 4, "text": "text 2",
+                              "metadata": {"inputTokens": 2, "latencyMs": 4}}
+
+
+def test_dimension_mismatch():
+    embedding_list = _embedding_list(1)
+    with pytest.raises(ValueError, match="Expected an embedding of dimension 4, got 2"):
+        embedding_list.append(Embeddings([1.0, 2.0], EmbeddingMetadata(0, 0), "text"))
+
+
+def test_append_without_counting_metadata():
+    embedding_list = _embedding_list(2)
+    embedding_list.append(embedding_list[1], count_metadata=False)
+    assert len(embedding_list) == 3
+    assert embedding_list.metadata.input_tokens == 1
+
+
+def test_rows_write_through_to_the_list():
+    embedding_list = _embedding_list(3)
+    embedding_list.embeddings[1].id = "renamed"
+    embedding_list[2].embeddings = [9.0] * 4
+    embedding_list.embeddings[0].metadata = EmbeddingMetadata(7, 8)
+    assert embedding_list.ids == ["id-0", "renamed", "id-2"]
+    assert embedding_list.vectors[2].tolist() == [9.0] * 4
+    assert (embedding_list.input_tokens[0], embedding_list.latency_ms[0]) == (7, 8)
+
+
+def test_embeddings_is_a_mutable_sequence_of_the_rows():
+    embedding_list = _embedding_list(3)
+    added = Embeddings([5.0] * 4, EmbeddingMetadata(5, 10), "text 5")
+    added.id = "id-5"
+    embedding_list.embeddings.append(added)
+    embedding_list.embeddings.insert(0, added)
+    del embedding_list.embeddings[2]
+    assert embedding_list.ids == ["id-5", "id-0", "id-2", "id-5"]
+    assert embedding_list.vectors[:, 0].tolist() == [5.0, 0.0, 2.0, 5.0]
+    assert embedding_list.input_tokens == [5, 0, 2, 5]
+    popped = embedding_list.embeddings.pop()
+    assert (popped.id, popped.embeddings.tolist(), len(embedding_list)) == ("id-5", [5.0] * 4, 3)
+    embedding_list.embeddings[0] = popped
+    assert [e.text for e in embedding_list.embeddings[:2]] == ["text 5", "text 0!"]
+
+
+def test_save_npy():
+    embedding_list = _embedding_list(5)
+    buffer = io.BytesIO()
+    embedding_list.save_npy(buffer)
+    buffer.seek(0)
+    assert np.array_equal(np.load(buffer), embedding_list.vectors)
+
+
+def test_bulk_bodies():
+    bodies = list(_embedding_list(5).bulk_bodies("index", batch_size=2))
+    assert [len(body) for body in bodies] == [4, 4, 2]
+    assert bodies[0][:2] == [{"index": {"_index": "index", "_id": "id-0"}},
+                             {"chunk_id": "id-0", "vectors": [0.0] * 4, "text": "text 0",
+                              "metadata": {"inputTokens": 0, "latencyMs": 0}}]
+    json.dumps(bodies)
+
+
+def test_to_arrow():
+    pa = pytest.importorskip("pyarrow", exc_type=ImportError)
+    embedding_list = _embedding_list(3)
+    table = embedding_list.to_arrow()
+    assert table.column_names == ["id", "text", "parent_id", "child_id", "vector",
+                                  "input_tokens", "latency_ms"]
+    vectors = table.column("vector").combine_chunks().flatten().to_numpy()
+    assert np.shares_memory(vectors, embedding_list.vectors)
+    assert table.column("vector").type == pa.list_(pa.float32(), 4)
@@ -0,0 +1,33 @@
+import subprocess
+import sys
+
+import pytest
+from flotorch_core.embedding.embedding_registry import EmbeddingRegistry, _MODEL_MODULES, embedding_registry
+
+
+@pytest.mark.parametrize("model_id", sorted(_MODEL_MODULES))
+def test_model_modules_register_their_models(model_id):
+    embedding_class = embedding_registry.get_model(model_id)
+    assert embedding_class.__module__ == _MODEL_MODULES[model_id]
+
+
+def test_bedrock_lookup_does_not_import_other_backends():
+    code = (
+        "import sys\n"
+        "from flotorch_core.embedding.embedding_registry import embedding_registry\n"
+        "assert 'boto3' not in sys.modules\n"
+        "embedding_registry.get_model('amazon.titan-embed-text-v2:0')\n"
+        "print(sorted(m for m in ('sagemaker', 'ollama', 'openai') if m in sys.modules))\n"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "[]"
+
+
+def test_unknown_model_raises():
+    registry = EmbeddingRegistry({"lazy": "flotorch_core.embedding.embedding"})
+    with pytest.raises(ValueError, match="not found"):
+        registry.get_model("missing")
+    # A module that does not register the model ID does not resolve it either
+    with pytest.raises(ValueError, match="not found"):
+        registry.get_model("lazy")
+    assert registry.model_ids() == ["lazy"]
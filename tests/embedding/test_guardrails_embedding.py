@@ -0,0 +1,156 @@
+import asyncio
+import threading
+
+import pytest
+from flotorch_core.chunking.chunking import Chunk
+from flotorch_core.embedding.embedding import BaseEmbedding, EmbeddingMetadata, Embeddings
+from flotorch_core.embedding.guardrails.guardrails_embedding import GuardrailsEmbedding
+from flotorch_core.guardrails.guardrails import BedrockGuardrail
+from flotorch_core.guardrails.verdict_cache import GuardrailVerdictCache
+
+
+class FakeRuntimeClient:
+    """Intervenes on every request with a text containing 'bad'."""
+
+    def __init__(self):
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def apply_guardrail(self, **params):
+        texts = [block["text"]["text"] for block in params["content"]]
+        with self.lock:
+            self.requests.append(texts)
+        intervened = any("bad" in text for text in texts)
+        return {"action": "GUARDRAIL_INTERVENED" if intervened else "NONE"}
+
+
+class RecordingEmbedding(BaseEmbedding):
+    def __init__(self):
+        super().__init__("recording", "local", 1)
+        self.embedded = []
+        self.lock = threading.Lock()
+
+    def _prepare_chunk(self, chunk):
+        return {"text": chunk.data}
+
+    def embed(self, chunk):
+        return self._embed_pack([chunk])[0]
+
+    def _embed_pack(self, chunks):
+        with self.lock:
+            self.embedded.extend(chunk.data for chunk in chunks)
+        metadata = EmbeddingMetadata(len(chunks), 1).split([1] * len(chunks))
+        return [Embeddings([float(len(chunk.data))], part, chunk.data) for chunk, part in zip(chunks, metadata)]
+
+
+def make_guardrail(version="1"):
+    return BedrockGuardrail("guardrail", version, runtime_client=FakeRuntimeClient())
+
+
+def test_screen_packs_texts_and_isolates_blocked_ones():
+    guardrail = make_guardrail()
+    texts = [f"text {i}" for i in range(16)]
+    texts[5] = "bad text"
+
+    assert guardrail.screen(texts) == [i == 5 for i in range(16)]
+    # One pack, then halves down to the blocked text: 1 + 2 * log2(16)
+    assert len(guardrail.runtime_client.requests) == 9
+    assert guardrail.runtime_client.requests[0] == texts
+
+
+def test_screen_respects_pack_limits():
+    guardrail = make_guardrail()
+    guardrail.max_batch_items = 4
+    guardrail.max_batch_chars = 20
+
+    assert guardrail.screen(["0123456789"] * 3 + ["x"] * 6) == [False] * 9
+    assert [len(request) for request in guardrail.runtime_client.requests] == [2, 4, 3]
+
+
+def test_embed_list_drops_blocked_chunks_in_order():
+    base = RecordingEmbedding()
+    embedder = GuardrailsEmbedding(base, make_guardrail(), screening_batch_size=3, screening_concurrency=4)
+    chunks = [Chunk(f"bad {i}" if i % 4 == 0 else f"chunk {i}") for i in range(20)]
+
+    embedding_list = embedder.embed_list(chunks)
+
+    assert embedding_list.texts == [f"chunk {i}" for i in range(20) if i % 4]
+    assert sorted(base.embedded) == sorted(embedding_list.texts)
+
+
+def test_embed_and_embed_batch_screen_chunks():
+    embedder = GuardrailsEmbedding(RecordingEmbedding(), make_guardrail())
+
+    assert embedder.embed(Chunk("bad")) is None
+    assert embedder.embed(Chunk("good")).embeddings == [4.0]
+    embeddings = embedder.embed_batch([Chunk("a"), Chunk("bad"), Chunk("abc")])
+    assert embeddings[1] is None
+    assert [embeddings[0].embeddings, embeddings[2].embeddings] == [[1.0], [3.0]]
+
+
+def test_verdicts_are_cached_per_guardrail_version(tmp_path):
+    path = str(tmp_path / "verdicts.db")
+    chunks = [Chunk("a"), Chunk("bad"), Chunk("a"), Chunk("b")]
+    guardrail = make_guardrail()
+    embedder = GuardrailsEmbedding(RecordingEmbedding(), guardrail, GuardrailVerdictCache(path))
+
+    assert embedder.embed_list(chunks).texts == ["a", "a", "b"]
+    screened = [text for request in guardrail.runtime_client.requests for text in request]
+    assert sorted(set(screened)) == ["a", "b", "bad"]
+    assert screened.count("a") <= 2
+    requests = len(guardrail.runtime_client.requests)
+    assert embedder.embed_list(chunks).texts == ["a", "a", "b"]
+    assert len(guardrail.runtime_client.requests) == requests
+    embedder.verdict_cache.close()
+
+    # Verdicts survive the process in the SQLite file
+    reopened = GuardrailsEmbedding(RecordingEmbedding(), guardrail, GuardrailVerdictCache(path))
+    assert reopened.embed_list(chunks).texts == ["a", "a", "b"]
+    assert len(guardrail.runtime_client.requests) == requests
+
+    # Another version of the guardrail screens again
+    other = make_guardrail("2")
+    GuardrailsEmbedding(RecordingEmbedding(), other, reopened.verdict_cache).embed_list(chunks)
+    assert other.runtime_client.requests
+    reopened.verdict_cache.close()
+
+
+def test_embed_list_raises_screening_errors():
+    guardrail = make_guardrail()
+
+    def fail(**params):
+        raise RuntimeError("throttled")
+
+    guardrail.runtime_client.apply_guardrail = fail
+    embedder = GuardrailsEmbedding(RecordingEmbedding(), guardrail, screening_batch_size=1)
+    with pytest.raises(RuntimeError, match="throttled"):
+        embedder.embed_list([Chunk("a"), Chunk("b")])
+
+
+def test_async_path_drops_blocked_chunks():
+    embedder = GuardrailsEmbedding(RecordingEmbedding(), make_guardrail(), screening_batch_size=2)
+    chunks = [Chunk("a", chunk_id="a"), Chunk("bad", chunk_id="b"), Chunk("abc", chunk_id="c")]
+
+    embedding_list = asyncio.run(embedder.aembed_list(chunks))
+    assert embedding_list.ids == ["a", "c"]
+    assert embedding_list.texts == ["a", "abc"]
+
+    embeddings = asyncio.run(embedder.aembed_batch(chunks))
+    assert embeddings[1] is None
+    assert [embeddings[0].text, embeddings[2].text] == ["a", "abc"]
+    assert asyncio.run(embedder.aembed(Chunk("bad"))) is None
+    assert asyncio.run(embedder.aembed(Chunk("good"))).embeddings == [4.0]
+
+
+def test_async_path_packs_screening_and_uses_the_cache():
+    guardrail = make_guardrail()
+    embedder = GuardrailsEmbedding(RecordingEmbedding(), guardrail, screening_batch_size=4, screening_concurrency=2)
+    chunks = [Chunk(f"chunk {i}") for i in range(12)]
+
+    assert asyncio.run(embedder.aembed_list(chunks)).texts == [chunk.data for chunk in chunks]
+    # One packed request per batch of 4
+    assert sorted(len(request) for request in guardrail.runtime_client.requests) == [4, 4, 4]
+
+    asyncio.run(embedder.aembed_list(chunks))
+    asyncio.run(embedder.aembed_batch(chunks))
+    assert len(guardrail.runtime_client.requests) == 3
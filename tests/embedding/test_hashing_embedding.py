@@ -0,0 +1,68 @@
+import asyncio
+
+import numpy as np
+import pytest
+from flotorch_core.chunking.chunking import Chunk
+from flotorch_core.embedding.embedding_registry import embedding_registry
+from flotorch_core.embedding.hashing_embedding import HashingEmbedding
+
+
+def test_registered():
+    assert embedding_registry.get_model("hashing") is HashingEmbedding
+
+
+def test_vectors_are_deterministic_and_normalized():
+    chunks = [Chunk("The quick brown fox"), Chunk("jumps over the lazy dog"), Chunk("")]
+    first = HashingEmbedding("hashing", "local", 64).embed_list(chunks)
+    second = HashingEmbedding("hashing", "local", 64).embed_list(chunks)
+
+    assert first.vectors.shape == (3, 64)
+    assert np.array_equal(first.vectors, second.vectors)
+    assert np.allclose(np.linalg.norm(first.vectors[:2], axis=1), 1.0)
+    # A text without words has a zero vector
+    assert not first.vectors[2].any()
+    assert not np.array_equal(first.vectors, HashingEmbedding(dimensions=64, seed=1).embed_list(chunks).vectors)
+
+
+def test_shared_words_are_similar():
+    embedder = HashingEmbedding(dimensions=1024)
+    query, close, far = (np.asarray(embedder.embed(Chunk(text)).embeddings) for text in
+                         ["vector search index", "Vector index, search!", "pasta recipe with tomatoes"])
+    assert query @ close == pytest.approx(1.0)
+    assert abs(query @ far) < 0.5
+
+
+def test_batch_matches_single_embeddings_and_counts_words():
+    embedder = HashingEmbedding(dimensions=32)
+    chunks = [Chunk(f"word {i} " * (i + 1)) for i in range(10)]
+
+    embeddings = embedder.embed_batch(chunks)
+
+    for chunk, embedding in zip(chunks, embeddings):
+        assert isinstance(embedding.embeddings, list)
+        assert embedding.embeddings == pytest.approx(embedder.embed(chunk).embeddings)
+        assert embedding.metadata.input_tokens == len(chunk.data.split())
+        assert embedding.text == chunk.data
+
+
+def test_unnormalized_vectors_hold_signed_counts():
+    embedder = HashingEmbedding(dimensions=16, normalize=False)
+    vector = np.asarray(embedder.embed(Chunk("a a a")).embeddings)
+    assert np.abs(vector).sum() == 3.0
+
+
+def test_token_cache_starts_over():
+    embedder = HashingEmbedding(dimensions=16)
+    embedder.max_cached_tokens = 4
+    expected = HashingEmbedding(dimensions=16).embed(Chunk("a b c d e f")).embeddings
+    embedder.embed(Chunk("a b c"))
+    assert embedder.embed(Chunk("a b c d e f")).embeddings == expected
+    assert len(embedder._token_codes) <= 6
+
+
+def test_aembed_list():
+    embedder = HashingEmbedding(dimensions=8)
+    embedder.return_arrays = True
+    embedding_list = asyncio.run(embedder.aembed_list([Chunk("one two"), Chunk("three")]))
+    assert embedding_list.vectors.shape == (2, 8)
+    assert embedding_list.metadata.input_tokens == 3
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from flotorch_core.chunking.chunking import Chunk
+from flotorch_core.embedding.embedding import BaseEmbedding, EmbeddingMetadata, Embeddings
+from flotorch_core.embedding.micro_batching_embedding import MicroBatchingEmbedding
+
+
+class RecordingEmbedding(BaseEmbedding):
+    max_batch_size = 16
+
+    def __init__(self, fail=False, delay=0.0):
+        super().__init__("recording", "local")
+        self.fail = fail
+        self.delay = delay
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def _prepare_chunk(self, chunk):
+        return {"text": chunk.data}
+
+    def embed(self, chunk):
+        return self._embed_pack([chunk])[0]
+
+    def _embed_pack(self, chunks):
+        with self.lock:
+            self.requests.append([chunk.data for chunk in chunks])
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("endpoint unavailable")
+        metadata = EmbeddingMetadata(len(chunks), 8).split([1] * len(chunks))
+        return [Embeddings([float(chunk.data)], part, chunk.data) for chunk, part in zip(chunks, metadata)]
+
+
+def test_concurrent_calls_share_requests():
+    base = RecordingEmbedding(delay=0.01)
+    embedder = MicroBatchingEmbedding(base, max_wait_ms=20)
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        embeddings = list(pool.map(lambda i: embedder.embed(Chunk(str(i))), range(32)))
+    embedder.close()
+
+    assert [e.embeddings for e in embeddings] == [[float(i)] for i in range(32)]
+    assert all(e.metadata.input_tokens == 1 for e in embeddings)
+    assert len(base.requests) < 32
+    assert all(len(request) <= 16 for request in base.requests)
+    assert embedder.stats.requests == 32
+    assert embedder.stats.mean_batch_size > 1
+
+
+def test_single_call_waits_at_most_max_wait():
+    embedder = MicroBatchingEmbedding(RecordingEmbedding(), max_wait_ms=30)
+    start = time.monotonic()
+    assert embedder.embed(Chunk("1")).embeddings == [1.0]
+    assert time.monotonic() - start < 0.5
+    embedder.close()
+
+
+def test_batch_items_are_capped():
+    base = RecordingEmbedding()
+    embedder = MicroBatchingEmbedding(base, max_wait_ms=50, max_batch_items=3)
+    futures = [embedder.submit(Chunk(str(i))) for i in range(7)]
+    assert [future.result().embeddings[0] for future in futures] == [float(i) for i in range(7)]
+    embedder.close()
+    assert [len(request) for request in base.requests] == [3, 3, 1]
+
+
+def test_failure_reaches_every_caller_of_the_batch():
+    embedder = MicroBatchingEmbedding(RecordingEmbedding(fail=True), max_wait_ms=20)
+    futures = [embedder.submit(Chunk(str(i))) for i in range(3)]
+    for future in futures:
+        with pytest.raises(RuntimeError, match="endpoint unavailable"):
+            future.result()
+    embedder.close()
+
+
+def test_aembed_batches_concurrent_coroutines():
+    base = RecordingEmbedding()
+    embedder = MicroBatchingEmbedding(base, max_wait_ms=20)
+
+    async def run():
+        return await asyncio.gather(*(embedder.aembed(Chunk(str(i))) for i in range(10)))
+
+    embeddings = asyncio.run(run())
+    embedder.close()
+    assert [e.embeddings[0] for e in embeddings] == [float(i) for i in range(10)]
+    assert base.requests == [[str(i) for i in range(10)]]
+
+
+def test_closed_embedder_rejects_calls():
+    embedder = MicroBatchingEmbedding(RecordingEmbedding())
+    embedder.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        embedder.embed(Chunk("1"))
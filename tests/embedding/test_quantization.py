@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+from flotorch_core.embedding.embedding import EmbeddingList, EmbeddingMetadata, Embeddings
+from flotorch_core.embedding.quantization import BinaryQuantizer, PCAQuantizer, ScalarQuantizer, recall_at_k
+
+
+def _corpus(count=2000, dimension=256, rank=32, seed=3):
+    """Normalized vectors with most of their variance in a low rank subspace, like embeddings."""
+    rng = np.random.default_rng(seed)
+    basis = rng.standard_normal((rank, dimension))
+    vectors = rng.standard_normal((count, rank)) @ basis + 0.1 * rng.standard_normal((count, dimension))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.astype(np.float32)
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    vectors = _corpus()
+    return vectors[:1900], vectors[1900:]
+
+
+def test_int8_codes_are_four_times_smaller(corpus):
+    vectors, queries = corpus
+    quantizer = ScalarQuantizer().fit(vectors)
+    codes = quantizer.encode(vectors)
+    assert codes.dtype == np.int8
+    assert vectors.nbytes / codes.nbytes == 4
+    assert np.abs(quantizer.decode(codes) - vectors).mean() < 0.001
+    assert recall_at_k(quantizer, vectors, queries) >= 0.95
+
+
+def test_int8_search_scores_are_the_index_int8_inner_product(corpus):
+    vectors, queries = corpus
+    quantizer = ScalarQuantizer().fit(vectors)
+    codes = quantizer.encode(vectors)
+    query_code = np.array(quantizer.encode_query(queries[0].tolist()), dtype=np.int32)
+    assert np.abs(query_code).max() == 127
+    indices, scores = quantizer.search(queries[0], codes, 5)
+    assert np.array_equal(scores, codes[indices].astype(np.int32) @ query_code)
+
+
+def test_int8_recall_holds_for_offset_anisotropic_vectors():
+    rng = np.random.default_rng(5)
+    vectors = _corpus(dimension=128) * rng.uniform(0.1, 3.0, 128) + rng.standard_normal(128)
+    vectors = (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+    vectors, queries = vectors[:1900], vectors[1900:]
+    quantizer = ScalarQuantizer().fit(vectors)
+    assert recall_at_k(quantizer, vectors, queries) >= 0.9
+
+
+def test_binary_codes_are_thirty_two_times_smaller(corpus):
+    vectors, queries = corpus
+    quantizer = BinaryQuantizer().fit(vectors)
+    codes = quantizer.encode(vectors)
+    assert codes.shape == (len(vectors), 32)
+    assert vectors.nbytes / codes.nbytes == 32
+    assert recall_at_k(quantizer, vectors, queries) >= 0.5
+
+
+def test_hamming_distances():
+    bits = np.array([[1, 0, 1, 1, 0, 0, 0, 0, 1], [0, 0, 0, 0, 0, 0, 0, 0, 0], [1, 1, 1, 1, 1, 1, 1, 1, 1]])
+    codes = BinaryQuantizer.pack_bits(bits)
+    assert BinaryQuantizer.hamming_distances(codes[0], codes).tolist() == [0, 4, 5]
+
+
+def test_pca_reduces_dimension(corpus):
+    vectors, queries = corpus
+    quantizer = PCAQuantizer(64).fit(vectors)
+    codes = quantizer.encode(vectors)
+    assert codes.shape == (len(vectors), 64)
+    assert np.allclose(np.linalg.norm(codes, axis=1), 1.0, atol=1e-5)
+    assert quantizer.explained_variance_ratio.sum() > 0.9
+    assert recall_at_k(quantizer, vectors, queries) >= 0.8
+
+
+def test_unfitted_quantizer():
+    with pytest.raises(ValueError, match="must be fitted"):
+        ScalarQuantizer().encode(np.zeros((1, 4), dtype=np.float32))
+    with pytest.raises(ValueError, match="n_components cannot exceed"):
+        PCAQuantizer(8).fit(np.zeros((4, 16), dtype=np.float32))
+
+
+def test_bulk_bodies_store_codes(corpus):
+    vectors, _ = corpus
+    embedding_list = EmbeddingList()
+    for i, vector in enumerate(vectors[:3]):
+        embedding = Embeddings(vector.tolist(), EmbeddingMetadata(1, 1), f"text {i}")
+        embedding.id = str(i)
+        embedding_list.append(embedding)
+
+    quantizer = BinaryQuantizer().fit(vectors)
+    body = next(embedding_list.bulk_bodies("index", quantizer=quantizer))
+    stored = np.array([document["vectors"] for document in body[1::2]], dtype=np.int8)
+    assert np.array_equal(stored.view(np.uint8), quantizer.encode(vectors[:3]))
+    assert quantizer.knn_field_mapping()["dimension"] == 256
+    assert quantizer.encode_query(vectors[0].tolist()) == body[1]["vectors"]
@@ -0,0 +1,113 @@
+import json
+
+import boto3
+import numpy as np
+import pytest
+from moto import mock_aws
+from flotorch_core.chunking.chunking import Chunk
+from flotorch_core.embedding.sagemaker_batch_embedding import LocalTransformJobs, SageMakerBatchEmbedder
+from flotorch_core.embedding.sagemaker_embedding import SageMakerEmbedder
+from flotorch_core.storage.s3_storage import S3StorageProvider
+
+MODEL_ID = "huggingface-sentencesimilarity-bge-large-en-v1-5"
+
+
+class TextEmbedder(SageMakerEmbedder):
+    max_batch_size = 3
+
+    def _prepare_chunk(self, chunk):
+        return {"text_inputs": [chunk.data], "mode": "embedding"}
+
+    def _prepare_batch(self, chunks):
+        return {"text_inputs": [chunk.data for chunk in chunks], "mode": "embedding"}
+
+
+class Model:
+    """Embeds a text as (number, 1), fails on the texts of failing."""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.records = []
+
+    def __call__(self, payload):
+        self.records.append(payload["text_inputs"])
+        if self.failing.intersection(payload["text_inputs"]):
+            raise RuntimeError("model error")
+        return {"embedding": [[float(text), 1.0] for text in payload["text_inputs"]]}
+
+
+@pytest.fixture
+def storage():
+    with mock_aws():
+        s3_client = boto3.client("s3", region_name="us-east-1")
+        s3_client.create_bucket(Bucket="corpus")
+        yield S3StorageProvider("corpus", s3_client=s3_client)
+
+
+def _batch_embedder(storage, model, jobs=None):
+    embedder = TextEmbedder(MODEL_ID, "us-east-1", "role")
+    embedder.embedding_dimension = 2
+    return SageMakerBatchEmbedder(embedder, storage, "runs/bge", shard_size=4, model_name="bge-batch",
+                                  poll_interval=0, sagemaker_client=jobs or LocalTransformJobs(storage, model))
+
+
+def _chunks(count=10):
+    return [Chunk(str(i + 1), chunk_id=f"c{i}") for i in range(count)]
+
+
+def test_shards_are_embedded_in_chunk_order(storage):
+    model = Model()
+    embedding_list = _batch_embedder(storage, model).embed_list(_chunks())
+
+    assert embedding_list.ids == [f"c{i}" for i in range(10)]
+    expected = np.array([[i + 1, 1.0] for i in range(10)], dtype=np.float32)
+    assert np.allclose(embedding_list.vectors, expected / np.linalg.norm(expected, axis=1, keepdims=True))
+    # Shards of 4 chunks, packed 3 texts per record
+    assert model.records == [["1", "2", "3"], ["4"], ["5", "6", "7"], ["8"], ["9", "10"]]
+    keys = storage.list_keys("runs/bge/")
+    assert "runs/bge/input/shard-00002.jsonl" in keys
+    assert "runs/bge/output/shard-00002.jsonl.out" in keys
+    assert "runs/bge/state.json" in keys
+
+
+def test_failed_run_resumes_with_missing_shards_only(storage):
+    jobs = LocalTransformJobs(storage, Model(failing={"6"}))
+    with pytest.raises(RuntimeError, match="shard-00001.jsonl"):
+        _batch_embedder(storage, None, jobs).embed_list(_chunks())
+
+    model = jobs.handler = Model()
+    batch_embedder = _batch_embedder(storage, None, jobs)
+    embedding_list = batch_embedder.embed_list(_chunks())
+
+    assert embedding_list.texts == [str(i + 1) for i in range(10)]
+    assert model.records == [["5", "6", "7"], ["8"]]
+    state = json.loads(b"".join(storage.read("runs/bge/state.json")))
+    assert len(state["jobs"]) == 2
+    manifest = json.loads(b"".join(storage.read(f"runs/bge/manifests/{state['jobs'][1]}.json")))
+    assert manifest == [{"prefix": "s3://corpus/runs/bge/input/"}, "shard-00001.jsonl"]
+
+    # A completed run is read back without a new job
+    model.records.clear()
+    assert batch_embedder.embed_list(_chunks()).texts == embedding_list.texts
+    assert model.records == []
+
+
+def test_prefix_of_other_chunks_is_refused(storage):
+    _batch_embedder(storage, Model()).embed_list(_chunks())
+    with pytest.raises(ValueError, match="other chunks"):
+        _batch_embedder(storage, Model()).embed_list(_chunks(9))
+
+
+def test_hierarchical_chunks_keep_their_parent():
+    with mock_aws():
+        s3_client = boto3.client("s3", region_name="us-east-1")
+        s3_client.create_bucket(Bucket="corpus")
+        storage = S3StorageProvider("corpus", s3_client=s3_client)
+        parent = Chunk("1 2", chunk_id="p")
+        parent.child_data = [Chunk("1"), Chunk("2")]
+
+        embedding_list = _batch_embedder(storage, Model()).embed_list([parent, Chunk("3", chunk_id="c")])
+
+    assert embedding_list.ids == ["p", "p", "c"]
+    assert embedding_list.parent_ids == ["p", "p", None]
+    assert embedding_list.parents == {"p": "1 2"}
@@ -0,0 +1,107 @@
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from flotorch_core.chunking.chunking import Chunk
+from flotorch_core.embedding.sagemaker_embedding import SageMakerEmbedder
+from flotorch_core.utils.sagemaker_utils import EndpointRegistry
+
+MODEL_ID = "huggingface-sentencesimilarity-bge-large-en-v1-5"
+
+
+class TextEmbedder(SageMakerEmbedder):
+    def _prepare_chunk(self, chunk):
+        return {"text_inputs": [chunk.data]}
+
+
+def _sagemaker_client():
+    client = MagicMock()
+    client.describe_endpoint.return_value = {"EndpointStatus": "InService"}
+    return client
+
+
+def test_construction_makes_no_aws_calls():
+    with patch("flotorch_core.embedding.sagemaker_embedding.boto3") as boto3:
+        embedder = TextEmbedder(MODEL_ID, "us-east-1", "arn:aws:iam::123456789012:role/test")
+        embedder.max_in_flight = 4
+    boto3.client.assert_not_called()
+    assert embedder.embedding_dimension == 1024
+
+
+def test_instances_share_endpoint_readiness():
+    registry = EndpointRegistry()
+    client = _sagemaker_client()
+    with patch("flotorch_core.embedding.sagemaker_embedding.endpoint_registry", registry):
+        for _ in range(3):
+            embedder = TextEmbedder(MODEL_ID, "us-east-1", "role")
+            embedder.sagemaker_client = client
+            assert embedder.embedding_predictor.endpoint_name == embedder.embedding_model_endpoint_name
+    assert client.describe_endpoint.call_count == 1
+
+
+def test_awarm_up_resolves_embedders_concurrently():
+    registry = EndpointRegistry()
+    client = _sagemaker_client()
+    embedders = [TextEmbedder(MODEL_ID, "us-east-1", "role") for _ in range(4)]
+    for embedder in embedders:
+        embedder.sagemaker_client = client
+
+    async def warm_up():
+        await asyncio.gather(*(embedder.awarm_up() for embedder in embedders))
+
+    with patch("flotorch_core.embedding.sagemaker_embedding.endpoint_registry", registry):
+        asyncio.run(warm_up())
+    assert all(embedder._predictor is not None for embedder in embedders)
+    assert client.describe_endpoint.call_count == 1
+
+
+def _embedder(dimension=4):
+    embedder = TextEmbedder(MODEL_ID, "us-east-1", "role")
+    embedder.embedding_dimension = dimension
+    return embedder
+
+
+def test_batch_response_is_parsed_into_one_matrix():
+    embedder = _embedder()
+    matrix = embedder._parse_batch_response(b'{"embedding": [[3, 4, 0, 0], [0, 0, 0, 2]]}', 2)
+    assert matrix.dtype == np.float32
+    assert np.allclose(matrix, [[0.6, 0.8, 0.0, 0.0], [0.0, 0.0, 0.0, 1.0]])
+
+
+@pytest.mark.parametrize("vectors, expected", [
+    ([[3, 4, 0, 0, 0, 0]], [[0.6, 0.8, 0.0, 0.0]]),
+    ([[0, 2]], [[0.0, 1.0, 0.0, 0.0]]),
+    ([[[0, 0, 0, 5]]], [[0.0, 0.0, 0.0, 1.0]]),
+    ([[0, 0, 0, 0]], [[0.0, 0.0, 0.0, 0.0]]),
+])
+def test_batch_response_is_fitted_to_the_dimension(vectors, expected):
+    assert np.allclose(_embedder()._parse_batch_response({"embedding": vectors}, 1), expected)
+
+
+def test_dimension_mismatch_is_logged_once():
+    embedder = _embedder()
+    with patch("flotorch_core.embedding.sagemaker_embedding.logger") as logger:
+        for _ in range(3):
+            embedder._parse_batch_response([[1, 0], [0, 1]], 2)
+    logger.warning.assert_called_once_with("Embedding dimension mismatch. Expected 4, got 2")
+
+
+def test_batch_response_count_mismatch():
+    with pytest.raises(ValueError, match="Expected 3 embeddings in the response, got 2"):
+        _embedder()._parse_batch_response([[1, 0, 0, 0], [0, 1, 0, 0]], 3)
+
+
+@pytest.mark.parametrize("return_arrays", [False, True])
+def test_embed_pack_hands_out_rows(return_arrays):
+    embedder = _embedder()
+    embedder.return_arrays = return_arrays
+    embedder._prepare_batch = lambda chunks: {"text_inputs": [chunk.data for chunk in chunks]}
+    embedder.predictor = MagicMock()
+    embedder.predictor.predict.return_value = {"embedding": [[1, 0, 0, 0], [0, 1, 0, 0]]}
+
+    embeddings = embedder._embed_pack([Chunk("one"), Chunk("two")])
+
+    assert isinstance(embeddings[0].embeddings, np.ndarray) == return_arrays
+    assert [list(e.embeddings) for e in embeddings] == [[1.0, 0.0, 0.0, 0.0], [0.0, 1.0, 0.0, 0.0]]
+    assert embedder._parse_model_response({"embedding": [[0, 3, 0, 0]]}) is not None
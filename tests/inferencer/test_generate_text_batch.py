@@ -0,0 +1,117 @@
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from flotorch_core.inferencer.bedrock_inferencer import BedrockInferencer
+from flotorch_core.inferencer.gateway_inferencer import GatewayInferencer
+from flotorch_core.inferencer.inferencer import BaseInferencer
+from flotorch_core.inferencer.sagemaker_inferencer import SageMakerInferencer
+
+
+class EchoInferencer(BaseInferencer):
+    def __init__(self, delay=0.0):
+        super().__init__("echo")
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def generate_text(self, user_query, context, use_system=True):
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        # Later queries finish first
+        time.sleep(self.delay / (int(user_query) + 1))
+        with self.lock:
+            self.in_flight -= 1
+        if user_query == "3":
+            raise RuntimeError("throttled")
+        return {"contexts": len(context or []), "use_system": use_system}, f"answer {user_query}"
+
+    def generate_prompt(self, user_query, context):
+        return user_query
+
+    def format_context(self, context):
+        return ""
+
+
+def test_results_are_ordered_and_errors_captured():
+    inferencer = EchoInferencer(delay=0.05)
+    queries = [str(i) for i in range(8)]
+
+    results = inferencer.generate_text_batch(queries, [[{"text": "c"}]] * 8, max_concurrency=4, use_system=False)
+
+    assert [text for _, text in results] == [None if i == 3 else f"answer {i}" for i in range(8)]
+    assert results[3][0] == {"error": "RuntimeError: throttled"}
+    assert results[0][0] == {"contexts": 1, "use_system": False}
+    assert 1 < inferencer.peak <= 4
+
+
+def test_concurrency_defaults_to_the_inferencer():
+    inferencer = EchoInferencer(delay=0.02)
+    inferencer.max_concurrency = 2
+    inferencer.generate_text_batch([str(i) for i in range(6)])
+    assert inferencer.peak == 2
+    assert inferencer.generate_text_batch([]) == []
+
+
+def test_contexts_must_match_queries():
+    with pytest.raises(ValueError, match="one context per query"):
+        EchoInferencer().generate_text_batch(["a", "b"], [[]])
+
+
+def test_bedrock_batch():
+    inferencer = BedrockInferencer("anthropic.claude-3-haiku-20240307-v1:0", max_concurrency=16)
+    assert inferencer.client.meta.config.max_pool_connections == 16
+    inferencer.client = MagicMock()
+    inferencer.client.converse.side_effect = lambda **params: {
+        "output": {"message": {"content": [{"text": params["messages"][-1]["content"][0]["text"].upper()}]}},
+        "usage": {"inputTokens": 3},
+    }
+
+    results = inferencer.generate_text_batch(["a", "b", "c"], [[{"text": "x"}]] * 3)
+
+    assert results == [({"inputTokens": 3}, "A"), ({"inputTokens": 3}, "B"), ({"inputTokens": 3}, "C")]
+
+
+def test_gateway_batch():
+    inferencer = GatewayInferencer("gpt", api_key="key", base_url="http://localhost", max_concurrency=4)
+    usage = SimpleNamespace(prompt_tokens=1, completion_tokens=2, total_tokens=3)
+
+    def create(model, messages):
+        if messages[-1]["content"] == "fail":
+            raise ConnectionError("gateway down")
+        return SimpleNamespace(usage=usage, choices=[SimpleNamespace(message=SimpleNamespace(content=messages[-1]["content"]))])
+
+    inferencer.client = MagicMock()
+    inferencer.client.chat.completions.create.side_effect = create
+
+    results = inferencer.generate_text_batch(["q1", "fail", "q3"], [[], [], []])
+
+    assert [text for _, text in results] == ["q1", None, "q3"]
+    assert results[1][0] == {"error": "ConnectionError: gateway down"}
+    assert results[0][0]["totalTokens"] == "3"
+
+
+def test_sagemaker_batch_captures_endpoint_errors():
+    inferencer = SageMakerInferencer.__new__(SageMakerInferencer)
+    BaseInferencer.__init__(inferencer, "meta-textgeneration-llama-3-1-8b-instruct", "us-east-1")
+    inferencer.inferencing_model_id = inferencer.model_id
+    inferencer.max_tokens = inferencer.topP = None
+
+    def predict(payload):
+        if "fail" in payload["inputs"]:
+            raise RuntimeError("ModelError")
+        return [{"generated_text": "It is fine."}]
+
+    inferencer.inferencing_predictor = MagicMock()
+    inferencer.inferencing_predictor.predict.side_effect = predict
+
+    results = inferencer.generate_text_batch(["ok", "fail"], [[{"text": "ok"}], [{"text": "fail"}]])
+
+    assert results[0][1] == "It is fine."
+    assert results[1] == ({"error": "RuntimeError: ModelError"}, None)
+    # A single request keeps reporting failures in its return value
+    assert inferencer.generate_text("fail", [{"text": "fail"}]) == "Error generating response: ModelError"
@@ -0,0 +1,148 @@
+from unittest.mock import MagicMock
+
+from flotorch_core.chunking.chunking import Chunk
+from flotorch_core.embedding.embedding import BaseEmbedding, EmbeddingMetadata, Embeddings
+from flotorch_core.storage.db.vector.open_search import OpenSearchClient
+
+
+class ConstantEmbedding(BaseEmbedding):
+    def __init__(self):
+        super().__init__("constant", "local", 2)
+
+    def _prepare_chunk(self, chunk):
+        return {"text": chunk.data}
+
+    def embed(self, chunk):
+        return Embeddings([0.5, 0.5], EmbeddingMetadata(1, 1), chunk.data)
+
+
+def _client(parent_index=None):
+    client = OpenSearchClient("localhost", 9200, "admin", "admin", "vectors",
+                              embedder=ConstantEmbedding(), parent_index=parent_index)
+    client.client = MagicMock()
+    client.client.indices.get_mapping.return_value = {
+        "vectors": {"mappings": {"properties": {"vectors": {"type": "knn_vector"}}}}
+    }
+    return client
+
+
+def _hierarchical_list():
+    parents = []
+    for p in range(2):
+        parent = Chunk(f"parent {p} text, with the children's words")
+        for c in range(20):
+            parent.add_child(Chunk(f"child {p}.{c}"))
+        parents.append(parent)
+    return parents, ConstantEmbedding().embed_list(parents)
+
+
+def test_write_embeddings_writes_each_parent_text_once():
+    client = _client()
+    parents, embedding_list = _hierarchical_list()
+    client.write_embeddings(embedding_list, batch_size=50)
+
+    documents = [line for call in client.client.bulk.call_args_list for line in call.kwargs["body"]]
+    parent_records = [line for line in documents if "parent_id" in line and "vectors" not in line]
+    children = [line for line in documents if "vectors" in line]
+    assert parent_records == [{"parent_id": parent.id, "text": clean}
+                              for parent, clean in zip(parents, ["parent 0 text with the childrens words",
+                                                                 "parent 1 text with the childrens words"])]
+    assert documents[0] == {"index": {"_index": "vectors", "_id": parents[0].id}}
+    assert len(children) == 40
+    assert all("parent" not in child["text"] for child in children)
+    assert children[0]["parent_id"] == parents[0].id
+
+
+def test_write_embeddings_upserts_children_under_their_own_id():
+    client = _client()
+    parents, embedding_list = _hierarchical_list()
+    client.write_embeddings(embedding_list)
+    client.write_embeddings(ConstantEmbedding().embed_list(parents))
+
+    ids = [line["index"]["_id"] for call in client.client.bulk.call_args_list
+           for line in call.kwargs["body"] if "index" in line]
+    first, second = ids[:len(ids) // 2], ids[len(ids) // 2:]
+    child_ids = [child.id for parent in parents for child in parent.child_data]
+    assert first == second == [parent.id for parent in parents] + child_ids
+
+
+def test_overlapping_parents_keep_every_child_document():
+    from flotorch_core.chunking.hierarical_chunking import HieraricalChunker
+    chunker = HieraricalChunker(10, 0, 40, parent_chunk_overlap=50)
+    chunker.deterministic_ids = True
+    parents = chunker.chunk(" ".join(f"word{i % 30}" for i in range(400)), "doc-1")
+    client = _client()
+    client.write_embeddings(ConstantEmbedding().embed_list(parents))
+
+    lines = [line for call in client.client.bulk.call_args_list for line in call.kwargs["body"]]
+    children = [(action["index"]["_id"], document["parent_id"])
+                for action, document in zip(lines[::2], lines[1::2]) if "vectors" in document]
+    assert len(children) == sum(len(parent.child_data) for parent in parents)
+    # Every child is indexed under its own ID for each of its parents
+    assert len(dict(children)) == len(children)
+    assert {parent_id for _, parent_id in children} == {parent.id for parent in parents}
+
+
+def test_documents_written_one_by_one_keep_the_parent_text():
+    client = _client()
+    parents, embedding_list = _hierarchical_list()
+    body = []
+    for embedding in embedding_list:
+        body.append({"index": {"_index": "vectors"}})
+        body.append({"chunk_id": embedding.id, **embedding.to_json()})
+    client.write_bulk(body)
+
+    children = client.client.bulk.call_args.kwargs["body"][1::2]
+    assert len(children) == 40
+    assert children[0]["text"] == "parent 0 text with the childrens words"
+    assert children[0]["parent_id"] == parents[0].id
+
+    # Without parent records, hierarchical search serves the text stored with the children
+    client.client.search.return_value = {"hits": {"hits": [{"_id": "1", "_source": children[-1]}]}}
+    client.client.mget.return_value = {"docs": [{"_id": parents[1].id, "found": False}]}
+    response = client.search(Chunk("query"), 1, hierarchical=True)
+    assert response.result[0].text == "parent 1 text with the childrens words"
+
+
+def test_hierarchical_search_fetches_parent_text():
+    client = _client(parent_index="parents")
+    client.client.search.return_value = {"hits": {"hits": [
+        {"_id": "1", "_source": {"chunk_id": "p0", "parent_id": "p0", "text": "child 0", "vectors": [], "metadata": {}}},
+        {"_id": "2", "_source": {"chunk_id": "p1", "parent_id": "p1", "text": "child 1", "vectors": [], "metadata": {}}},
+    ]}}
+    client.client.mget.return_value = {"docs": [
+        {"_id": "p0", "found": True, "_source": {"parent_id": "p0", "text": "parent 0"}},
+        {"_id": "p1", "found": False},
+    ]}
+
+    response = client.search(Chunk("query"), 2, hierarchical=True)
+
+    client.client.mget.assert_called_once_with(index="parents", body={"ids": ["p0", "p1"]})
+    assert [item.text for item in response.result] == ["parent 0", "child 1"]
+    assert client.client.search.call_args.kwargs["body"]["collapse"] == {"field": "parent_id.keyword"}
+
+
+def test_flat_search_does_not_fetch_parents():
+    client = _client()
+    client.client.search.return_value = {"hits": {"hits": [
+        {"_id": "1", "_source": {"chunk_id": "c", "parent_id": "p0", "text": "child", "vectors": [], "metadata": {}}},
+    ]}}
+    response = client.search(Chunk("query"), 1)
+    client.client.mget.assert_not_called()
+    assert response.result[0].text == "child"
+
+
+def test_quantized_client_writes_and_queries_codes():
+    import numpy as np
+    from flotorch_core.embedding.quantization import ScalarQuantizer
+
+    client = _client()
+    client.quantizer = ScalarQuantizer().fit(np.array([[-1.0, -1.0], [1.0, 1.0]], dtype=np.float32))
+    _, embedding_list = _hierarchical_list()
+    client.write_embeddings(embedding_list)
+    documents = [line for line in client.client.bulk.call_args.kwargs["body"] if "vectors" in line]
+    assert documents[0]["vectors"] == [64, 64]
+
+    client.client.search.return_value = {"hits": {"hits": []}}
+    client.search(Chunk("query"), 1)
+    assert client.client.search.call_args.kwargs["body"]["query"]["knn"]["vectors"]["vector"] == [127, 127]
@@ -92,3 +92,30 @@ def test_create_storage_provider_s3_with_mock(mock_client):
 
 
 
+
+
+def test_local_storage_read_stream(tmp_path):
+    """Test reading a local file block by block"""
+    file_path = tmp_path / "data.txt"
+    file_path.write_bytes(b"0123456789" * 3)
+
+    storage = LocalStorageProvider()
+    blocks = list(storage.read_stream(str(file_path), block_size=8))
+
+    assert all(len(block) <= 8 for block in blocks)
+    assert b"".join(blocks) == b"0123456789" * 3
+
+
+def test_local_storage_read_stream_separates_files(tmp_path):
+    """Test that the last word of a file is not joined to the first word of the next"""
+    from flotorch_core.chunking.fixedsize_chunking import FixedSizeChunker
+    (tmp_path / "a.txt").write_bytes(b"alpha beta")
+    (tmp_path / "b.txt").write_bytes(b"gamma delta")
+
+    storage = LocalStorageProvider()
+    assert b"".join(storage.read_stream(str(tmp_path), block_size=4)) == b"alpha beta\ngamma delta"
+
+    chunker = FixedSizeChunker(chunk_size=2, chunk_overlap=0)
+    chunks = [chunk.data for chunk in chunker.chunk_iter(storage.read_stream(str(tmp_path)))]
+    assert not any("betagamma" in chunk for chunk in chunks)
+    assert [chunk.data for chunk in chunker.chunk("alpha beta\ngamma delta")] == chunks
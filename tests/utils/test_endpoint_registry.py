@@ -0,0 +1,118 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+from flotorch_core.utils.sagemaker_utils import EndpointRegistry
+
+
+def _not_found():
+    return ClientError({"Error": {"Code": "ValidationException", "Message": "Could not find endpoint"}},
+                       "DescribeEndpoint")
+
+
+class FakeSageMakerClient:
+    """Reports each status in turn, then the last one."""
+
+    def __init__(self, *statuses, delay=0.0):
+        self.statuses = list(statuses)
+        self.delay = delay
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def describe_endpoint(self, EndpointName):
+        if self.delay:
+            time.sleep(self.delay)
+        with self.lock:
+            self.calls += 1
+            status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        if isinstance(status, Exception):
+            raise status
+        return {"EndpointStatus": status}
+
+
+def _registry(**kwargs):
+    return EndpointRegistry(initial_wait=0.001, max_wait=0.004, **kwargs)
+
+
+def test_polls_with_backoff_until_in_service(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("flotorch_core.utils.sagemaker_utils.time.sleep", sleeps.append)
+    client = FakeSageMakerClient("Creating", "Creating", "Creating", "Creating", "InService")
+    _registry().ensure_ready("endpoint", client)
+    assert client.calls == 5
+    assert sleeps == [0.001, 0.002, 0.004, 0.004]
+
+
+def test_readiness_is_cached_for_ttl():
+    registry = _registry(ttl=60)
+    client = FakeSageMakerClient("InService")
+    registry.ensure_ready("endpoint", client)
+    registry.ensure_ready("endpoint", client)
+    assert client.calls == 1
+    assert registry.is_ready("endpoint")
+
+    registry.invalidate("endpoint")
+    registry.ensure_ready("endpoint", client)
+    assert client.calls == 2
+
+
+def test_expired_readiness_is_checked_again():
+    registry = _registry(ttl=0)
+    client = FakeSageMakerClient("InService")
+    registry.ensure_ready("endpoint", client)
+    registry.ensure_ready("endpoint", client)
+    assert client.calls == 2
+
+
+def test_concurrent_callers_share_one_wait():
+    registry = _registry()
+    client = FakeSageMakerClient("Creating", "Creating", "InService", delay=0.01)
+    threads = [threading.Thread(target=registry.ensure_ready, args=("endpoint", client)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert client.calls == 3
+
+
+def test_missing_endpoint_is_created():
+    create = MagicMock()
+    client = FakeSageMakerClient(_not_found(), "Creating", "InService")
+    _registry().ensure_ready("endpoint", client, create)
+    create.assert_called_once_with()
+
+
+def test_missing_endpoint_without_create():
+    with pytest.raises(RuntimeError, match="does not exist"):
+        _registry().ensure_ready("endpoint", FakeSageMakerClient(_not_found()))
+
+
+def test_other_client_errors_are_raised_unchanged():
+    create = MagicMock()
+    throttled = ClientError({"Error": {"Code": "ThrottlingException", "Message": "Rate exceeded"}}, "DescribeEndpoint")
+    with pytest.raises(ClientError) as raised:
+        _registry().ensure_ready("endpoint", FakeSageMakerClient(throttled), create)
+    assert raised.value is throttled
+    create.assert_not_called()
+
+
+def test_failure_reaches_waiters_and_is_not_cached():
+    registry = _registry()
+    client = FakeSageMakerClient("Creating", "Failed", delay=0.01)
+    errors = []
+
+    def ensure():
+        try:
+            registry.ensure_ready("endpoint", client)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=ensure) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == ["Endpoint 'endpoint' is not usable, status: Failed"] * 4
+    assert not registry.is_ready("endpoint")
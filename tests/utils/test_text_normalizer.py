@@ -0,0 +1,52 @@
+import re
+
+import pytest
+from flotorch_core.utils import text_normalizer
+from flotorch_core.utils.text_normalizer import clean_text_for_vector_db, collapse_repeated, replace_separators
+
+
+def _reference_clean(text):
+    # The multi-pass implementation clean_text_for_vector_db replaced
+    text = text.replace('"', '').replace("'", "")
+    text = re.sub(r'[^a-zA-Z0-9\s]', '', text)
+    text = text.replace('\n', ' ').replace('\t', ' ')
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "   ",
+    "Hello, \"World\"! It's\tfine.\n",
+    "café 中文 naïve　text",
+    "tabs\t\tand\r\nnewlines\x0b\x0c\x1c end",
+    "$100 - 50% off (today) only!!!",
+    "éé only accents é",
+])
+def test_clean_text_for_vector_db_matches_reference(text):
+    text_normalizer._vector_db_cache.clear()
+    assert clean_text_for_vector_db(text) == _reference_clean(text)
+
+
+def test_clean_text_for_vector_db_is_idempotent():
+    cleaned = clean_text_for_vector_db("Some 'quoted'\ttext, with symbols!")
+    assert clean_text_for_vector_db(cleaned) is cleaned
+
+
+def test_clean_text_for_vector_db_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(text_normalizer, "_VECTOR_DB_CACHE_SIZE", 8)
+    text_normalizer._vector_db_cache.clear()
+    for i in range(100):
+        assert clean_text_for_vector_db(f"text {i}!") == f"text {i}"
+    assert len(text_normalizer._vector_db_cache) <= 8 + 2
+
+
+def test_replace_separators_keeps_runs():
+    separators = [' ', '\t', '\n', '\r', '\f', '\v']
+    assert replace_separators("Hello\t\nWorld\r\f\vTest", separators) == "Hello  World   Test"
+    assert replace_separators("café\tbar", separators) == "café bar"
+
+
+def test_collapse_repeated():
+    assert collapse_repeated("a  b     c ") == "a b c "
+    assert collapse_repeated("a--b---c", "-") == "a-b-c"